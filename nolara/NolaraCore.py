@@ -1,35 +1,56 @@
 # IMPORT LLM LIBRARIES
 try:
     from .lib import Models
-    from .lib.ChatOllama import ChatOllama
-    from .lib.ChatOpenAI import ChatOpenAI
-    from .lib import Agents
     from .lib import Config
+    from .lib import Startup
+    from .lib import Tracing
+    from .lib.ChatOllama import ChatOllama, model_state
 except ImportError:
     from lib import Models
-    from lib.ChatOllama import ChatOllama
-    from lib.ChatOpenAI import ChatOpenAI
-    from lib import Agents
     from lib import Config
+    from lib import Startup
+    from lib import Tracing
+    from lib.ChatOllama import ChatOllama, model_state
 
+# Lazy imports: loaded on first use only (remote models, agent mode, audio)
+ChatOpenAI = Startup.LazyModule("lib.ChatOpenAI", package=__package__)
+Agents = Startup.LazyModule("lib.Agents", package=__package__)
 # IMPORT AUDIO LIBRARY IF AVAILABLE
-try:
-    from .lib import Audio
-except ImportError:
-    try:
-        from lib import Audio
-    except ImportError:
-        Audio = None
+Audio = Startup.LazyModule("lib.Audio", package=__package__)
+
+
+def audio_available() -> bool:
+    """
+    Check audio dependencies without importing them
+    """
+    return Startup.module_available("speech_recognition", "gtts")
+
+
+def tts_available() -> bool:
+    """
+    Check text to speech dependencies (any TTS engine: gtts, pyttsx3) without importing them
+    """
+    return Startup.module_available("gtts") or Startup.module_available("pyttsx3")
 
 
 class NolaraCore:
 
     def __init__(self, stream=False):
         self.version:str = "0.1.0"
-        self.chatbot:ChatOllama|ChatOpenAI|None = None          # Chatbot instance
+        self.chatbot:ChatOllama|None = None               # Chatbot instance
         self._stream:bool = stream                                # Stream mode flag
         self._tool_calls:bool = False                           # Selected Chatbot tool call capability
         self.last_response:str = ""                             # Cache last response
+        self.last_trace:Tracing.Span|None = None                # Span tree of the last turn (tracing enabled)
+        self._speech = None                                     # Audio.SpeechStream of the spoken response
+        self._config_changed:bool = False                       # Rebuild chatbot on next init_model
+        Config.subscribe(self._on_config_changed, keys=("agents", "remote_models"))
+
+    def _on_config_changed(self, changed_keys: set):
+        """
+        Config subscriber: agent/remote backend settings changed, rebuild chatbot on next init_model
+        """
+        self._config_changed = True
 
     def init_model(self, model_name, tui_console=None):
         """
@@ -37,12 +58,13 @@ class NolaraCore:
         - Chat mode
         - Agentic mode (if available and enabled)
         """
-        if self.chatbot:
+        if self.chatbot and not self._config_changed:
             local_model_match = model_name == self.chatbot.model_name
             remote_model_match = model_name.startswith(":") and model_name.endswith(self.chatbot.model_name)
             if local_model_match or remote_model_match:     # Handle Agent switch
                 return self.chatbot
 
+        self._config_changed = False
         self._tool_calls = self.is_agent_enabled(model_name)
         if model_name.startswith(":"):
             # remote model (workaround for OpenAI API)
@@ -50,7 +72,7 @@ class NolaraCore:
             remote_vendor = _remote[1]
             remote_model_name = _remote[2]
             if remote_vendor == "openai":
-                self.chatbot = ChatOpenAI(remote_model_name, stream=self._stream, tui_console=tui_console)
+                self.chatbot = ChatOpenAI.ChatOpenAI(remote_model_name, stream=self._stream, tui_console=tui_console)
                 return self.chatbot
         else:
             # local model
@@ -62,6 +84,24 @@ class NolaraCore:
             self.chatbot = ChatOllama(model_name, stream=self._stream, tui_console=tui_console)
         return self.chatbot
 
+    def warm_up_model(self, on_state=None):
+        """
+        Load the current model in the background and prefill its system prompt and tools
+        - on_state: callback(model name, "warming"|"warm"|"cold"), called from the warm-up thread
+        """
+        if self.chatbot and hasattr(self.chatbot, "warm_up"):
+            return self.chatbot.warm_up(on_state=on_state)
+        return None
+
+    @staticmethod
+    def model_state(model_name) -> str:
+        """
+        Model readiness: cold, warming, warm (remote models: remote)
+        """
+        if model_name.startswith(":"):
+            return "remote"
+        return model_state(model_name)
+
     def is_agent_enabled(self, model_name=None) -> bool:
         """
         This method checks whether agents are enabled in the configuration
@@ -75,15 +115,33 @@ class NolaraCore:
     def model_process(self, query):
         """
         This method processes the query using the current chatbot model.
+        - traced turn: model, tool and output parsing spans (last_trace)
         """
         if self.chatbot:
-            state, response = self.chatbot.chat(query)
-            response = self.chatbot.human_output_parser(response)
+            turn = Tracing.turn(model=self.chatbot.model_name)
+            self.last_trace = turn if turn.recording else None
+            speech = self._start_speech() if self.speak_responses() else None
+            try:
+                with turn:
+                    state, response = self.chatbot.chat(query)
+                    with Tracing.span("human_output_parser"):
+                        response = self.chatbot.human_output_parser(response)
+            finally:
+                if speech is not None:
+                    self._finish_speech(speech)
         else:
             response = "No chatbot initialized"
         self.last_response = response
         return response
 
+    def cancel_model_process(self):
+        """
+        Abort the in-flight model_process (called from another thread)
+        """
+        if self.chatbot:
+            self.chatbot.cancel()
+        self.stop_speech()
+
     async def async_model_process(self, query):
         """
         This method processes the query using the current chatbot model.
@@ -96,13 +154,50 @@ class NolaraCore:
         self.last_response = response
         return response
 
+    @staticmethod
+    def speak_responses() -> bool:
+        """
+        Read the responses aloud while the model is generating (audio.speak_responses)
+        """
+        return (Config.get("audio") or {}).get("speak_responses", False) and tts_available()
+
+    def _start_speech(self):
+        """
+        Sentence pipelined speech of the streamed response (tokens from the chatbot stream listener)
+        """
+        self.stop_speech()
+        try:
+            self._speech = Audio.SpeechStream()
+        except Exception as e:
+            print(f"[TTS] Cannot start speech: {e}")
+            return None
+        self.chatbot.stream_listener = self._speech.feed
+        return self._speech
+
+    def _finish_speech(self, speech):
+        """
+        End of the response: speak the rest (not streamed: the whole answer), playback goes on in the background
+        """
+        self.chatbot.stream_listener = None
+        if speech.text_chars == 0 and not self.chatbot.cancelled:
+            answer = self.chatbot.messages[-1]
+            if answer["role"] == "assistant":
+                speech.feed(answer.get("content") or "")
+        speech.close()
+
+    def stop_speech(self):
+        if self._speech is not None:
+            self._speech.cancel()
+            self._speech = None
+
     def speach_to_text(self):
-        if Audio is None:
+        if not tts_available():
             return
         if len(self.last_response) > 0:
-            Audio.text_to_speech(self.last_response)
+            self.stop_speech()
+            self._speech = Audio.text_to_speech(self.last_response, wait=False)
 
     @staticmethod
     def teardown():
-        if Audio is not None:
+        if tts_available():
             Audio.delete_audio_cache()
@@ -1,36 +1,111 @@
 try:
     from .ChatOllama import ChatOllama
     from .Tools import generate_tools
+    from . import ToolResults
+    from . import Tracing
 except ImportError:
     from ChatOllama import ChatOllama
     from Tools import generate_tools
+    import ToolResults
+    import Tracing
 
 import re
 import json
+import time
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+class ToolCallAssembler:
+    """
+    Assemble tool calls from streamed chunks
+    - complete calls (ollama: dict arguments) are returned immediately
+    - fragmented calls (JSON string argument deltas) are buffered until the arguments parse
+    """
+
+    def __init__(self):
+        self._partial:dict = {}     # {call key: {"name": str, "arguments": str, "tool_call_id": str}}
+
+    @staticmethod
+    def _call(name, arguments, tool_call_id=None):
+        return SimpleNamespace(function=SimpleNamespace(name=name, arguments=arguments), tool_call_id=tool_call_id)
+
+    def add(self, tool) -> list:
+        """
+        Add a tool call (fragment), return the calls completed by it
+        """
+        function = tool.function
+        index = getattr(tool, "index", None)
+        if index is None:
+            index = getattr(function, "index", None)
+        key = index if index is not None else function.name
+        if isinstance(function.arguments, dict) and key not in self._partial:
+            return [tool]
+
+        entry = self._partial.setdefault(key, {"name": "", "arguments": "", "tool_call_id": None})
+        entry["name"] = function.name or entry["name"]
+        entry["tool_call_id"] = getattr(tool, "tool_call_id", None) or getattr(tool, "id", None) or entry["tool_call_id"]
+        arguments = function.arguments
+        entry["arguments"] += json.dumps(arguments) if isinstance(arguments, dict) else (arguments or "")
+        try:
+            parsed = json.loads(entry["arguments"])
+        except json.JSONDecodeError:
+            return []
+        del self._partial[key]
+        return [self._call(entry["name"], parsed, entry["tool_call_id"])]
+
+    def add_all(self, tools) -> list:
+        completed = []
+        for tool in tools:
+            completed += self.add(tool)
+        return completed
+
+    def flush(self) -> list:
+        """
+        End of stream: return incomplete calls as they are (argument decode error is reported on execution)
+        """
+        incomplete = [self._call(e["name"], e["arguments"], e["tool_call_id"]) for e in self._partial.values()]
+        self._partial.clear()
+        return incomplete
 
 
 class Agent(ChatOllama):
 
-    def __init__(self, model_name, max_tool_steps=5, stream=False, tui_console=None):
+    def __init__(self, model_name, max_tool_steps=5, stream=False, tui_console=None,
+                 parallel_tools=True, max_tool_workers=4, tool_timeout=60):
         """
         Initialize an Agent with a specific model and tools.
         Args:
             model_name: model name to use for generating responses
             tools_dict: dictionary mapping tool names to their corresponding functions or classes
             max_tool_steps: maximum number of steps allowed for a single tool execution (prevent infinite loops)
+            parallel_tools: run the tool calls of one model step concurrently
+            max_tool_workers: tool execution thread pool size (parallel_tools)
+            tool_timeout: per tool call timeout in seconds (parallel_tools)
         """
         self.tools_mapping = generate_tools()
         self.max_tool_steps = max_tool_steps
+        self.parallel_tools = parallel_tools
+        self.max_tool_workers = max_tool_workers
+        self.tool_timeout = tool_timeout
+        self._tool_executor:ThreadPoolExecutor|None = None
         super().__init__(model_name, tools=self._get_tools_list(), stream=stream, tui_console=tui_console)
 
     def _get_tools_list(self):
-        return list(self.tools_mapping.values())
+        """
+        Prebuilt tool JSON schemas (no per-request docstring parsing in the ollama client)
+        """
+        return [tool.schema for tool in self.tools_mapping.values()]
 
     def add_function_message(self, name, content, tool_call_id=None):
         """
         Add a function (tool) response to the chat history.
         This mimics the tool result message expected by the model.
+        - compacted: HTML to text, per-tool token cap (full result paged by read_tool_result)
         """
+        if ToolResults.enabled():
+            with Tracing.span("compact_tool_result", tool=name):
+                content = ToolResults.compact(name, content)
         function_msg = {
             "role": "tool",
             "name": name,
@@ -39,12 +114,12 @@ class Agent(ChatOllama):
         if tool_call_id is not None:
             function_msg["tool_call_id"] = tool_call_id
         self.messages.append(function_msg)
+        return function_msg["content"]
 
-    def _tool_call(self, tool):
+    def _parse_tool_call(self, tool) -> (str, dict, str|None):
         """
-        Execute a single tool and return its result.
+        Resolve tool call name, arguments and id
         """
-        tool_result = {}
         fn_name = tool.function.name
 
         # Handle arguments: accept dict or JSON string
@@ -57,54 +132,157 @@ class Agent(ChatOllama):
                 fn_args = {}
                 self.print(f"[Warning] Could not decode arguments for tool '{fn_name}': {tool.function.arguments}")
 
-        # Resolve callable - function with its parameters
-        fn = self.tools_mapping.get(fn_name)
         # Try to get the tool call id safely
         tool_call_id = getattr(tool, 'tool_call_id', None) or getattr(tool, 'call_id', None)
+        return fn_name, fn_args, tool_call_id
 
-        if fn:
+    def _execute_tool(self, fn_name, fn_args) -> (bool, object):
+        """
+        Execute a single tool function (thread safe, no chat history side effect)
+        :return: success, result or error message
+        """
+        # Resolve callable - function with its parameters
+        fn = self.tools_mapping.get(fn_name)
+        if fn is None:
+            return False, f"[Function {fn_name} not found]"
+        with Tracing.span("tool_call", tool=fn_name) as span:
             try:
-                result = fn(**fn_args)
-                tool_result[fn_name] = result
-                self.print(f"[Tool] {fn_name}({fn_args}) => {result}")
-                self.add_function_message(name=fn_name, content=result, tool_call_id=tool_call_id)
+                return True, fn(**fn_args)
             except Exception as e:
-                error_msg = f"[Error calling {fn_name}]: {e}"
-                tool_result[fn_name] = error_msg
-                self.print(error_msg)
-                self.add_function_message(name=fn_name, content=error_msg, tool_call_id=tool_call_id)
+                span.set(error=str(e)[:200])
+                return False, f"[Error calling {fn_name}]: {e}"
+
+    def _record_tool_result(self, fn_name, fn_args, tool_call_id, success, result) -> dict:
+        """
+        Log tool result and add it to the chat history
+        """
+        if success:
+            self.print(f"[Tool] {fn_name}({fn_args}) => {result}")
         else:
-            error_msg = f"[Function {fn_name} not found]"
-            tool_result[fn_name] = error_msg
-            self.print(error_msg)
-            self.add_function_message(name=fn_name, content=error_msg, tool_call_id=tool_call_id)
+            self.print(result)
+        content = self.add_function_message(name=fn_name, content=result, tool_call_id=tool_call_id)
+        return {fn_name: content}
+
+    def _tool_call(self, tool):
+        """
+        Execute a single tool and return its result.
+        """
+        fn_name, fn_args, tool_call_id = self._parse_tool_call(tool)
+        success, result = self._execute_tool(fn_name, fn_args)
+        return self._record_tool_result(fn_name, fn_args, tool_call_id, success, result)
+
+    def _submit_tool_call(self, tool) -> tuple:
+        """
+        Start tool execution on the tool thread pool
+        :return: pending call (fn_name, fn_args, tool_call_id, future, deadline)
+        """
+        if self._tool_executor is None:
+            self._tool_executor = ThreadPoolExecutor(max_workers=self.max_tool_workers if self.parallel_tools else 1,
+                                                     thread_name_prefix="nolara-tool")
+        fn_name, fn_args, tool_call_id = self._parse_tool_call(tool)
+        future = self._tool_executor.submit(Tracing.bind(self._execute_tool), fn_name, fn_args)
+        return fn_name, fn_args, tool_call_id, future, time.monotonic() + self.tool_timeout
 
+    def _collect_tool_results(self, pending) -> dict:
+        """
+        Wait for submitted tool calls and add results to the chat history in issue order
+        """
+        tool_result = {}
+        for fn_name, fn_args, tool_call_id, future, deadline in pending:
+            try:
+                success, result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                # Thread cannot be killed: the late result is dropped
+                success, result = False, f"[Timeout calling {fn_name} after {self.tool_timeout}s]"
+            tool_result.update(self._record_tool_result(fn_name, fn_args, tool_call_id, success, result))
         return tool_result
 
+    def _tool_calls(self, tool_calls) -> dict:
+        """
+        Execute the tool calls of one model step.
+        - parallel_tools: calls run concurrently on a bounded thread pool (per call timeout)
+        - results are added to the chat history in the order the model issued the calls
+        """
+        tool_result = {}
+        if not self.parallel_tools or len(tool_calls) < 2:
+            for tool in tool_calls:
+                tool_result.update(self._tool_call(tool))
+            return tool_result
+        return self._collect_tool_results([self._submit_tool_call(tool) for tool in tool_calls])
+
+    def _stream_step(self) -> (str, list):
+        """
+        One streamed model step
+        - content tokens are forwarded to the TUI/stdout as they arrive
+        - tool calls are assembled from the chunks, each one starts executing as soon as it is complete
+        :return: step content, pending tool calls
+        """
+        content_parts = []
+        pending = []
+        assembler = ToolCallAssembler()
+        for chunk in self.iter_stream(self.run_model(stream=True)):
+            message = chunk.message
+            if message.content:
+                self.write_stream(message.content)
+                content_parts.append(message.content)
+            for tool in assembler.add_all(message.tool_calls or []):
+                pending.append(self._submit_tool_call(tool))
+        for tool in assembler.flush():
+            pending.append(self._submit_tool_call(tool))
+        return "".join(content_parts), pending
+
+    def _stream_chat(self):
+        """
+        Streaming agent loop: time to first visible token is the first chunk, not the full tool chain
+        """
+        tool_result = {}
+        step_contents = []
+        self.write_tui(f"Model:{self.model_name}> ")
+        for _ in range(self.max_tool_steps):
+            content, pending = self._stream_step()
+            if content:
+                self.add_assistant_message(content)
+                step_contents.append(content)
+            if self.cancelled:
+                for *_, future, _ in pending:
+                    future.cancel()
+                self.write_tui(" [cancelled]", end="")
+                break
+            if not pending:
+                break  # No tools requested, we're done
+            self.write_tui('')
+            tool_result.update(self._collect_tool_results(pending))
+        self.write_tui('')
+        response = {"message": {"content": "\n".join(step_contents)}, "streamed": True}
+        return True, {"response": response, "tool_result": tool_result}
+
     def chat(self, query):
         """
         Chat with the model and support iterative tool usage.
         """
         self.add_user_message(query)
-        tool_result = {}
-        response = {}
+        with self.generation():
+            if self.stream:
+                return self._stream_chat()
 
-        for _ in range(self.max_tool_steps):
-            response = self.run_model(stream=self.stream)
-            message = response.message
-            tool_calls = message.tool_calls or []
+            tool_result = {}
+            response = {}
 
-            # Add assistant message (text response and tool metadata)
-            if message.content:
-                self.add_assistant_message(message.content)
+            for _ in range(self.max_tool_steps):
+                response = self.run_model(stream=False)
+                message = response.message
+                tool_calls = message.tool_calls or []
 
-            if not tool_calls:
-                break  # No tools requested, we're done
+                # Add assistant message (text response and tool metadata)
+                if message.content:
+                    self.add_assistant_message(message.content)
 
-            for tool in tool_calls:
-               tool_result.update(self._tool_call(tool))
+                if not tool_calls:
+                    break  # No tools requested, we're done
 
-        return True, {"response": response, "tool_result": tool_result}
+                tool_result.update(self._tool_calls(tool_calls))
+
+            return True, {"response": response, "tool_result": tool_result}
 
     def human_output_parser(self, response, remove_thinking=True):
         _response = ChatOllama.human_output_parser(response["response"])
@@ -115,11 +293,38 @@ class Agent(ChatOllama):
         _tool_result = str(response["tool_result"])
 
         _response = _response + "\n\n" + _tool_result
+        if isinstance(response["response"], dict) and response["response"].get("streamed"):
+            # Content is already visible (streamed), show tool results only
+            if response["tool_result"]:
+                self.write_tui(_tool_result)
+            return _response
         self.write_tui(f"Assistant {self.model_name}:")
         self.write_tui(_response)
         return _response
 
 
+def _benchmark_tool_step(calls=5, delay=0.5):
+    """
+    Agent step latency with mocked slow (network bound) tools: sequential vs parallel execution
+    """
+    def _slow_tool(index: int) -> str:
+        time.sleep(delay)
+        return f"result {index}"
+
+    tool_calls = [SimpleNamespace(function=SimpleNamespace(name="slow_tool", arguments={"index": i}))
+                  for i in range(calls)]
+    for parallel in (False, True):
+        agent = Agent(model_name="benchmark", parallel_tools=parallel, tui_console=lambda message: None)
+        agent.tools_mapping = {"slow_tool": _slow_tool}
+        start = time.perf_counter()
+        agent._tool_calls(tool_calls)
+        duration = time.perf_counter() - start
+        order = [m["content"] for m in agent.messages if m["role"] == "tool"]
+        print(f"[{'parallel' if parallel else 'sequential'}] {calls} tool calls x {delay}s: {duration:.2f}s, "
+              f"history order: {order}")
+
+
 if __name__ == "__main__":
+    _benchmark_tool_step()
     agent = Agent(model_name='qwen3:4b', tui_console=None)
     agent.chat_loop()
@@ -1,9 +1,21 @@
-import speech_recognition as sr
-from gtts import gTTS
-from gtts.lang import tts_langs
+"""
+Nolara audio: speech to text, sentence pipelined text to speech
+- SentenceSplitter: streamed model tokens -> speakable chunks at sentence boundaries
+- TTS engines (pluggable): gTTS (online, Google) and pyttsx3 (offline), imported on first use
+- SpeechStream: chunks are synthesized on a worker pool and played back in order, the next chunk is
+  synthesized while the previous one plays - speech starts while the model is still generating
+"""
+import itertools
 import os
 import platform
+import queue
+import re
 import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 SCRIPT_DIR  = os.path.dirname(os.path.abspath(__file__))
@@ -18,6 +30,11 @@ try:
 except ImportError:
     import Config
 
+MIN_CHUNK_CHARS = 40            # Short sentences are merged (less per chunk synthesis and player overhead)
+MAX_CHUNK_CHARS = 300           # Long sentences without a boundary are split at a word boundary
+DEFAULT_TTS_CONFIG = {"tts_engine": "gtts", "tts_workers": 3, "speak_responses": False}
+_CHUNK_IDS = itertools.count()
+
 
 def play_audio_mac(file_path):
     """Plays an audio file on macOS using osascript."""
@@ -56,14 +73,388 @@ def play_audio_cross_platform(file_path):
         print(f"Unsupported operating system: {os_name}")
 
 
+def player_command(file_path) -> list | None:
+    """
+    Blocking player command (returns when the chunk is played: ordered, back-to-back playback)
+    - None: no blocking player found
+    """
+    os_name = platform.system()
+    wav = str(file_path).endswith(".wav")
+    if os_name == "Darwin":
+        return ["afplay", str(file_path)]
+    if os_name == "Linux":
+        for player in (["aplay", "-q"] if wav else ["mpg123", "-q"], ["mpg321", "-q"],
+                       ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"]):
+            if shutil.which(player[0]):
+                return player + [str(file_path)]
+    if os_name == "Windows" and wav:
+        return ["powershell", "-c", f"(New-Object Media.SoundPlayer '{file_path}').PlaySync()"]
+    return None
+
+
+def blocking_player_available(extension) -> bool:
+    return player_command(f"speech{extension}") is not None
+
+
+def play_audio_blocking(file_path, process_callback=None) -> bool:
+    """
+    Play an audio file and wait for the end (fallback: non-blocking system player)
+        process_callback: called with the player process (stop playback)
+    :return: True if played to the end, False if handed to the non-blocking system player (keep the file)
+    """
+    command = player_command(file_path)
+    if command is None:
+        play_audio_cross_platform(file_path)
+        return False
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if process_callback is not None:
+        process_callback(process)
+    process.wait()
+    return True
+
+
 def gtts_lang(language):
     return language.split("-")[0]
 
 
+def tts_config() -> dict:
+    return {**DEFAULT_TTS_CONFIG, **(Config.get("audio") or {})}
+
+
+#############################################################
+#                      SENTENCE SPLITTER                    #
+#############################################################
+
+_SENTENCE_END = re.compile(r"(?<=[.!?:;])[\"')\]]*\s+|\n\s*")
+_ABBREVIATION = re.compile(r"(\b(?i:e\.g|i\.e|etc|vs|mr|mrs|ms|dr|st)|\b[A-Z]\.[A-Z])\.[\"')\]]*$")
+_MARKUP = re.compile(r"[*#`_~>|]+")
+_LIST_BULLET = re.compile(r"(^|\n)\s*[-+]\s+")
+
+
+def speakable(text) -> str:
+    """
+    Drop markdown markup, list bullets and think blocks (not to be read aloud)
+    """
+    text = re.sub(r"<think>.*?(</think>|$)", "", text, flags=re.DOTALL)
+    text = _LIST_BULLET.sub(r"\1", _MARKUP.sub("", text))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class SentenceSplitter:
+    """
+    Incremental sentence splitter for streamed tokens
+    - chunk boundary: sentence end followed by whitespace, line break (paragraphs, list items)
+    - chunks shorter than min_chars are merged with the next sentence, longer than max_chars are split at a space
+    """
+
+    def __init__(self, min_chars=MIN_CHUNK_CHARS, max_chars=MAX_CHUNK_CHARS):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+        self._chunk = ""            # Complete sentences waiting for min_chars
+        self._in_think = False
+
+    def _add_sentence(self, sentence, pause=True) -> list[str]:
+        sentence = speakable(sentence)
+        if pause and sentence and sentence[-1].isalnum():
+            sentence += "."         # List items, headings: pause between merged sentences
+        self._chunk = f"{self._chunk} {sentence}".strip()
+        if len(self._chunk) < self.min_chars:
+            return []
+        chunk, self._chunk = self._chunk, ""
+        return [chunk]
+
+    def feed(self, token) -> list[str]:
+        """
+        Add a streamed token, return the completed chunks
+        """
+        self._buffer += token
+        if "<think>" in self._buffer:
+            self._in_think = True
+        if self._in_think:
+            if "</think>" not in self._buffer:
+                return []
+            self._buffer = self._buffer.split("</think>", 1)[1]
+            self._in_think = False
+        chunks = []
+        position = 0
+        while True:
+            match = _SENTENCE_END.search(self._buffer, position)
+            if match is None:
+                break
+            if _ABBREVIATION.search(self._buffer, 0, match.start()):
+                position = match.end()          # "e.g. ", "U.S. ": not a sentence end
+                continue
+            sentence, self._buffer = self._buffer[:match.end()], self._buffer[match.end():]
+            position = 0
+            chunks += self._add_sentence(sentence)
+        while len(self._buffer) > self.max_chars:
+            cut = self._buffer.rfind(" ", 0, self.max_chars)
+            cut = cut if cut > 0 else self.max_chars
+            sentence, self._buffer = self._buffer[:cut], self._buffer[cut:]
+            chunks += self._add_sentence(sentence, pause=False)
+        return chunks
+
+    def flush(self) -> list[str]:
+        """
+        End of the stream: the remaining text
+        """
+        if self._in_think:
+            self._buffer = ""
+        chunk = f"{self._chunk} {speakable(self._buffer)}".strip()
+        self._chunk, self._buffer, self._in_think = "", "", False
+        return [chunk] if chunk else []
+
+
+#############################################################
+#                        TTS ENGINES                        #
+#############################################################
+
+class TTSEngine:
+    """
+    Text to speech engine interface: synthesize one chunk into an audio file
+    - parallel: synthesize() can run on several worker threads at once
+    """
+    name = None
+    extension = ".mp3"
+    parallel = True
+    module = None                   # Engine library (availability check without import)
+
+    def __init__(self, language):
+        self.language = language
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            from . import Startup
+        except ImportError:
+            import Startup
+        return cls.module is None or Startup.module_available(cls.module)
+
+    def synthesize(self, text, file_path):
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+
+class GTTSEngine(TTSEngine):
+    """
+    Google Translate text to speech (online, mp3)
+    """
+    name = "gtts"
+    module = "gtts"
+
+    def synthesize(self, text, file_path):
+        from gtts import gTTS
+        gTTS(text=text, lang=gtts_lang(self.language), slow=False).save(file_path)
+
+
+class Pyttsx3Engine(TTSEngine):
+    """
+    Offline system voices (pyttsx3: espeak, NSSpeechSynthesizer, SAPI5), one synthesis at a time
+    """
+    name = "pyttsx3"
+    module = "pyttsx3"
+    extension = ".wav"
+    parallel = False
+    _engine = None
+    _lock = threading.Lock()
+
+    def _init_engine(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        language = self.language.lower().replace("-", "_")
+        for voice in engine.getProperty("voices"):
+            voice_languages = [str(l).lower().lstrip("\x05").replace("-", "_") for l in (voice.languages or [])]
+            if any(l.startswith(language[:2]) for l in voice_languages + [voice.id.lower()]):
+                engine.setProperty("voice", voice.id)
+                break
+        return engine
+
+    def synthesize(self, text, file_path):
+        with Pyttsx3Engine._lock:
+            if Pyttsx3Engine._engine is None:
+                Pyttsx3Engine._engine = self._init_engine()
+            Pyttsx3Engine._engine.save_to_file(text, file_path)
+            Pyttsx3Engine._engine.runAndWait()
+
+
+ENGINES = {engine.name: engine for engine in (GTTSEngine, Pyttsx3Engine)}
+
+
+def tts_available() -> bool:
+    return any(engine.available() for engine in ENGINES.values())
+
+
+def get_engine(name=None, language=None) -> TTSEngine:
+    """
+    Configured TTS engine (audio.tts_engine), falls back to an installed engine
+    """
+    if language is None:
+        language = Config.get("language") or "en-US"
+    name = name or tts_config()["tts_engine"]
+    engine = ENGINES.get(name)
+    if engine is None or not engine.available():
+        fallback = next((e for e in ENGINES.values() if e.available()), None)
+        if fallback is None:
+            raise RuntimeError(f"No text to speech engine installed: {', '.join(ENGINES)}")
+        print(f"[TTS] {name} engine is not available, using {fallback.name}")
+        engine = fallback
+    return engine(language)
+
+
+#############################################################
+#                  PIPELINED SPEECH STREAM                  #
+#############################################################
+
+class SpeechStream:
+    """
+    Streamed text to speech: feed() tokens as they arrive, close() at the end of the response
+    - complete sentences are synthesized on a worker pool (engine.parallel: workers, otherwise one)
+    - ordered playback queue: chunk n plays while the next chunks are synthesized
+    - no blocking system player (e.g. mp3 on Windows): the whole text is spoken from one file at close()
+        engine: TTSEngine instance (None: configured engine)
+        player: callable(file path) blocking until played (None: system player)
+    """
+    _END = object()
+
+    def __init__(self, engine:TTSEngine|None=None, workers:int|None=None, player=None, splitter=None):
+        self.engine = engine or get_engine()
+        workers = workers or tts_config()["tts_workers"]
+        self.splitter = splitter or SentenceSplitter()
+        self.player = player
+        self.pipelined = player is not None or blocking_player_available(self.engine.extension)
+        if not self.pipelined:
+            print(f"[TTS] No blocking player for {self.engine.extension} files (afplay, aplay, mpg123, ffplay): "
+                  f"speaking the response at the end")
+        self._pending:list = []                   # Chunks of the not pipelined stream
+        self._executor = ThreadPoolExecutor(max_workers=workers if self.engine.parallel else 1,
+                                            thread_name_prefix="nolara-tts")
+        self._queue = queue.Queue()               # Synthesis futures in text order
+        self._cancelled = threading.Event()
+        self._process = None                      # Current player process (system player)
+        self._playback = threading.Thread(target=self._play_loop, name="nolara-tts-playback", daemon=True)
+        self._playback.start()
+        # Latency
+        self.start_time = time.perf_counter()
+        self.first_audio_s:float|None = None      # Stream start -> first chunk playback
+        self.chunks = 0
+        self.text_chars = 0                       # Fed text length
+        self.gaps:list = []                        # Wait for synthesis between chunks (s)
+
+    def _synthesize(self, text) -> str | None:
+        if self._cancelled.is_set():
+            return None
+        os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
+        if self.pipelined:
+            file_path = os.path.join(AUDIO_CACHE_DIR, f"speech_{next(_CHUNK_IDS)}{self.engine.extension}")
+        else:
+            # One file, kept for the system player (overwritten by the next response)
+            file_path = str(Path(AUDIO_OUT_CACHE_FILE).with_suffix(self.engine.extension))
+        self.engine.synthesize(text, file_path)
+        return file_path
+
+    def _play(self, file_path) -> bool:
+        """
+        Play a chunk, True: played to the end (the file can be deleted)
+        """
+        if self.player is not None:
+            self.player(file_path)
+            return True
+        return play_audio_blocking(file_path, process_callback=self._set_process)
+
+    def _set_process(self, process):
+        self._process = process
+
+    def _play_loop(self):
+        played = None
+        while True:
+            future = self._queue.get()
+            if future is self._END:
+                return
+            wait_start = time.perf_counter()
+            try:
+                file_path = future.result()
+            except Exception as e:
+                if not self._cancelled.is_set():
+                    print(f"[TTS] Synthesis failed: {e}")
+                continue
+            if file_path is None:
+                continue
+            if self._cancelled.is_set():
+                Path(file_path).unlink(missing_ok=True)
+                continue
+            if played is not None:
+                self.gaps.append(time.perf_counter() - wait_start)
+            elif self.first_audio_s is None:
+                self.first_audio_s = time.perf_counter() - self.start_time
+            played_to_end = True
+            try:
+                played_to_end = self._play(file_path)
+            except Exception as e:
+                print(f"[TTS] Playback failed: {e}")
+            finally:
+                self._process = None
+                played = file_path
+                self.chunks += 1
+                if played_to_end:
+                    Path(file_path).unlink(missing_ok=True)
+
+    def _submit(self, chunks):
+        if not self.pipelined:
+            self._pending += chunks
+            return
+        for chunk in chunks:
+            if not self._cancelled.is_set():
+                self._queue.put(self._executor.submit(self._synthesize, chunk))
+
+    def feed(self, token):
+        """
+        Add streamed model output (thread safe for a single producer)
+        """
+        self.text_chars += len(token)
+        self._submit(self.splitter.feed(token))
+
+    def close(self):
+        """
+        End of the text: speak the rest, the playback continues in the background
+        """
+        self._submit(self.splitter.flush())
+        if not self.pipelined and self._pending and not self._cancelled.is_set():
+            self._queue.put(self._executor.submit(self._synthesize, " ".join(self._pending)))
+        self._queue.put(self._END)
+        self._executor.shutdown(wait=False)
+
+    def wait(self, timeout=None) -> bool:
+        """
+        Wait for the end of the playback (after close)
+        """
+        self._playback.join(timeout)
+        return not self._playback.is_alive()
+
+    def cancel(self):
+        """
+        Stop speaking: pending chunks are dropped, the current playback is stopped
+        """
+        self._cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+        self._queue.put(self._END)
+
+    @property
+    def speaking(self) -> bool:
+        return self._playback.is_alive()
+
+
+#############################################################
+#                  SPEECH TO TEXT / TEXT TO SPEECH          #
+#############################################################
+
 def speech_to_text(language):
     """
     Converts speech to text using Google's Speech-to-Text API.
     """
+    import speech_recognition as sr
 
     text = ""
     recognizer = sr.Recognizer()
@@ -81,19 +472,17 @@ def speech_to_text(language):
     return text
 
 
-def text_to_speech(text, language=None):
+def text_to_speech(text, language=None, wait=True) -> SpeechStream:
     """
-    Converts text to speech using Google's Text-to-Speech API.
+    Converts text to speech with the configured engine (sentence pipelined: first sentence plays first)
+        wait: block until the whole text is played
     """
-    if language is None:
-        language = Config.get("language") or "en-US"  # Default to English
-    # Text-to-Speech
-    remove_chars = ["*"]
-    for char in remove_chars:
-        text = text.replace(char, "")
-    tts = gTTS(text=text, lang=gtts_lang(language), slow=False)
-    tts.save(AUDIO_OUT_CACHE_FILE)
-    play_audio_cross_platform(AUDIO_OUT_CACHE_FILE)  # Use cross-platform playback
+    speech = SpeechStream(engine=get_engine(language=language))
+    speech.feed(text)
+    speech.close()
+    if wait:
+        speech.wait()
+    return speech
 
 
 def delete_audio_cache():
@@ -132,6 +521,7 @@ def echo_speech(language=None):
 
 
 def list_languages():
+    from gtts.lang import tts_langs
     print("[TTS] Text-to-speech languages (gTTS):")
     languages = tts_langs()
     for code, name in languages.items():
@@ -139,9 +529,91 @@ def list_languages():
     print("[STT] Voice recognition languages (speech_recognition):\n\thttps://cloud.google.com/speech-to-text/docs/speech-to-text-supported-languages")
 
 
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+class _SimulatedEngine(TTSEngine):
+    """
+    Offline benchmark engine: synthesis time ~ text length, no audio output
+    """
+    name = "simulated"
+
+    def __init__(self, language="en-US", sec_per_char=0.002, latency=0.3):
+        super().__init__(language)
+        self.sec_per_char = sec_per_char
+        self.latency = latency
+
+    def synthesize(self, text, file_path):
+        time.sleep(self.latency + len(text) * self.sec_per_char)
+        with open(file_path, "w") as f:
+            f.write(text)
+
+
+def _test_splitter():
+    splitter = SentenceSplitter(min_chars=20)
+    text = ("<think>plan the answer.</think>Hello! This is **Nolara**, your assistant. Pi is 3.14 and "
+            "e.g. values work.\n\n- first item\n- second item\nThe end")
+    chunks = []
+    for i in range(0, len(text), 3):
+        chunks += splitter.feed(text[i:i + 3])
+    chunks += splitter.flush()
+    assert chunks == ["Hello! This is Nolara, your assistant.", "Pi is 3.14 and e.g. values work.",
+                      "first item. second item.", "The end"], chunks
+    chunks = SentenceSplitter(min_chars=1).feed("The answer is no. It works with version 2. Use version 3 in "
+                                                "the U.S. office and the E.U. one. Done ")
+    assert chunks == ["The answer is no.", "It works with version 2.",
+                      "Use version 3 in the U.S. office and the E.U. one."], chunks
+    long_chunks = SentenceSplitter(max_chars=50).feed("word " * 40)
+    assert long_chunks and all(len(c) <= 50 for c in long_chunks), long_chunks
+    print("[SentenceSplitter] OK")
+
+
+def _benchmark_pipeline(sentences=8, token_delay=0.03, sec_per_char=0.002, latency=0.3, play_sec_per_char=0.01):
+    """
+    Time to first audio and playback gaps: full response -> one synthesis -> play (previous behavior)
+    vs sentence pipelined streaming (simulated model stream, engine and player)
+    """
+    text = " ".join(f"This is sentence number {i} of the simulated model answer." for i in range(sentences))
+    tokens = [f"{word} " for word in text.split(" ")]
+    engine = _SimulatedEngine(sec_per_char=sec_per_char, latency=latency)
+
+    def _player(file_path):
+        time.sleep(os.path.getsize(file_path) * play_sec_per_char)
+
+    # Previous: wait for the full response, synthesize everything, then play
+    start = time.perf_counter()
+    for _ in tokens:
+        time.sleep(token_delay)
+    engine.synthesize(speakable(text), os.path.join(AUDIO_CACHE_DIR, "benchmark_full.mp3"))
+    legacy_first_audio = time.perf_counter() - start
+    _player(os.path.join(AUDIO_CACHE_DIR, "benchmark_full.mp3"))
+    legacy_total = time.perf_counter() - start
+    os.remove(os.path.join(AUDIO_CACHE_DIR, "benchmark_full.mp3"))
+
+    # Pipelined: speech starts after the first sentence
+    start = time.perf_counter()
+    speech = SpeechStream(engine=engine, workers=3, player=_player)
+    for token in tokens:
+        time.sleep(token_delay)
+        speech.feed(token)
+    generation_done = time.perf_counter() - start
+    speech.close()
+    speech.wait()
+    total = time.perf_counter() - start
+    print(f"{sentences} sentences, generation {generation_done:.2f}s: "
+          f"full response TTS - first audio {legacy_first_audio:.2f}s, done {legacy_total:.2f}s | "
+          f"pipelined - first audio {speech.first_audio_s:.2f}s, done {total:.2f}s, {speech.chunks} chunks, "
+          f"max gap {max(speech.gaps, default=0) * 1000:.0f} ms")
+
+
 if __name__ == "__main__":
-    list_languages()
-    text_to_speech("Nollara")
+    if "--benchmark" in sys.argv:
+        _test_splitter()
+        _benchmark_pipeline()
+    else:
+        list_languages()
+        text_to_speech("Nollara")
 
     #echo_speech(language="en-US")
-    #echo_speech(language="hu-HU")
\ No newline at end of file
+    #echo_speech(language="hu-HU")
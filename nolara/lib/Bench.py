@@ -0,0 +1,342 @@
+"""
+LLM latency and throughput benchmark of the configured models (nolara bench)
+- fixed prompt suite: chat tasks (ChatOllama) and tool tasks (Agents.Agent), streamed like the TUI
+- cold (model unloaded) and warm time to first token, tokens/s (ollama eval counts), total latency, agent steps
+- JSON result lines appended to a history file, comparison report: models side by side, deltas to a baseline run
+- --mock: local mock Ollama server with scripted replies and timings (offline regression test of the harness)
+Usage:
+    nolara bench
+    nolara bench --models qwen3:4b,gemma3:4b --repeats 5 --tasks greeting,calculator
+    nolara bench --mock
+"""
+import argparse
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+
+try:
+    from . import Config
+    from . import ChatOllama
+    from .Agents import Agent
+    from .MockOllama import MockOllamaServer
+except ImportError:
+    import Config
+    import ChatOllama
+    from Agents import Agent
+    from MockOllama import MockOllamaServer
+
+RESULTS_FILE = Path(__file__).parent.parent / "configuration" / "llm_bench_results.jsonl"
+SYSTEM_PROMPT = "You are a helpful assistant. Answer briefly."
+# agent: run with Agents.Agent (tools), mock: scripted steps of the mock Ollama server
+PROMPT_SUITE = [
+    {"name": "greeting", "agent": False, "prompt": "Say hello in one short sentence.",
+     "mock": [{"content": "Hello! How can I help you today?"}]},
+    {"name": "explain", "agent": False, "prompt": "Explain in three sentences why the sky is blue.",
+     "mock": [{"content": "Sunlight is scattered by the molecules of the air. Blue light has a shorter wavelength, "
+                          "so it is scattered much more than red light. This scattered blue light reaches our eyes "
+                          "from every direction of the sky."}]},
+    {"name": "summary", "agent": False, "prompt": "Describe how a CPU cache works in about 100 words.",
+     "mock": [{"content": " ".join(["A CPU cache keeps recently used memory lines close to the core."] * 8)}]},
+    {"name": "calculator", "agent": True, "prompt": "What is 1234 * 5678? Use the calculator tool.",
+     "mock": [{"tool_calls": [{"name": "calculator", "arguments": {"expression": "1234 * 5678"}}]},
+              {"content": "1234 * 5678 = 7006652."}]},
+    {"name": "datetime", "agent": True, "prompt": "Which year is it now? Use a tool to check.",
+     "mock": [{"content": "Let me check the date.", "tool_calls": [{"name": "get_current_datetime"}]},
+              {"content": "According to the current date it is this year."}]},
+]
+
+
+def _quiet(message, end="\n"):
+    pass
+
+
+def _median(values) -> float | None:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 4) if values else None
+
+
+def _mock_timings(model) -> dict:
+    """
+    Deterministic mock timings scaled by the parameter size in the model name ("qwen3:4b" -> 4, default: 2)
+    """
+    match = re.search(r"(\d+(?:\.\d+)?)b\b", model.lower())
+    size = float(match.group(1)) if match else 2.0
+    return {"load_delay": 0.05 * size, "prefill_delay": 0.002 * size, "token_delay": 0.001 * size}
+
+
+def mock_server(models) -> MockOllamaServer:
+    return MockOllamaServer(installed=models, tool_models=models,
+                            scripts={task["prompt"]: task["mock"] for task in PROMPT_SUITE},
+                            model_timings={model: _mock_timings(model) for model in models})
+
+
+#############################################################
+#                       MEASUREMENT                         #
+#############################################################
+
+def _eval_stats(response) -> dict:
+    """
+    Ollama timing stats of a finished request (durations: ns -> s)
+    """
+    stats = {key: response.get(key) or 0 for key in ("eval_count", "prompt_eval_count")}
+    for key in ("eval_duration", "prompt_eval_duration", "load_duration", "total_duration"):
+        stats[key] = (response.get(key) or 0) / 1e9
+    return stats
+
+
+def _metered_stream(stream, requests: list):
+    try:
+        for chunk in stream:
+            if chunk.get("done"):
+                requests.append(_eval_stats(chunk))
+            yield chunk
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+
+def _meter(chatbot) -> list:
+    """
+    Record the ollama stats of every model request (agent step) of the chatbot
+    """
+    requests = []
+    run_model = chatbot.run_model
+
+    def _run_model(stream=False):
+        response = run_model(stream=stream)
+        if stream:
+            return _metered_stream(response, requests)
+        requests.append(_eval_stats(response))
+        return response
+
+    chatbot.run_model = _run_model
+    return requests
+
+
+def unload(model, host=None):
+    """
+    Unload the model (next request is a cold start)
+    """
+    ChatOllama.client(host).generate(model=model, keep_alive=0)
+    ChatOllama.MODEL_STATE.pop(model, None)
+
+
+def run_task(model, task, host=None, cold=False) -> dict:
+    """
+    One streamed run of a suite task on a fresh chat (no history), cold: unload the model first
+    """
+    if task["agent"]:
+        chatbot = Agent(model, stream=True, tui_console=_quiet)
+    else:
+        chatbot = ChatOllama.ChatOllama(model, stream=True, tui_console=_quiet)
+    chatbot.host = host
+    chatbot.system_prompt(SYSTEM_PROMPT)
+    _ = chatbot.context_budget          # Resolve num_ctx (model metadata of host) outside the measurement
+    if cold:
+        unload(model, host)
+    requests = _meter(chatbot)
+    start = time.perf_counter()
+    try:
+        chatbot.chat(task["prompt"])
+        error = None
+    except Exception as e:
+        error = str(e)[:200]
+    total = time.perf_counter() - start
+    eval_count = sum(r["eval_count"] for r in requests)
+    eval_duration = sum(r["eval_duration"] for r in requests)
+    return {"ok": error is None and eval_count > 0, "error": error,
+            "ttft_s": round(chatbot.last_ttft, 4) if chatbot.last_ttft is not None else None,
+            "total_s": round(total, 4),
+            "steps": len(requests),
+            "tool_calls": sum(1 for m in chatbot.messages if m["role"] == "tool"),
+            "eval_count": eval_count,
+            "tokens_per_s": round(eval_count / eval_duration, 1) if eval_duration else None,
+            "prompt_eval_count": sum(r["prompt_eval_count"] for r in requests),
+            "load_s": round(sum(r["load_duration"] for r in requests), 4)}
+
+
+def _task_summary(runs: list) -> dict:
+    errors = [r["error"] for r in runs if r["error"]]
+    return {"runs": len(runs), "ok": sum(r["ok"] for r in runs),
+            **{key: _median(r[key] for r in runs)
+               for key in ("ttft_s", "total_s", "steps", "tool_calls", "eval_count", "tokens_per_s")},
+            **({"errors": errors[:3]} if errors else {})}
+
+
+def bench_model(model, host=None, suite=PROMPT_SUITE, repeats=3, on_progress=None) -> dict:
+    """
+    Cold start (first suite task after unload), then every task repeats times on the loaded model
+    """
+    cold = run_task(model, suite[0], host, cold=True)
+    tasks, warm_runs = {}, []
+    for task in suite:
+        runs = [run_task(model, task, host) for _ in range(repeats)]
+        if on_progress is not None:
+            on_progress(model, task["name"], runs)
+        warm_runs += [(task, run) for run in runs]
+        tasks[task["name"]] = _task_summary(runs)
+    chat_runs = [run for task, run in warm_runs if not task["agent"]]
+    return {"cold_ttft_s": cold["ttft_s"], "cold_load_s": cold["load_s"], "cold_total_s": cold["total_s"],
+            "warm_ttft_s": _median(run["ttft_s"] for run in chat_runs),
+            "tokens_per_s": _median(run["tokens_per_s"] for _, run in warm_runs),
+            "total_s": _median(run["total_s"] for run in chat_runs),
+            "agent_steps": _median(run["steps"] for task, run in warm_runs if task["agent"]),
+            "ok": sum(run["ok"] for _, run in warm_runs) + cold["ok"], "runs": len(warm_runs) + 1,
+            "tasks": tasks}
+
+
+def benchmark(models, host=None, mock=False, repeats=3, tasks=None, on_progress=None) -> dict:
+    """
+    Run the prompt suite on every model
+        host: ollama host (None: OLLAMA_HOST env / default), mock: local mock Ollama server
+        tasks: suite task names (None: all)
+    """
+    suite = [task for task in PROMPT_SUITE if not tasks or task["name"] in tasks]
+    if not suite:
+        raise ValueError(f"No such task: {tasks}, available: {[task['name'] for task in PROMPT_SUITE]}")
+    server = mock_server(models).start() if mock else None
+    try:
+        results = {model: bench_model(model, server.host if server else host, suite, repeats, on_progress)
+                   for model in models}
+    finally:
+        if server is not None:
+            server.stop()
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "target": "mock" if mock else (host or "default"),
+            "config": {"repeats": repeats, "tasks": [task["name"] for task in suite],
+                       "ollama": Config.get("ollama"), "context": Config.get("context")},
+            "results": results}
+
+
+#############################################################
+#                    RESULTS AND REPORT                     #
+#############################################################
+
+def save_result(result: dict, path=RESULTS_FILE) -> None:
+    """
+    Append one JSON line per run (history for comparison over time)
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+
+def load_baseline(path=RESULTS_FILE, target=None) -> dict | None:
+    """
+    Last result of a JSON / JSON lines file (target: last run against the same ollama target)
+    """
+    try:
+        text = Path(path).read_text().strip()
+    except FileNotFoundError:
+        return None
+    if not text:
+        return None
+    if text.startswith("{") and "\n{" not in text:
+        return json.loads(text)
+    results = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return next((r for r in reversed(results) if target is None or r.get("target") == target), None)
+
+
+def _fmt(value, unit="") -> str:
+    if value is None:
+        return "-"
+    return f"{value:.3f}{unit}" if unit == "s" else f"{value:g}{unit}"
+
+
+def _delta(value, previous, higher_is_better=False) -> str:
+    if value is None or not previous:
+        return ""
+    change = (value - previous) / previous
+    better = change > 0 if higher_is_better else change < 0
+    return f" ({change:+.0%}{'' if abs(change) < 0.05 else ' better' if better else ' worse'})"
+
+
+COLUMNS = (("cold TTFT", "cold_ttft_s", "s", False), ("warm TTFT", "warm_ttft_s", "s", False),
+           ("tokens/s", "tokens_per_s", "", True), ("latency", "total_s", "s", False),
+           ("agent steps", "agent_steps", "", False))
+
+
+def report(result: dict, baseline: dict | None = None) -> str:
+    """
+    Models side by side (+ change to the baseline run), per task medians
+    """
+    lines = [f"[{result['timestamp']}] target: {result['target']} config: {result['config']['tasks']} "
+             f"x {result['config']['repeats']}"]
+    if baseline:
+        lines.append(f"baseline: {baseline['timestamp']} ({baseline['target']})")
+    lines.append(f"{'model':<24}" + "".join(f"{title:>24}" for title, *_ in COLUMNS) + f"{'ok':>10}")
+    for model, run in result["results"].items():
+        previous = (baseline or {}).get("results", {}).get(model, {})
+        cells = [_fmt(run[key], unit) + _delta(run[key], previous.get(key), better)
+                 for _, key, unit, better in COLUMNS]
+        lines.append(f"{model:<24}" + "".join(f"{cell:>24}" for cell in cells) + f"{run['ok']:>6}/{run['runs']}")
+    for model, run in result["results"].items():
+        lines.append(f"{model}:")
+        for name, task in run["tasks"].items():
+            lines.append(f"\t{name:>12}: TTFT {_fmt(task['ttft_s'], 's')}  latency {_fmt(task['total_s'], 's')}  "
+                         f"{_fmt(task['tokens_per_s'])} tok/s  {_fmt(task['eval_count'])} tokens  "
+                         f"steps {_fmt(task['steps'])}  tools {_fmt(task['tool_calls'])}  ok {task['ok']}/{task['runs']}"
+                         + (f"  errors: {task['errors']}" if task.get("errors") else ""))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="nolara bench", description="LLM latency and throughput benchmark")
+    parser.add_argument("--models", default=None, help="Comma separated models (default: config models)")
+    parser.add_argument("--host", default=None, help="Ollama host (default: OLLAMA_HOST env / localhost)")
+    parser.add_argument("--mock", action="store_true", help="Local mock Ollama server (scripted, offline)")
+    parser.add_argument("--repeats", type=int, default=3, help="Warm runs per task")
+    parser.add_argument("--tasks", default=None,
+                        help=f"Comma separated suite tasks: {','.join(task['name'] for task in PROMPT_SUITE)}")
+    parser.add_argument("--output", default=str(RESULTS_FILE), help="JSON lines result history file")
+    parser.add_argument("--baseline", default=None,
+                        help="Result file to compare with (default: previous run of the history file)")
+    args = parser.parse_args(argv)
+    models = args.models.split(",") if args.models else Config.get("models")
+    tasks = args.tasks.split(",") if args.tasks else None
+    target = "mock" if args.mock else (args.host or "default")
+    baseline = load_baseline(args.baseline) if args.baseline else load_baseline(args.output, target=target)
+
+    def _progress(model, task, runs):
+        print(f"\t[{model}] {task}: {sum(r['ok'] for r in runs)}/{len(runs)} ok, "
+              f"latency {_fmt(_median(r['total_s'] for r in runs), 's')}", flush=True)
+
+    print(f"Benchmark {models} ({target}), {args.repeats} runs per task...")
+    result = benchmark(models, host=args.host, mock=args.mock, repeats=args.repeats, tasks=tasks,
+                       on_progress=_progress)
+    print(report(result, baseline))
+    save_result(result, args.output)
+    print(f"Result appended to {args.output}")
+    return result
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _test():
+    """
+    Offline regression test of the harness against the scripted mock Ollama server
+    """
+    models = ["fast:1b", "slow:4b"]
+    result = benchmark(models, mock=True, repeats=2)
+    print(report(result))
+    fast, slow = (result["results"][model] for model in models)
+    for model, run in result["results"].items():
+        assert run["ok"] == run["runs"], f"{model}: failed runs {run}"
+        assert run["cold_ttft_s"] > run["warm_ttft_s"], f"{model}: cold start is not slower"
+        assert run["tasks"]["calculator"]["steps"] == 2 and run["tasks"]["calculator"]["tool_calls"] == 1
+        assert run["tasks"]["datetime"]["steps"] == 2 and run["tasks"]["datetime"]["tool_calls"] == 1
+        assert run["tasks"]["greeting"]["steps"] == 1
+    assert fast["tokens_per_s"] > slow["tokens_per_s"] and fast["total_s"] < slow["total_s"]
+    # Model speed from the mock timings: 1 / token_delay
+    assert abs(fast["tokens_per_s"] - 1000) < 50 and abs(slow["tokens_per_s"] - 250) < 15, (fast, slow)
+    report(result, baseline=result)
+    print("[Bench] OK")
+
+
+if __name__ == "__main__":
+    _test()
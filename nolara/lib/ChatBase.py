@@ -1,4 +1,21 @@
 import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+MESSAGE_TOKEN_OVERHEAD = 4          # Role and chat template tokens per message
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate token count (~4 characters per token)
+    """
+    return len(text) // 4 + 1
+
+
+def message_tokens(message: dict) -> int:
+    return estimate_tokens(message.get("content") or "") + MESSAGE_TOKEN_OVERHEAD
 
 
 class ChatBase:
@@ -9,6 +26,20 @@ class ChatBase:
         self.messages:list = [{"role": "system", "content": self._system_prompt}]
         self.debug_print:bool = debug_print
         self.tui_console:callable|None = tui_console
+        self._cancel_event = threading.Event()        # Abort in-flight (streamed) generation
+        # Context window management
+        self._context_budget:int|None = None          # Prompt token budget (0: unlimited), resolved lazily
+        self.summarize_evicted:bool = False           # Summarize evicted turns in the background
+        self._context_lock = threading.Lock()
+        self._idle = threading.Event()                # No generation in progress
+        self._idle.set()
+        self._evicted:list = []                       # Evicted messages waiting for summary
+        self._pending_summary:str|None = None         # Background summary, applied on the next request
+        self._summarizer:threading.Thread|None = None
+        # Latency
+        self._request_start:float = 0
+        self.last_ttft:float|None = None              # Time to first streamed token of the last request
+        self.stream_listener:callable|None = None     # Streamed token consumer (e.g. text to speech)
 
     def __str__(self):
         return (f"ChatBase(model_name={self.model_name},"
@@ -31,7 +62,21 @@ class ChatBase:
         if self.tui_console is None:
             print(message, end=end, flush=flush)
             return
-        self.tui_console(message)
+        if end == "\n":
+            self.tui_console(message)
+        else:
+            self.tui_console(message, end=end)
+
+    def write_stream(self, token):
+        """
+        Write a streamed token as it arrives (no line break)
+        """
+        if token:
+            if self.last_ttft is None:
+                self.last_ttft = time.perf_counter() - self._request_start
+            self.write_tui(token, end="")
+            if self.stream_listener is not None:
+                self.stream_listener(token)
 
     #####################################################
     #              Chat History Management              #
@@ -46,15 +91,20 @@ class ChatBase:
     def add_user_message(self, message):
         """
         Add a user message to the chat history.
+        - starts a new turn: enforce the context token budget
         """
         user = {"role": "user", "content": message}
         self.messages.append(user)
+        self.trim_context()
 
     def clear_messages(self):
         """
         Clear all messages in the chat history.
         """
-        self.messages = [{"role": "system", "content": self._system_prompt}]
+        with self._context_lock:
+            self.messages = [{"role": "system", "content": self._system_prompt}]
+            self._evicted = []
+            self._pending_summary = None
 
     def system_prompt(self, prompt=None) -> str:
         """
@@ -67,9 +117,168 @@ class ChatBase:
             self.messages[0] = {"role": "system", "content": self._system_prompt}
         return self._system_prompt
 
+    #####################################################
+    #              Context Window Management            #
+    #####################################################
+    @property
+    def context_budget(self) -> int:
+        """
+        Prompt token budget of the model (0: unlimited)
+        """
+        if self._context_budget is None:
+            self._context_budget = self.model_context_budget()
+        return self._context_budget
+
+    @context_budget.setter
+    def context_budget(self, tokens:int):
+        self._context_budget = tokens
+
+    def model_context_budget(self) -> int:
+        """
+        Resolve prompt token budget from model metadata (override in subclasses)
+        """
+        return 0
+
+    def context_tokens(self) -> int:
+        return sum(message_tokens(m) for m in self.messages)
+
+    def _header_size(self) -> int:
+        """
+        Pinned messages: system prompt (+ summary of evicted turns)
+        """
+        if len(self.messages) > 1 and self.messages[1]["role"] == "system" \
+                and self.messages[1]["content"].startswith(SUMMARY_PREFIX):
+            return 2
+        return 1
+
+    def trim_context(self):
+        """
+        Keep the history within the token budget: evict the oldest whole turns
+        - pinned: system prompt, summary and the current turn
+        - a turn is a user message with its assistant and tool messages (tool call pairs stay together)
+        """
+        budget = self.context_budget
+        with self._context_lock:
+            if self._pending_summary is not None:
+                summary = {"role": "system", "content": f"{SUMMARY_PREFIX}\n{self._pending_summary}"}
+                if self._header_size() == 2:
+                    self.messages[1] = summary
+                else:
+                    self.messages.insert(1, summary)
+                self._pending_summary = None
+            if budget <= 0:
+                return
+            header = self._header_size()
+            total = self.context_tokens()
+            if total <= budget:
+                return
+            turn_starts = [i for i in range(header, len(self.messages)) if self.messages[i]["role"] == "user"]
+            cut = header
+            for next_turn in turn_starts[1:]:
+                if total <= budget:
+                    break
+                total -= sum(message_tokens(m) for m in self.messages[cut:next_turn])
+                cut = next_turn
+            if cut == header:
+                return      # Only the current turn left
+            evicted = self.messages[header:cut]
+            del self.messages[header:cut]
+            self.print(f"[context] evicted {len(evicted)} messages, {total}/{budget} tokens")
+            if self.summarize_evicted:
+                self._evicted.extend(evicted)
+
+    def _start_summarizer(self):
+        if not self._evicted or (self._summarizer is not None and self._summarizer.is_alive()):
+            return
+        self._summarizer = threading.Thread(target=self._summarize_evicted, name="nolara-summary", daemon=True)
+        self._summarizer.start()
+
+    def _summarize_evicted(self):
+        """
+        Background summary of evicted turns: runs when idle, retried after the next request if interrupted
+        """
+        with self._context_lock:
+            evicted, self._evicted = self._evicted, []
+            header = self.messages[1]["content"] if self._header_size() == 2 else None
+        previous = self._pending_summary or (header[len(SUMMARY_PREFIX):].strip() if header else None)
+        summary = None
+        try:
+            summary = self.summarize(previous, evicted)
+        except Exception as e:
+            self.print(f"[context] summary failed: {e}")
+        with self._context_lock:
+            if summary:
+                self._pending_summary = summary
+            else:
+                self._evicted = evicted + self._evicted
+
+    def summarize(self, summary:str|None, messages:list) -> str|None:
+        """
+        Fold evicted messages into the running summary (override in subclasses)
+        - return None if not supported or interrupted (a new request started: not idle)
+        """
+        return None
+
+    @contextmanager
+    def generation(self):
+        """
+        Mark a request in progress (background summary yields to it), reset cancellation
+        - idle again: summarize the evicted turns in the background
+        """
+        self._cancel_event.clear()
+        self._idle.clear()
+        self._request_start = time.perf_counter()
+        self.last_ttft = None
+        try:
+            yield
+        finally:
+            self._idle.set()
+            if self.summarize_evicted:
+                self._start_summarizer()
+
     #####################################################
     #                   LLM Model usage                 #
     #####################################################
+    def cancel(self):
+        """
+        Abort the in-flight generation (thread safe)
+        - streamed responses are closed, the server stops generating
+        """
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def iter_stream(self, stream):
+        """
+        Iterate a model response stream until done or cancelled.
+        The stream is always closed (closing the HTTP response stops server side generation).
+        """
+        try:
+            for chunk in stream:
+                if self.cancelled:
+                    break
+                yield chunk
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+    async def aiter_stream(self, stream):
+        """
+        Async version of iter_stream: the stream is always closed (stops server side generation)
+        """
+        try:
+            async for chunk in stream:
+                if self.cancelled:
+                    break
+                yield chunk
+        finally:
+            close = getattr(stream, "aclose", None)
+            if close is not None:
+                await close()
+
     def run_model(self, stream=False):
         """
         The LLM wrapper function to handle the chat interaction.
@@ -134,3 +343,43 @@ class ChatBase:
                 if not success:
                     break
         self.print("Bye!")
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _benchmark_context(turns=200, budget=2048, eval_sec_per_token=0.00001):
+    """
+    Long session: prompt tokens and (simulated) prompt eval latency per request, unlimited vs token budget
+    """
+    class _BenchChat(ChatBase):
+        def __init__(self):
+            super().__init__(system_prompt="You are a benchmark assistant.")
+            self.model_name = "benchmark"
+            self.prompt_tokens = []
+
+        def chat(self, query):
+            self.add_user_message(query)
+            with self.generation():
+                tokens = self.context_tokens()
+                self.prompt_tokens.append(tokens)
+                time.sleep(tokens * eval_sec_per_token)     # Prompt eval cost ~ prompt tokens
+                self.add_assistant_message(f"Answer {len(self.prompt_tokens)}: " + "lorem ipsum dolor " * 20)
+            return True, None
+
+    for limit in (0, budget):
+        chatbot = _BenchChat()
+        chatbot.context_budget = limit
+        latencies = []
+        for turn in range(turns):
+            start = time.perf_counter()
+            chatbot.chat(f"Question {turn}: " + "what about this topic " * 10)
+            latencies.append(time.perf_counter() - start)
+        samples = ", ".join(f"#{i + 1}: {chatbot.prompt_tokens[i]} tok {latencies[i] * 1000:.1f} ms"
+                            for i in (0, turns // 4, turns // 2, turns * 3 // 4, turns - 1))
+        print(f"[budget={limit or 'unlimited'}] {turns} turns, {len(chatbot.messages)} messages kept: {samples}")
+
+
+if __name__ == "__main__":
+    _benchmark_context()
@@ -1,15 +1,188 @@
 import ollama
 import asyncio
+import httpx
+import json
+import threading
+import time
+from contextlib import contextmanager
 
 try:
     from . import ChatBase
     from . import Config
+    from . import Models
+    from . import Tracing
 except ImportError:
     import ChatBase
     import Config
+    import Models
+    import Tracing
+
+SUMMARY_PROMPT = ("Summarize the conversation below for your own later reference. Keep facts, names, decisions "
+                  "and open questions, drop small talk. Extend the previous summary if given. Answer with the summary only.")
 
 # https://www.cohorte.co/blog/using-ollama-with-python-step-by-step-guide
 
+_CLIENTS: dict = {}                 # {host: ollama.Client}
+_ASYNC_CLIENTS: dict = {}           # {(host, event loop id): ollama.AsyncClient} - httpx async pools are loop bound
+_CLIENTS_LOCK = threading.Lock()
+# Connection instrumentation: new vs reused HTTP connections, request setup time (until request headers sent)
+CONNECTION_STATS = {"requests": 0, "new_connections": 0, "reused_connections": 0,
+                    "connect_ms": 0.0, "setup_ms": []}
+_MAX_SETUP_SAMPLES = 100
+MODEL_STATE: dict = {}              # {model name: "cold" | "warming" | "warm"}
+
+
+#############################################################
+#                 SHARED OLLAMA CLIENTS (per host)          #
+#############################################################
+
+def _ollama_config() -> dict:
+    return Config.get("ollama") or {}
+
+
+def _client_kwargs() -> dict:
+    """
+    httpx client settings: timeouts and connection keep-alive (between chat turns)
+    """
+    config = _ollama_config()
+    return {"timeout": httpx.Timeout(config.get("timeout", 300), connect=config.get("connect_timeout", 5)),
+            "limits": httpx.Limits(max_keepalive_connections=10, keepalive_expiry=config.get("keepalive_expiry", 300))}
+
+
+class _RequestTrace:
+    """
+    httpcore trace callback of a single request: connection setup events
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.connect_start = None
+        self.new_connection = False
+
+    def event(self, name):
+        if name == "connection.connect_tcp.started":
+            self.new_connection = True
+            self.connect_start = time.perf_counter()
+        elif name in ("connection.connect_tcp.complete", "connection.start_tls.complete") and self.connect_start:
+            with _CLIENTS_LOCK:
+                CONNECTION_STATS["connect_ms"] += (time.perf_counter() - self.connect_start) * 1000
+            self.connect_start = None
+        elif name == "http11.send_request_headers.started":
+            self._request_sent()
+
+    def _request_sent(self):
+        with _CLIENTS_LOCK:
+            CONNECTION_STATS["requests"] += 1
+            CONNECTION_STATS["new_connections" if self.new_connection else "reused_connections"] += 1
+            setup = CONNECTION_STATS["setup_ms"]
+            setup.append((time.perf_counter() - self.start) * 1000)
+            del setup[:-_MAX_SETUP_SAMPLES]
+
+    def __call__(self, name, info):
+        self.event(name)
+
+    async def trace_async(self, name, info):
+        self.event(name)
+
+
+def _trace_request(request):
+    request.extensions["trace"] = _RequestTrace()
+
+
+async def _trace_request_async(request):
+    request.extensions["trace"] = _RequestTrace().trace_async
+
+
+def client(host:str|None=None) -> ollama.Client:
+    """
+    Shared sync ollama client per host (one HTTP connection pool, reused across chats)
+        host: None - OLLAMA_HOST env / default
+    """
+    with _CLIENTS_LOCK:
+        shared = _CLIENTS.get(host)
+        if shared is None:
+            shared = ollama.Client(host=host, event_hooks={"request": [_trace_request]}, **_client_kwargs())
+            _CLIENTS[host] = shared
+        return shared
+
+
+def async_client(host:str|None=None) -> ollama.AsyncClient:
+    """
+    Shared async ollama client per host and running event loop
+    """
+    key = (host, id(asyncio.get_running_loop()))
+    with _CLIENTS_LOCK:
+        shared = _ASYNC_CLIENTS.get(key)
+        if shared is None:
+            shared = ollama.AsyncClient(host=host, event_hooks={"request": [_trace_request_async]}, **_client_kwargs())
+            _ASYNC_CLIENTS[key] = shared
+        return shared
+
+
+def keep_alive():
+    """
+    How long ollama keeps the model loaded after a request (e.g. "10m", -1: forever, None: server default)
+    """
+    return _ollama_config().get("keep_alive")
+
+
+def model_state(model_name) -> str:
+    return MODEL_STATE.get(model_name, "cold")
+
+
+def connection_stats() -> dict:
+    setup = sorted(CONNECTION_STATS["setup_ms"])
+    return {**{k: v for k, v in CONNECTION_STATS.items() if k != "setup_ms"},
+            "setup_ms_median": setup[len(setup) // 2] if setup else None,
+            "setup_ms_max": setup[-1] if setup else None}
+
+
+def _on_config_changed(changed_keys: set):
+    """
+    Config subscriber: new timeouts apply to new clients (in-flight requests keep their client)
+    """
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
+        _ASYNC_CLIENTS.clear()
+
+
+Config.subscribe(_on_config_changed, keys=("ollama",))
+
+
+#############################################################
+#                     MODEL CALL TRACING                    #
+#############################################################
+
+def _trace_attributes(response) -> dict:
+    """
+    Ollama timing stats of a finished request: prompt eval, generation, model load (ns -> s)
+    """
+    eval_count, eval_duration = response.get("eval_count") or 0, (response.get("eval_duration") or 0) / 1e9
+    return {"prompt_tokens": response.get("prompt_eval_count") or 0,
+            "prompt_eval_s": (response.get("prompt_eval_duration") or 0) / 1e9,
+            "eval_tokens": eval_count, "eval_s": eval_duration,
+            "tokens_per_s": round(eval_count / eval_duration, 1) if eval_duration else None,
+            "load_s": (response.get("load_duration") or 0) / 1e9}
+
+
+def _traced_stream(stream, span):
+    """
+    Streamed response: the model span ends when the stream is closed (first chunk time, stats of the final chunk)
+    """
+    try:
+        for chunk in stream:
+            if chunk.get("done"):
+                span.set(**_trace_attributes(chunk))
+            elif "first_chunk_s" not in span.attributes:
+                span.set(first_chunk_s=time.perf_counter() - span.start_time)
+            yield chunk
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+        span.finish()
+
+
 class ChatOllama(ChatBase.ChatBase):
 
     def __init__(self, model_name:str, tools:list|None=None, stream:bool=False, debug_print=False, tui_console=None):
@@ -17,34 +190,142 @@ class ChatOllama(ChatBase.ChatBase):
         self.model_name = model_name
         self.stream = stream
         self.tools = tools if isinstance(tools, list) else []
+        self.host:str|None = None                       # ollama host (None: OLLAMA_HOST env / default)
+        self.num_ctx:int|None = None                    # Context window requested from ollama
+        self.summarize_evicted = (Config.get("context") or {}).get("summarize", False)
+
+    def model_context_budget(self) -> int:
+        """
+        Prompt token budget: min(model context_length, configured num_ctx) - reserved response tokens - tool schemas
+        - ollama silently truncates prompts over num_ctx, num_ctx is sent with every request
+        """
+        context_config = Config.get("context") or {}
+        num_ctx = context_config.get("num_ctx")
+        try:
+            context_length = Models.show_model(self.model_name, self.host)["context_length"]
+        except Exception as e:
+            self.print(f"[context] no model metadata for {self.model_name}: {e}")
+            context_length = None
+        if num_ctx and context_length:
+            num_ctx = min(num_ctx, context_length)
+        self.num_ctx = num_ctx or context_length
+        if not self.num_ctx:
+            return 0
+        budget = max(self.num_ctx - context_config.get("reserve_tokens", 1024), self.num_ctx // 2)
+        # Tool schemas are sent with every request, next to the messages
+        tool_tokens = ChatBase.estimate_tokens(json.dumps(self.tools)) if self.tools else 0
+        return max(budget - tool_tokens, 1)
+
+    def generation_options(self) -> dict | None:
+        return {"num_ctx": self.num_ctx} if self.num_ctx else None
 
     def run_model(self, stream=False):
         """
         The LLM wrapper function to handle the chat interaction.
+        - traced: run_model span (streamed: until the stream is closed)
         """
-        if len(self.tools) > 0:
-            # With tools
-            return ollama.chat(model=self.model_name,
-                               messages=self.messages,
-                               tools=self.tools,
-                               stream=stream)
-        else:
-            # Without tools
-            return ollama.chat(model=self.model_name,
-                               messages=self.messages,
-                               stream=stream)
+        span = Tracing.start("run_model", model=self.model_name, messages=len(self.messages))
+        try:
+            if len(self.tools) > 0:
+                # With tools
+                response = client(self.host).chat(model=self.model_name,
+                                                  messages=self.messages,
+                                                  tools=self.tools,
+                                                  stream=stream,
+                                                  options=self.generation_options(),
+                                                  keep_alive=keep_alive())
+            else:
+                # Without tools
+                response = client(self.host).chat(model=self.model_name,
+                                                  messages=self.messages,
+                                                  stream=stream,
+                                                  options=self.generation_options(),
+                                                  keep_alive=keep_alive())
+        except Exception as e:
+            span.finish(error=str(e)[:200])
+            raise
+        if not span.recording:
+            return response
+        if stream:
+            return _traced_stream(response, span)
+        span.finish(**_trace_attributes(response))
+        return response
+
+    @contextmanager
+    def generation(self):
+        with super().generation():
+            yield
+        MODEL_STATE[self.model_name] = "warm"       # Loaded by the request
+
+    def _set_model_state(self, state, on_state=None):
+        MODEL_STATE[self.model_name] = state
+        if on_state is not None:
+            on_state(self.model_name, state)
+
+    def warm_up(self, on_state=None) -> threading.Thread | None:
+        """
+        Background model load + prefill of the system prompt and tool schemas
+        - the first request reuses the loaded model and the cached prompt prefix (KV cache)
+        - same num_ctx as the chat requests (a different num_ctx would reload the model)
+            on_state: callback(model name, state) - called from the warm-up thread
+        """
+        if model_state(self.model_name) == "warming":
+            return None
+
+        def _warm_up():
+            self._set_model_state("warming", on_state)
+            start = time.perf_counter()
+            try:
+                _ = self.context_budget        # Resolve num_ctx
+                kwargs = {"tools": self.tools} if self.tools else {}
+                client(self.host).chat(model=self.model_name, messages=self.messages[:1], stream=False,
+                                       options={**(self.generation_options() or {}), "num_predict": 1},
+                                       keep_alive=keep_alive(), **kwargs)
+            except Exception as e:
+                self.print(f"[warm-up] {self.model_name} failed: {e}")
+                self._set_model_state("cold", on_state)
+                return
+            self.print(f"[warm-up] {self.model_name} ready in {time.perf_counter() - start:.2f}s")
+            self._set_model_state("warm", on_state)
+
+        thread = threading.Thread(target=_warm_up, name=f"nolara-warm-up-{self.model_name}", daemon=True)
+        thread.start()
+        return thread
+
+    def summarize(self, summary, messages):
+        """
+        Fold evicted messages into the running summary (streamed: aborted as soon as a new request starts)
+        """
+        transcript = "\n".join(f"{m['role']}: {m.get('content') or ''}" for m in messages)
+        if summary:
+            transcript = f"Previous summary:\n{summary}\n\nConversation:\n{transcript}"
+        stream = client(self.host).chat(model=self.model_name,
+                                        messages=[{"role": "system", "content": SUMMARY_PROMPT},
+                                                  {"role": "user", "content": transcript}],
+                                        stream=True,
+                                        options={**(self.generation_options() or {}), "num_predict": 256},
+                                        keep_alive=keep_alive())
+        parts = []
+        try:
+            for chunk in stream:
+                if not self._idle.is_set():
+                    return None
+                parts.append(chunk.get("message", {}).get("content", ""))
+        finally:
+            stream.close()
+        return "".join(parts).strip() or None
 
     async def async_run_model(self, stream=False):
         """
         Async version of the LLM wrapper to handle chat interaction.
         """
         if self.tools:
-            client = ollama.AsyncClient()
-            response  = await client.chat(model=self.model_name, messages=self.messages, tools=self.tools, stream=stream)
+            response  = await async_client(self.host).chat(model=self.model_name, messages=self.messages, tools=self.tools,
+                                                           stream=stream, options=self.generation_options(), keep_alive=keep_alive())
             return response
         else:
-            client = ollama.AsyncClient()
-            response = await client.chat(model=self.model_name, messages=self.messages,stream=stream)
+            response = await async_client(self.host).chat(model=self.model_name, messages=self.messages,stream=stream,
+                                                          options=self.generation_options(), keep_alive=keep_alive())
             return response
 
     def chat(self, query) -> (bool, ollama._types.ChatResponse|dict|None):
@@ -53,59 +334,53 @@ class ChatOllama(ChatBase.ChatBase):
             return False, response
 
         self.add_user_message(query)
-        if self.stream:
-            self.write_tui(f"Model:{self.model_name}> ")
-            full_response = ""
-            for chunk in self.run_model(stream=True):
-                content = chunk.get("message", {}).get("content", "")
-                print(content, end="", flush=True)
-                full_response += content
-            self.write_tui('')
-            self.add_assistant_message(full_response)
-            return True, {"message": {"content": full_response}}
-        else:
-            response = self.run_model(stream=False)
-            answer = response.message.content
-            self.write_tui(f"Model:{self.model_name}>\n{answer}")
-            self.add_assistant_message(answer)
-            return True, response
+        with self.generation():
+            if self.stream:
+                self.write_tui(f"Model:{self.model_name}> ")
+                full_response = ""
+                for chunk in self.iter_stream(self.run_model(stream=True)):
+                    content = chunk.get("message", {}).get("content", "")
+                    self.write_stream(content)
+                    full_response += content
+                if self.cancelled:
+                    self.write_tui(" [cancelled]", end="")
+                self.write_tui('')
+                self.add_assistant_message(full_response)
+                return True, {"message": {"content": full_response}}
+            else:
+                response = self.run_model(stream=False)
+                answer = response.message.content
+                self.write_tui(f"Model:{self.model_name}>\n{answer}")
+                self.add_assistant_message(answer)
+                return True, response
 
     async def async_chat(self, query) -> (bool, dict | None):
         """
-        Async version of chat that offloads blocking calls to a thread.
-        Suitable for integration in asyncio-based apps.
+        Async version of chat, suitable for integration in asyncio-based apps.
         """
         if not query:
             return False, None
 
         self.add_user_message(query)
-
-        if self.stream:
-            self.write_tui(f"Model:{self.model_name}> ")
-            full_response_parts = []
-
-            async def run_streaming():
-                self.write_tui(f"Model:{self.model_name}>")
-                async for chunk in await self.async_run_model(stream=True):
+        with self.generation():
+            if self.stream:
+                self.write_tui(f"Model:{self.model_name}> ")
+                full_response = ""
+                async for chunk in self.aiter_stream(await self.async_run_model(stream=True)):
                     content = chunk.get("message", {}).get("content", "")
-                    #print(content, end="", flush=True)
-                    self.write_tui(content, end="", flush=True)
-                    full_response_parts.append(content)
+                    self.write_stream(content)
+                    full_response += content
+                if self.cancelled:
+                    self.write_tui(" [cancelled]", end="")
                 self.write_tui('')
-
-            full_response_parts = []
-            await run_streaming()
-
-            full_response = ''.join(full_response_parts)
-            self.add_assistant_message(full_response)
-            return True, {"message": {"content": full_response}}
-
-        else:
-            response = await self.async_run_model(stream=False)
-            answer = response.message.content
-            self.write_tui(f"Model:{self.model_name}>\n{answer}")
-            self.add_assistant_message(answer)
-            return True, response
+                self.add_assistant_message(full_response)
+                return True, {"message": {"content": full_response}}
+            else:
+                response = await self.async_run_model(stream=False)
+                answer = response.message.content
+                self.write_tui(f"Model:{self.model_name}>\n{answer}")
+                self.add_assistant_message(answer)
+                return True, response
 
     @staticmethod
     def human_output_parser(response):
@@ -114,7 +389,76 @@ class ChatOllama(ChatBase.ChatBase):
         return response.message.content
 
 
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _benchmark_client(requests=50):
+    """
+    Request setup time against the local mock Ollama server: new client per request vs shared client
+    """
+    try:
+        from .MockOllama import MockOllamaServer
+    except ImportError:
+        from MockOllama import MockOllamaServer
+
+    async def _async_requests():
+        for _ in range(requests):
+            await async_client(server.host).list()
+
+    with MockOllamaServer(installed=["gemma2:latest"]) as server:
+        for shared in (False, True):
+            CONNECTION_STATS.update({"requests": 0, "new_connections": 0, "reused_connections": 0,
+                                     "connect_ms": 0.0, "setup_ms": []})
+            _CLIENTS.clear()
+            start = time.perf_counter()
+            for _ in range(requests):
+                if not shared:
+                    _CLIENTS.clear()
+                client(server.host).list()
+            duration = time.perf_counter() - start
+            print(f"[{'shared' if shared else 'new client per request'}] {requests} requests: "
+                  f"{duration * 1000:.1f} ms, {connection_stats()}")
+        CONNECTION_STATS.update({"requests": 0, "new_connections": 0, "reused_connections": 0,
+                                 "connect_ms": 0.0, "setup_ms": []})
+        asyncio.run(_async_requests())
+        print(f"[shared async] {requests} requests: {connection_stats()}")
+
+
+def _benchmark_warm_up(model="gemma2:latest", host=None, system_prompt="You are a helpful assistant. " * 200):
+    """
+    Time to first token: cold start vs warm-up (model load + system prompt prefill) before the first message
+        host: ollama host, None: local mock Ollama server (simulated load and prefill)
+    """
+    try:
+        from .MockOllama import MockOllamaServer
+    except ImportError:
+        from MockOllama import MockOllamaServer
+
+    def _ttft(warm) -> float:
+        chatbot = ChatOllama(model, stream=True, tui_console=lambda *args, **kwargs: None)
+        chatbot.host = server.host if server else host
+        chatbot.system_prompt(system_prompt)
+        client(chatbot.host).generate(model=model, keep_alive=0)        # Unload model
+        MODEL_STATE.pop(model, None)
+        if warm:
+            chatbot.warm_up().join()
+        chatbot.chat("Hello!")
+        return chatbot.last_ttft
+
+    server = None if host else MockOllamaServer(installed=[model], load_delay=1.5, prefill_delay=0.05,
+                                                token_delay=0.01).start()
+    try:
+        cold, warm = _ttft(warm=False), _ttft(warm=True)
+        print(f"[{model}] time to first token - cold: {cold:.2f}s, after warm-up: {warm:.2f}s")
+    finally:
+        if server:
+            server.stop()
+
+
 if __name__ == "__main__":
+    _benchmark_client()
+    _benchmark_warm_up()
     chatbot = ChatOllama(model_name='gemma2:latest', stream=True, debug_print=True)
     chatbot.chat_loop(asynchronous=True)
     print(chatbot)
@@ -14,14 +14,27 @@ class ChatOpenAI(ChatBase.ChatBase):
         self.model_name = model_name
         self.stream = stream
         self.tools = tools if isinstance(tools, list) else []
+        self.client = self._create_client()
+        Config.subscribe(self._on_config_changed, keys=("remote_models",))
+
+    @staticmethod
+    def _create_client() -> OpenAI:
         openai_config = Config.get("remote_models").get("openai", None)
         if openai_config is None:
             raise ValueError("OpenAI configuration not found in config file.")
         openai_api_key = openai_config.get("api_key", None)
         if openai_api_key:
-            self.client = OpenAI(api_key=openai_api_key)
-        else:
-            raise ValueError("OpenAI API key not found.")
+            return OpenAI(api_key=openai_api_key)
+        raise ValueError("OpenAI API key not found.")
+
+    def _on_config_changed(self, changed_keys: set):
+        """
+        Config subscriber: re-create client on remote_models (api_key) change
+        """
+        try:
+            self.client = self._create_client()
+        except ValueError as e:
+            self.print(f"[ChatOpenAI] keep previous client: {e}")
 
     def run_model(self, stream=False):
         kwargs = {
@@ -36,28 +49,34 @@ class ChatOpenAI(ChatBase.ChatBase):
             return False, None
 
         self.add_user_message(query)
-        if self.stream:
-            self.write_tui(f"Model:{self.model_name}> ")
-            full_response = ""
-            response = self.run_model(stream=True)
-            for chunk in response:
-                # chunk.choices[0].delta can have 'content'
-                delta = chunk.choices[0].delta
-                content = delta.get("content", "")
-                self.write_tui(content, end="", flush=True)
-                full_response += content
-            self.write_tui('')
-            self.add_assistant_message(full_response)
-            return True, {"message": {"content": full_response}}
-        else:
-            response = self.run_model(stream=False)
-            answer = response.choices[0].message.content
-            self.write_tui(f"Model:{self.model_name}>\n{answer}")
-            self.add_assistant_message(answer)
-            return True, response
+        with self.generation():
+            if self.stream:
+                self.write_tui(f"Model:{self.model_name}> ")
+                full_response = ""
+                response = self.run_model(stream=True)
+                for chunk in self.iter_stream(response):
+                    if not chunk.choices:
+                        continue
+                    # chunk.choices[0].delta can have 'content'
+                    content = chunk.choices[0].delta.content or ""
+                    self.write_stream(content)
+                    full_response += content
+                if self.cancelled:
+                    self.write_tui(" [cancelled]", end="")
+                self.write_tui('')
+                self.add_assistant_message(full_response)
+                return True, {"message": {"content": full_response}}
+            else:
+                response = self.run_model(stream=False)
+                answer = response.choices[0].message.content
+                self.write_tui(f"Model:{self.model_name}>\n{answer}")
+                self.add_assistant_message(answer)
+                return True, response
 
     @staticmethod
     def human_output_parser(response):
+        if isinstance(response, dict):
+            return response.get("message", {}).get("content", "")
         return response.choices[0].message.content
 
 
@@ -2,12 +2,40 @@ import os
 import json
 import re
 import shutil
+import threading
+import weakref
 
 SCRIPT_DIR  = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_CONFIG_FILE = os.path.join(SCRIPT_DIR, "../configuration/default_config.json")
 USER_CONFIG_FILE = os.path.join(SCRIPT_DIR, "../configuration/usr_config.json")
 
 
+class ConfigSnapshot:
+    """
+    Read-only view of the user configuration at a given file state.
+    - data: parsed configuration dict (treat as read-only)
+    - mtime_ns, size: file stat the snapshot was built from
+    - version: incremented on every reload (cheap change detection for callers)
+    """
+    __slots__ = ("data", "mtime_ns", "size", "version")
+
+    def __init__(self, data:dict, mtime_ns:int, size:int, version:int):
+        self.data:dict = data
+        self.mtime_ns:int = mtime_ns
+        self.size:int = size
+        self.version:int = version
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+
+_SNAPSHOT:ConfigSnapshot|None = None
+_SNAPSHOT_LOCK = threading.Lock()
+_SUBSCRIBERS:list = []          # [(weak or strong callback ref, keys filter), ...]
+_WATCHER_STOP = threading.Event()
+_VALIDATED:bool = False
+
+
 def _validate_user_configration():
     if not os.path.exists(USER_CONFIG_FILE):
         shutil.copy(DEFAULT_CONFIG_FILE, USER_CONFIG_FILE)
@@ -17,6 +45,19 @@ def _validate_user_configration():
         _update_config()
 
 
+def _ensure_user_config():
+    """
+    Validate (create/update) the user config once per process, on first access (no import side effect)
+    """
+    global _VALIDATED
+    if _VALIDATED:
+        return
+    with _SNAPSHOT_LOCK:
+        if not _VALIDATED:
+            _validate_user_configration()
+            _VALIDATED = True
+
+
 def _update_config():
     default_config:dict = {}
     user_config:dict = {}
@@ -55,18 +96,133 @@ def _load_json_without_comments(jsonc: str) -> dict:
     return parsed
 
 
-def load_config():
+def _read_config_file() -> dict:
+    """
+    Uncached user config read (file open + comment strip + json parse)
+    """
     with open(USER_CONFIG_FILE, 'r') as file:
         config_data = _load_json_without_comments(file.read())
     return config_data
 
 
+#############################################################
+#                  SNAPSHOT + CHANGE NOTIFICATION           #
+#############################################################
+
+def subscribe(callback, keys=None) -> None:
+    """
+    Register a config change callback: callback(changed_keys: set)
+    - keys: only notify if one of these top-level keys changed (None: any change)
+    - bound methods are stored as weak references, so subscribing objects can be garbage collected
+    """
+    ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+    _SUBSCRIBERS.append((ref, set(keys) if keys else None))
+
+
+def unsubscribe(callback) -> None:
+    for entry in list(_SUBSCRIBERS):
+        if entry[0]() == callback:
+            _SUBSCRIBERS.remove(entry)
+
+
+def _notify(changed_keys:set) -> None:
+    for entry in list(_SUBSCRIBERS):
+        ref, keys = entry
+        callback = ref()
+        if callback is None:
+            # Subscriber was garbage collected
+            _SUBSCRIBERS.remove(entry)
+            continue
+        if keys is not None and not keys & changed_keys:
+            continue
+        try:
+            callback(changed_keys)
+        except Exception as e:
+            print(f"[Config] subscriber {callback} error: {e}")
+
+
+def snapshot() -> ConfigSnapshot:
+    """
+    Return the process-wide config snapshot.
+    Re-reads the user config file only if its mtime or size changed.
+    """
+    global _SNAPSHOT
+    if _SNAPSHOT is None:
+        _ensure_user_config()
+    try:
+        stat = os.stat(USER_CONFIG_FILE)
+    except FileNotFoundError:
+        if _SNAPSHOT is None:
+            raise
+        return _SNAPSHOT            # Keep last known config while the file is being replaced
+    current = _SNAPSHOT
+    if current is not None and stat.st_mtime_ns == current.mtime_ns and stat.st_size == current.size:
+        return current
+
+    changed_keys = set()
+    with _SNAPSHOT_LOCK:
+        current = _SNAPSHOT
+        if current is None or stat.st_mtime_ns != current.mtime_ns or stat.st_size != current.size:
+            data = _read_config_file()
+            version = 0 if current is None else current.version + 1
+            if current is not None:
+                changed_keys = {k for k in set(data) | set(current.data) if data.get(k) != current.data.get(k)}
+            _SNAPSHOT = ConfigSnapshot(data, stat.st_mtime_ns, stat.st_size, version)
+        current = _SNAPSHOT
+    if changed_keys:
+        _notify(changed_keys)
+    return current
+
+
+def start_watcher(interval=2.0) -> threading.Thread:
+    """
+    Poll the config file in a daemon thread, so subscribers are notified
+    even if nobody calls get() (e.g. idle TUI)
+    """
+    def _watch():
+        while not _WATCHER_STOP.wait(interval):
+            try:
+                snapshot()
+            except Exception as e:
+                print(f"[Config] watcher error: {e}")
+
+    _WATCHER_STOP.clear()
+    watcher = threading.Thread(target=_watch, name="nolara-config-watcher", daemon=True)
+    watcher.start()
+    return watcher
+
+
+def stop_watcher() -> None:
+    _WATCHER_STOP.set()
+
+
+def load_config():
+    return snapshot().data
+
+
 def get(key):
-    return load_config().get(key, None)
+    return snapshot().get(key, None)
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
 
+def _benchmark(iterations=10000):
+    """
+    Microbenchmark: uncached file parse vs. snapshot lookup
+    """
+    import timeit
+    uncached = timeit.timeit(lambda: _read_config_file().get("agents"), number=iterations)
+    cached = timeit.timeit(lambda: get("agents"), number=iterations)
+    print(f"[Config] get() x{iterations}")
+    print(f"\tuncached (open + regex + json.loads): {uncached / iterations * 1e6:.2f} us/lookup")
+    print(f"\tsnapshot (os.stat + dict lookup):     {cached / iterations * 1e6:.2f} us/lookup")
+    print(f"\tspeedup: x{uncached / cached:.1f}")
+    return uncached, cached
 
-_validate_user_configration()
 
 if __name__ == "__main__":
     config = load_config()
-    print(config)
\ No newline at end of file
+    print(config)
+    _benchmark()
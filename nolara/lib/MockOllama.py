@@ -0,0 +1,324 @@
+"""
+Local stand-in for the Ollama HTTP API (offline testing / benchmarks)
+- GET  /api/tags     installed models
+- POST /api/pull     streamed per-layer pull progress (NDJSON)
+- POST /api/show     model details and capabilities
+- POST /api/chat     streamed/non-streamed chat with simulated model load, prefill (prefix cache) and decode,
+                     scripted replies and tool calls per user prompt, ollama timing stats (eval counts, durations)
+- POST /api/generate empty prompt: load / unload (keep_alive=0) a model
+- GET  /api/ps       loaded models
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _digest(text: str) -> str:
+    return f"sha256:{hashlib.sha256(text.encode()).hexdigest()}"
+
+
+class MockOllamaServer:
+    """
+    Threaded mock Ollama server.
+        installed: model names available from start
+        tool_models: model names reporting the "tools" capability
+        pull_layer_delay: seconds per layer download (simulated)
+        layers: number of layers per model
+        load_delay: seconds to load a model (cold start)
+        prefill_delay: seconds per 1000 prompt characters not in the prefix cache
+        token_delay: seconds per generated token
+        reply: chat response text (split into tokens on spaces)
+        scripts: scripted agent turns {user prompt: [step, ...]}, step: {"content": str, "tool_calls": [
+                 {"name": str, "arguments": dict}, ...]} - the next step follows the tool results of the previous
+        model_timings: per model delay overrides {model: {"load_delay": s, "prefill_delay": s, "token_delay": s}}
+    Usage:
+        with MockOllamaServer() as server:
+            ollama.Client(host=server.host)
+    """
+
+    def __init__(self, installed=None, tool_models=None, pull_layer_delay=0.1, layers=3, load_delay=0.0,
+                 prefill_delay=0.0, token_delay=0.0, reply="This is a mock response.", scripts=None, model_timings=None,
+                 host="127.0.0.1", port=0):
+        self.tool_models = set(tool_models or [])
+        self.pull_layer_delay = pull_layer_delay
+        self.layers = layers
+        self.load_delay = load_delay
+        self.prefill_delay = prefill_delay
+        self.token_delay = token_delay
+        self.reply = reply
+        self.scripts = scripts or {}
+        self.model_timings = model_timings or {}
+        self.installed: dict = {}
+        self.loaded: dict = {}              # {model: cached prompt prefix}
+        self.requests: list = []            # [(method, path), ...] request log
+        self._lock = threading.Lock()
+        self.reset(installed)
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        address, port = self._server.server_address[:2]
+        return f"http://{address}:{port}"
+
+    def reset(self, installed=None):
+        with self._lock:
+            self.installed = {}
+            self.loaded = {}
+            self.requests = []
+            for model in installed or []:
+                self._install(model)
+
+    def _install(self, model):
+        self.installed[model] = {"name": model, "model": model, "digest": _digest(model)[7:],
+                                 "size": self.layers * 1_000_000, "modified_at": "2025-01-01T00:00:00Z",
+                                 "details": {"format": "gguf", "family": model.split(":")[0],
+                                             "parameter_size": "1B", "quantization_level": "Q4_K_M"}}
+
+    def _layers(self, model):
+        return [(_digest(f"{model}/layer{i}"), 1_000_000) for i in range(self.layers)]
+
+    #####################################################
+    #                    API handlers                   #
+    #####################################################
+    def api_tags(self, request):
+        with self._lock:
+            return 200, {"models": list(self.installed.values())}
+
+    def api_show(self, request):
+        model = request.get("model") or request.get("name")
+        with self._lock:
+            installed = self.installed.get(model)
+        if installed is None:
+            return 404, {"error": f"model '{model}' not found"}
+        family = installed["details"]["family"]
+        return 200, {"modelfile": f"FROM {model}", "template": "{{ .Prompt }}", "details": installed["details"],
+                     "model_info": {f"{family}.context_length": 8192},
+                     "capabilities": ["completion", "tools"] if model in self.tool_models else ["completion"]}
+
+    def api_pull(self, request):
+        model = request.get("model") or request.get("name")
+
+        def _stream():
+            yield {"status": "pulling manifest"}
+            for digest, total in self._layers(model):
+                with self._lock:
+                    present = model in self.installed
+                if present:
+                    yield {"status": f"pulling {digest[7:19]}", "digest": digest, "total": total, "completed": total}
+                    continue
+                for step in range(1, 5):
+                    time.sleep(self.pull_layer_delay / 4)
+                    yield {"status": f"pulling {digest[7:19]}", "digest": digest,
+                           "total": total, "completed": total * step // 4}
+            yield {"status": "verifying sha256 digest"}
+            yield {"status": "writing manifest"}
+            with self._lock:
+                self._install(model)
+            yield {"status": "success"}
+
+        if request.get("stream", True):
+            return 200, _stream()
+        *_, last = _stream()
+        return 200, last
+
+    def _timing(self, model, key) -> float:
+        return self.model_timings.get(model, {}).get(key, getattr(self, key))
+
+    def _load(self, model, prompt="") -> (float, float):
+        """
+        Simulate model load and prompt prefill, return the load and prefill wait time
+        """
+        with self._lock:
+            cold = model not in self.loaded
+            cached = self.loaded.get(model, "")
+        load = self._timing(model, "load_delay") if cold else 0.0
+        time.sleep(load)
+        prefix = 0
+        for prefix, (a, b) in enumerate(zip(cached, prompt)):
+            if a != b:
+                break
+        else:
+            prefix = min(len(cached), len(prompt))
+        prefill = (len(prompt) - prefix) / 1000 * self._timing(model, "prefill_delay")
+        time.sleep(prefill)
+        with self._lock:
+            self.loaded[model] = prompt
+        return load, prefill
+
+    def _script_step(self, messages) -> dict | None:
+        """
+        Scripted step of the current turn: the steps before it issued as many tool calls as there are tool results
+        """
+        user = next((i for i in range(len(messages) - 1, -1, -1) if messages[i].get("role") == "user"), None)
+        steps = self.scripts.get(messages[user].get("content")) if user is not None else None
+        if not steps:
+            return None
+        results = sum(1 for m in messages[user + 1:] if m.get("role") == "tool")
+        for step in steps:
+            calls = len(step.get("tool_calls") or [])
+            if not calls or results < calls:
+                return step
+            results -= calls
+        return steps[-1]
+
+    def _unload(self, model, keep_alive):
+        if keep_alive in (0, "0", "0s", "0m"):
+            with self._lock:
+                self.loaded.pop(model, None)
+
+    def api_chat(self, request):
+        model = request.get("model")
+        with self._lock:
+            installed = model in self.installed
+        if not installed:
+            return 404, {"error": f"model '{model}' not found"}
+        # Rendered prompt: tools, then messages (ollama templates put tools in the system part)
+        prompt = json.dumps(request.get("tools") or []) + json.dumps(request.get("messages") or [])
+        start = time.perf_counter()
+        # Prefix cache: the next request extends the messages, ignore the closing bracket
+        load, prefill = self._load(model, prompt.rsplit("]", 1)[0] if request.get("messages") else "")
+        step = self._script_step(request.get("messages") or []) or {"content": self.reply}
+        num_predict = (request.get("options") or {}).get("num_predict")
+        tokens = [f"{t} " for t in (step.get("content") or "").split(" ") if t]
+        tokens = tokens[:num_predict if num_predict and num_predict > 0 else None]
+        tool_calls = [{"function": {"name": c["name"], "arguments": c.get("arguments") or {}}}
+                      for c in step.get("tool_calls") or []]
+        # Tool calls are generated tokens as well
+        eval_count = len(tokens) + (len(json.dumps(tool_calls)) // 4 if tool_calls else 0)
+        token_delay = self._timing(model, "token_delay")
+        base = {"model": model, "created_at": "2025-01-01T00:00:00Z"}
+        final = {**base, "message": {"role": "assistant", "content": ""}, "done": True, "done_reason": "stop",
+                 "prompt_eval_count": len(prompt) // 4, "eval_count": eval_count,
+                 "load_duration": int(load * 1e9), "prompt_eval_duration": int(prefill * 1e9),
+                 "eval_duration": int(eval_count * token_delay * 1e9)}
+
+        def _finish():
+            self._unload(model, request.get("keep_alive"))
+            final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+            return final
+
+        def _stream():
+            for token in tokens:
+                time.sleep(token_delay)
+                yield {**base, "message": {"role": "assistant", "content": token}, "done": False}
+            if tool_calls:
+                time.sleep(token_delay * (eval_count - len(tokens)))
+                yield {**base, "message": {"role": "assistant", "content": "", "tool_calls": tool_calls},
+                       "done": False}
+            yield _finish()
+
+        if request.get("stream", True):
+            return 200, _stream()
+        time.sleep(token_delay * eval_count)
+        final["message"]["content"] = "".join(tokens)
+        if tool_calls:
+            final["message"]["tool_calls"] = tool_calls
+        return 200, _finish()
+
+    def api_generate(self, request):
+        model = request.get("model")
+        with self._lock:
+            installed = model in self.installed
+        if not installed:
+            return 404, {"error": f"model '{model}' not found"}
+        if request.get("keep_alive") in (0, "0", "0s", "0m"):
+            self._unload(model, 0)
+            return 200, {"model": model, "response": "", "done": True, "done_reason": "unload"}
+        self._load(model)
+        return 200, {"model": model, "response": "", "done": True, "done_reason": "load"}
+
+    def api_ps(self, request):
+        with self._lock:
+            return 200, {"models": [{**self.installed[m], "size_vram": self.installed[m]["size"],
+                                     "expires_at": "2099-01-01T00:00:00Z"} for m in self.loaded]}
+
+    ROUTES = {("GET", "/api/tags"): "api_tags",
+              ("GET", "/api/ps"): "api_ps",
+              ("POST", "/api/pull"): "api_pull",
+              ("POST", "/api/show"): "api_show",
+              ("POST", "/api/chat"): "api_chat",
+              ("POST", "/api/generate"): "api_generate"}
+
+    def _handler(self):
+        mock = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True      # Small JSON responses: no delayed ACK stalls
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self, method):
+                route = mock.ROUTES.get((method, self.path.split("?")[0]))
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with mock._lock:
+                    mock.requests.append((method, self.path))
+                if route is None:
+                    return self._send_json(404, {"error": f"{method} {self.path} not found"})
+                request = json.loads(body) if body else {}
+                status, response = getattr(mock, route)(request)
+                if isinstance(response, dict):
+                    return self._send_json(status, response)
+                # Streamed NDJSON response (chunked transfer)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for item in response:
+                    line = (json.dumps(item) + "\n").encode()
+                    self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _send_json(self, status, data):
+                payload = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+        return _Handler
+
+    #####################################################
+    #                     Lifecycle                     #
+    #####################################################
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with MockOllamaServer(installed=["gemma2:latest"]) as mock_server:
+        print(f"Mock ollama server: {mock_server.host} (Ctrl+C to exit)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
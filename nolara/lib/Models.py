@@ -4,6 +4,9 @@ Nolara project base model handling
 # https://github.com/ollama/ollama-python
 
 import ollama
+import os
+import json
+import threading
 from pprint import pprint
 
 try:
@@ -11,37 +14,188 @@ try:
 except ImportError:
     import Config
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CAPABILITY_CACHE_FILE = os.path.join(SCRIPT_DIR, "../configuration/model_capabilities.json")
+# {"models": {model name: digest}, "capabilities": {digest: {capability details}}}
+CAPABILITY_INDEX: dict | None = None
+DIGESTS_SYNCED = False          # name -> digest mapping checked against ollama in this process
+HOST_CAPABILITIES: dict = {}    # {(host, digest): {capability details}} - non-default hosts, in memory only
+_CAPABILITY_LOCK = threading.RLock()
+
+
+def _client(host:str|None=None):
+    """
+    ollama client of a host (None: module level client, OLLAMA_HOST env / default)
+    - other hosts: shared chat client of the host (configured timeouts and keep-alive)
+    """
+    if host is None:
+        return ollama
+    try:
+        from . import ChatOllama
+    except ImportError:
+        import ChatOllama
+    return ChatOllama.client(host)
+
+
+#############################################################
+#                  MODEL CAPABILITY INDEX (disk)            #
+#############################################################
+
+def _capability_index() -> dict:
+    """
+    Load on-disk capability index once per process
+    """
+    global CAPABILITY_INDEX
+    with _CAPABILITY_LOCK:
+        if CAPABILITY_INDEX is None:
+            try:
+                with open(CAPABILITY_CACHE_FILE, "r") as f:
+                    CAPABILITY_INDEX = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                CAPABILITY_INDEX = {}
+            CAPABILITY_INDEX.setdefault("models", {})
+            CAPABILITY_INDEX.setdefault("capabilities", {})
+        return CAPABILITY_INDEX
+
+
+def _save_capability_index() -> None:
+    with _CAPABILITY_LOCK:
+        tmp_file = f"{CAPABILITY_CACHE_FILE}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(_capability_index(), f, indent=4)
+            os.replace(tmp_file, CAPABILITY_CACHE_FILE)
+        except OSError as e:
+            print(f"[Models] Cannot save capability index: {e}")
+
+
+def _update_model_digests(models) -> None:
+    """
+    Sync model name -> digest mapping with the local model list
+    - capabilities of removed/changed digests are dropped
+    """
+    global DIGESTS_SYNCED
+    with _CAPABILITY_LOCK:
+        DIGESTS_SYNCED = True
+        index = _capability_index()
+        model_digests = {m.model: m.digest for m in models}
+        if model_digests == index["models"]:
+            return
+        index["models"] = model_digests
+        active_digests = set(model_digests.values())
+        index["capabilities"] = {d: c for d, c in index["capabilities"].items() if d in active_digests}
+        _save_capability_index()
+
+
+def _detect_capabilities(model_name, digest, host=None) -> dict:
+    """
+    Query model capabilities from ollama (ollama.show)
+    """
+    show = _client(host).show(model_name)
+    capabilities = getattr(show, "capabilities", None) or []
+    if capabilities:
+        tool = "tools" in capabilities
+    else:
+        # Older ollama servers: no capabilities list, check modelfile
+        modelfile = show.modelfile or ""
+        tool = "<tool_call>" in modelfile or "tool call" in modelfile
+    model_info = getattr(show, "modelinfo", None) or {}
+    context_length = next((v for k, v in model_info.items() if k.endswith(".context_length")), None)
+    details = show.details
+    return {"model": model_name,
+            "digest": digest,
+            "tool": tool,
+            "context_length": context_length,
+            "parameter_size": getattr(details, "parameter_size", None),
+            "family": getattr(details, "family", None),
+            "quantization": getattr(details, "quantization_level", None)}
+
+
+def _host_capabilities(model_name, host) -> dict:
+    """
+    Model capabilities of a non-default host: in memory only, the disk index describes the default host
+    """
+    digest = next((m.digest for m in list_models(host) if m.model == model_name), None)
+    if digest is None:
+        raise ValueError(f"Model {model_name} not available on {host}")
+    with _CAPABILITY_LOCK:
+        capabilities = HOST_CAPABILITIES.get((host, digest))
+        if capabilities is None:
+            capabilities = _detect_capabilities(model_name, digest, host)
+            HOST_CAPABILITIES[(host, digest)] = capabilities
+    return capabilities
+
+
+def model_capabilities(model_name, host:str|None=None) -> dict:
+    """
+    Local model capabilities by model digest
+    - model name -> digest mapping is checked once per process (re-pulled / re-created models)
+    - local lookup if the model digest is already indexed
+    - otherwise: refresh model list (validate) + ollama.show, and store in the index
+        host: ollama host (None: OLLAMA_HOST env / default), other hosts are not stored in the index
+    """
+    global DIGESTS_SYNCED
+    if host is not None:
+        return _host_capabilities(model_name, host)
+    if not DIGESTS_SYNCED:
+        try:
+            list_models()
+        except Exception as e:
+            DIGESTS_SYNCED = True       # One attempt per process: ollama down, serve from the index
+            print(f"[Models] Cannot check model digests, using the capability index: {e}")
+    index = _capability_index()
+    digest = index["models"].get(model_name)
+    capabilities = index["capabilities"].get(digest)
+    if capabilities is not None:
+        return capabilities
+
+    validate_model(model_name)      # Refresh model -> digest mapping
+    with _CAPABILITY_LOCK:
+        digest = index["models"][model_name]
+        capabilities = index["capabilities"].get(digest)
+        if capabilities is None:
+            capabilities = _detect_capabilities(model_name, digest)
+            index["capabilities"][digest] = capabilities
+            _save_capability_index()
+    return capabilities
+
+
+def model_digest(model_name) -> str | None:
+    """
+    Model digest from the capability index (synced with ollama once per process)
+    """
+    if model_name.startswith(":"):
+        return None
+    return model_capabilities(model_name)["digest"]
+
 
 #############################################################
 #                     LOCAL MODEL HANDLING                  #
 #############################################################
 
-def list_models():
+def list_models(host:str|None=None):
     """
     List local ollama models
+        host: ollama host (None: OLLAMA_HOST env / default, syncs the capability index)
     """
-    return ollama.list()['models']
+    models = _client(host).list()['models']
+    if host is None:
+        _update_model_digests(models)
+    return models
 
 
-def show_model(model_name):
+def show_model(model_name, host:str|None=None):
     """
     Show model details, check tool feature
     :return:
-        {"modelfile": details, "tool": True/False}
+        {"tool": True/False, "context_length": int, "parameter_size": str, "family": str, "quantization": str, ...}
     """
-    model_details = {"modelfile": f"Remote model {model_name} (beta)", "tool": False}
+    model_details = {"model": model_name, "digest": None, "tool": False, "context_length": None,
+                     "parameter_size": None, "family": "remote", "quantization": None}
     if model_name.startswith(":"):
         # Remote model indicator prefix (workaround for OpenAI API)
         return model_details
-
-    if validate_model(model_name):
-        details = ollama.show(model_name).modelfile
-        model_details = {"modelfile": details}
-        if "<tool_call>" in details or "tool call" in details:
-            model_details["tool"] = True
-        else:
-            model_details["tool"] = False
-    return model_details
+    return model_capabilities(model_name, host)
 
 
 def get_models_dropdown() -> list:
@@ -83,31 +237,39 @@ def pull_model(model):
     return model
 
 
-def models_requirement() -> None:
+def models_requirement(background=False, max_workers=2, on_event=None):
     """
     Check local models requirements and pull if not available
+    - parallel pulls (max_workers), per-layer progress (on_event)
+    - background: return a Future (start the UI with the already available models)
     """
+    try:
+        from . import Provisioning
+    except ImportError:
+        import Provisioning
+
     requirements = Config.get('models') or []
-    requirements_cnt = len(requirements)
-    models = [m.model for m in list_models()]
-    for i, requirement in enumerate(requirements):
-        if requirement not in models:
-            print(f"[{i+1}/{requirements_cnt}] Pull: {requirement} (Please wait...)")
-            pull_model(requirement)
-        else:
-            print(f"[{i+1}/{requirements_cnt}] Model {requirement} already available.")
+    return Provisioning.provision_models(requirements, max_workers=max_workers,
+                                         on_event=on_event, background=background)
 
 #############################################################
 #                   REMOTE MODEL HANDLING (beta)            #
 #############################################################
 
+REMOTE_MODELS_CACHE: dict = {"version": None, "models": {}}
+
+
 def list_remote_models() -> dict:
     """
     List all remote models available
     :return:
         {"openai": ["model1", "model2"], ...}
     """
-    remote_models_config = Config.get("remote_models")
+    config = Config.snapshot()
+    if REMOTE_MODELS_CACHE["version"] == config.version:
+        # Config unchanged since last call
+        return REMOTE_MODELS_CACHE["models"]
+    remote_models_config = config.get("remote_models")
     remote_models = {}
     if remote_models_config:
         # Check openai configuration for remote models
@@ -117,6 +279,8 @@ def list_remote_models() -> dict:
             if openai_conf["api_key"] is not None:
                 remote_models["openai"] = openai_conf["models"]
         # Check etc. if needed later on
+    REMOTE_MODELS_CACHE["version"] = config.version
+    REMOTE_MODELS_CACHE["models"] = remote_models
     return remote_models
 
 def get_remote_models_dropdown() -> list:
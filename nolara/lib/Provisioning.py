@@ -0,0 +1,150 @@
+"""
+Nolara model provisioning engine
+- pull missing models with bounded concurrency
+- per-layer progress events
+- skip models that are already available (ollama resumes partial layers server side)
+- optional background mode (returns a Future)
+"""
+# https://github.com/ollama/ollama/blob/main/docs/api.md#pull-a-model
+
+import ollama
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+_PRINT_LOCK = threading.Lock()
+
+
+def format_event(event: dict) -> str | None:
+    """
+    Human-readable progress line: model state changes and completed layers (None: skip event)
+    """
+    prefix = f"[{event['index']}/{event['count']}] {event['model']}"
+    if event["status"] == "layer":
+        if event["completed"] != event["total"]:
+            return None
+        cached = " (already present)" if event.get("cached") else ""
+        return f"{prefix}: layer {event['digest'][:19]} {event['total'] / 1e6:.1f} MB done{cached}"
+    if event["status"] == "error":
+        return f"{prefix}: pull failed: {event['error']}"
+    return f"{prefix}: {event['status']}"
+
+
+def _print_event(event: dict) -> None:
+    """
+    Default progress handler (stdout)
+    """
+    message = format_event(event)
+    if message is not None:
+        with _PRINT_LOCK:
+            print(message, flush=True)
+
+
+def _pull(client: ollama.Client, model: str, index: int, count: int, on_event) -> dict:
+    """
+    Pull a single model with streamed progress
+    """
+    start = time.time()
+    layers = {}         # {digest: [completed, total]}
+    on_event({"model": model, "index": index, "count": count, "status": "pulling"})
+    try:
+        for progress in client.pull(model, stream=True):
+            digest = progress.get("digest")
+            if digest:
+                completed = progress.get("completed") or 0
+                total = progress.get("total") or 0
+                first_seen = digest not in layers
+                if not first_seen and layers[digest] == [completed, total]:
+                    continue
+                layers[digest] = [completed, total]
+                on_event({"model": model, "index": index, "count": count, "status": "layer",
+                          "digest": digest, "completed": completed, "total": total,
+                          "cached": first_seen and total > 0 and completed == total})
+    except Exception as e:
+        on_event({"model": model, "index": index, "count": count, "status": "error", "error": str(e)})
+        return {"model": model, "status": "error", "error": str(e), "duration": time.time() - start}
+    on_event({"model": model, "index": index, "count": count, "status": "success"})
+    return {"model": model, "status": "pulled", "layers": len(layers), "duration": time.time() - start}
+
+
+def provision_models(models: list, host: str | None = None, max_workers: int = 2,
+                     on_event=None, background: bool = False) -> dict | Future:
+    """
+    Ensure the given models are available locally.
+    Args:
+        models: required model names
+        host: ollama host (None: OLLAMA_HOST env / default)
+        max_workers: number of parallel pulls
+        on_event: progress callback(event: dict) - called from worker threads
+        background: return a Future immediately instead of blocking
+    Returns:
+        {model: {"status": "available"|"pulled"|"error", ...}} (or Future of it in background mode)
+    """
+    on_event = on_event or _print_event
+
+    def _provision():
+        client = ollama.Client(host=host)
+        available = {m.model for m in client.list()["models"]}
+        results = {}
+        missing = []
+        for i, model in enumerate(models):
+            if model in available:
+                results[model] = {"model": model, "status": "available"}
+                on_event({"model": model, "index": i + 1, "count": len(models), "status": "available"})
+            else:
+                missing.append((i + 1, model))
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="nolara-pull") as pool:
+                futures = {model: pool.submit(_pull, client, model, index, len(models), on_event)
+                           for index, model in missing}
+                for model, future in futures.items():
+                    results[model] = future.result()
+        return {model: results[model] for model in models}
+
+    if not background:
+        return _provision()
+
+    future = Future()
+
+    def _run_background():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(_provision())
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=_run_background, name="nolara-provisioning", daemon=True).start()
+    return future
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _test(max_workers=3):
+    """
+    Provision against the local mock Ollama server (no network)
+    """
+    try:
+        from .MockOllama import MockOllamaServer
+    except ImportError:
+        from MockOllama import MockOllamaServer
+
+    models = ["qwen3:4b", "gemma3:4b", "gemma2:latest", "llama3.2:1b"]
+    with MockOllamaServer(installed=["gemma2:latest"], pull_layer_delay=0.2) as server:
+        for workers in (1, max_workers):
+            server.reset(installed=["gemma2:latest"])
+            start = time.time()
+            results = provision_models(models, host=server.host, max_workers=workers)
+            print(f"== max_workers={workers}: {time.time() - start:.2f}s")
+            for model, result in results.items():
+                print(f"\t{model}: {result['status']}")
+
+        server.reset(installed=["gemma2:latest"])
+        future = provision_models(models, host=server.host, max_workers=max_workers,
+                                  on_event=lambda e: None, background=True)
+        print(f"== background: done={future.done()} -> {list(future.result().values())}")
+
+
+if __name__ == "__main__":
+    _test()
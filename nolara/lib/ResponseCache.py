@@ -0,0 +1,174 @@
+"""
+Nolara on-disk response cache (opt-in, piped CLI)
+- key: sha256 of model digest, system prompt, messages and generation options
+- sqlite store, zlib compressed responses
+- size based LRU eviction and TTL
+- persistent hit/miss counters (hit rate across script runs)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+try:
+    from . import Config
+except ImportError:
+    import Config
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(SCRIPT_DIR, "../configuration/response_cache.sqlite")
+_CONNECTION: sqlite3.Connection | None = None
+_LOCK = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    response BLOB,
+    size INTEGER,
+    created REAL,
+    accessed REAL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER);
+"""
+
+
+def _settings() -> dict:
+    """
+    response_cache config: {"enabled": bool, "max_size_mb": float, "ttl_hours": float}
+    """
+    return Config.get("response_cache") or {}
+
+
+def enabled() -> bool:
+    return bool(_settings().get("enabled", False))
+
+
+def _connection() -> sqlite3.Connection:
+    global _CONNECTION
+    if _CONNECTION is None:
+        _CONNECTION = sqlite3.connect(CACHE_FILE, timeout=5, check_same_thread=False, isolation_level=None)
+        _CONNECTION.execute("PRAGMA journal_mode=WAL")      # Parallel script runs: readers do not block
+        _CONNECTION.executescript(_SCHEMA)
+    return _CONNECTION
+
+
+def cache_key(model_digest:str, system_prompt:str, messages:list, options:dict|None=None) -> str:
+    """
+    Deterministic request hash (canonical JSON)
+    """
+    request = {"model": model_digest, "system": system_prompt,
+               "messages": [{"role": m["role"], "content": m.get("content") or ""} for m in messages],
+               "options": options or {}}
+    return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def _count(connection, name):
+    connection.execute("INSERT INTO stats (name, value) VALUES (?, 1) "
+                       "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,))
+
+
+def get(key:str) -> str | None:
+    """
+    Cached response or None (expired entries are dropped)
+    """
+    ttl = _settings().get("ttl_hours", 168) * 3600
+    now = time.time()
+    with _LOCK:
+        connection = _connection()
+        row = connection.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None and now - row[1] > ttl:
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            row = None
+        if row is None:
+            _count(connection, "misses")
+            return None
+        connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        _count(connection, "hits")
+    return zlib.decompress(row[0]).decode("utf-8")
+
+
+def put(key:str, response:str, model:str|None=None) -> None:
+    """
+    Store response, then evict expired and least recently used entries over the size limit
+    """
+    payload = zlib.compress(response.encode("utf-8"))
+    now = time.time()
+    with _LOCK:
+        connection = _connection()
+        connection.execute("INSERT OR REPLACE INTO responses (key, model, response, size, created, accessed) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", (key, model, payload, len(payload), now, now))
+        _evict(connection)
+
+
+def _evict(connection) -> int:
+    settings = _settings()
+    max_size = settings.get("max_size_mb", 50) * 1024 * 1024
+    ttl = settings.get("ttl_hours", 168) * 3600
+    evicted = connection.execute("DELETE FROM responses WHERE created < ?", (time.time() - ttl,)).rowcount
+    total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    if total <= max_size:
+        return evicted
+    # Least recently used first, until the store fits
+    for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+        if total <= max_size:
+            break
+        connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+        total -= size
+        evicted += 1
+    return evicted
+
+
+def stats() -> dict:
+    with _LOCK:
+        connection = _connection()
+        counters = dict(connection.execute("SELECT name, value FROM stats").fetchall())
+        entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+    hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+    return {"enabled": enabled(), "entries": entries, "size_kb": round(size / 1024, 1), "hits": hits,
+            "misses": misses, "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None}
+
+
+def clear() -> None:
+    with _LOCK:
+        connection = _connection()
+        connection.execute("DELETE FROM responses")
+        connection.execute("DELETE FROM stats")
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _benchmark(entries=2000, max_size_mb=0.02):
+    """
+    Lookup latency and LRU eviction on a temporary store
+    """
+    import tempfile
+    global CACHE_FILE, _CONNECTION, _settings
+    original = CACHE_FILE, _CONNECTION, _settings
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        CACHE_FILE, _CONNECTION = os.path.join(tmp_dir, "cache.sqlite"), None
+        _settings = lambda: {"enabled": True, "max_size_mb": max_size_mb, "ttl_hours": 1}
+        try:
+            keys = [cache_key("sha256:bench", "system", [{"role": "user", "content": f"q{i}"}]) for i in range(entries)]
+            start = time.perf_counter()
+            for i, key in enumerate(keys):
+                put(key, f"Answer {i}: " + "lorem ipsum " * 50, model="bench")
+            put_ms = (time.perf_counter() - start) * 1000 / entries
+            start = time.perf_counter()
+            hits = sum(get(key) is not None for key in keys)
+            get_ms = (time.perf_counter() - start) * 1000 / entries
+            print(f"put: {put_ms:.3f} ms, get: {get_ms:.3f} ms, kept {hits}/{entries} (max {max_size_mb} MB)")
+            print(stats())
+            _CONNECTION.close()
+        finally:
+            CACHE_FILE, _CONNECTION, _settings = original
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,178 @@
+"""
+Nolara startup helpers
+- LazyModule: import on first attribute access (keep piped CLI free of textual/openai/audio)
+- phase(): per-phase wall time
+- enable_import_profile(): per-module import time (nolara --startup-profile)
+"""
+import builtins
+import importlib
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+
+STARTUP_T0 = time.perf_counter()
+PHASES: list = []               # [(phase name, seconds), ...]
+IMPORTS: dict = {}              # {module name: {"self": seconds, "cumulative": seconds, "depth": int}}
+_IMPORT_STACK: list = []        # [[module name, start time, child time], ...]
+_ORIGINAL_IMPORT = builtins.__import__
+
+# Cold CLI startup budget (import + interface selection, without model round trip)
+CLI_STARTUP_BUDGET_SEC = 1.0
+# Modules that must never be imported on the piped CLI path
+CLI_FORBIDDEN_MODULES = ("textual", "openai", "speech_recognition", "gtts")
+
+
+#############################################################
+#                       LAZY IMPORT LAYER                   #
+#############################################################
+
+class LazyModule:
+    """
+    Module proxy, imports the module on first attribute access.
+        name: module name relative to the nolara package root, e.g. "lib.Models"
+        package: caller __package__ ("nolara" when installed, None/"" in dev mode)
+    """
+
+    def __init__(self, name: str, package: str | None = None):
+        self._name = f"{package}.{name}" if package else name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            IMPORTS.setdefault(f"[lazy] {self._name}", {"self": 0.0, "depth": 0,
+                                                       "cumulative": time.perf_counter() - start})
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __repr__(self):
+        return f"<LazyModule {self._name} {'loaded' if self.loaded else 'pending'}>"
+
+
+def module_available(*names) -> bool:
+    """
+    Check importability without importing (optional dependencies)
+    """
+    for name in names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):
+            return False
+    return True
+
+
+#############################################################
+#                        STARTUP PROFILER                   #
+#############################################################
+
+@contextmanager
+def phase(name: str):
+    """
+    Measure wall time of a startup phase
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASES.append((name, time.perf_counter() - start))
+
+
+def _profiled_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level > 0:
+        package = (globals or {}).get("__package__") or ""
+        try:
+            module_name = importlib.util.resolve_name("." * level + name, package)
+        except (ImportError, ValueError):
+            module_name = name
+    else:
+        module_name = name
+    if module_name in sys.modules or module_name in IMPORTS:
+        return _ORIGINAL_IMPORT(name, globals, locals, fromlist, level)
+
+    _IMPORT_STACK.append([module_name, time.perf_counter(), 0.0])
+    try:
+        return _ORIGINAL_IMPORT(name, globals, locals, fromlist, level)
+    finally:
+        module_name, start, child_time = _IMPORT_STACK.pop()
+        cumulative = time.perf_counter() - start
+        IMPORTS[module_name] = {"self": cumulative - child_time, "cumulative": cumulative,
+                                "depth": len(_IMPORT_STACK)}
+        if _IMPORT_STACK:
+            _IMPORT_STACK[-1][2] += cumulative
+
+
+def enable_import_profile() -> None:
+    builtins.__import__ = _profiled_import
+
+
+def disable_import_profile() -> None:
+    builtins.__import__ = _ORIGINAL_IMPORT
+
+
+def report(top=25, file=sys.stderr) -> None:
+    """
+    Print startup profile: phases + top imports by cumulative time
+    """
+    print("\n[startup-profile] phases:", file=file)
+    for name, seconds in PHASES:
+        print(f"\t{seconds * 1000:9.1f} ms  {name}", file=file)
+    print(f"\t{(time.perf_counter() - STARTUP_T0) * 1000:9.1f} ms  total (since nolara.lib.Startup import)", file=file)
+    print(f"[startup-profile] imports (top {top} by cumulative time):", file=file)
+    print(f"\t{'self ms':>9} {'cumul ms':>9}  module", file=file)
+    top_imports = sorted(IMPORTS.items(), key=lambda i: i[1]["cumulative"], reverse=True)[:top]
+    for module_name, data in top_imports:
+        print(f"\t{data['self'] * 1000:9.1f} {data['cumulative'] * 1000:9.1f}  "
+              f"{'  ' * data['depth']}{module_name}", file=file)
+
+
+#############################################################
+#                  CLI STARTUP BUDGET CHECK                 #
+#############################################################
+
+_CLI_STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+args = main.parse_arguments([])
+main.Config.get("command_line")
+main.NolaraCore.NolaraCore
+elapsed = time.perf_counter() - start
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+"""
+
+
+def check_cli_startup_budget(budget=CLI_STARTUP_BUDGET_SEC) -> bool:
+    """
+    Regression check: cold (fresh interpreter) CLI startup stays within budget
+    and does not import textual / openai / audio libraries.
+    """
+    import json
+    import os
+    import subprocess
+    nolara_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    probe = _CLI_STARTUP_PROBE.format(forbidden=CLI_FORBIDDEN_MODULES)
+    out = subprocess.run([sys.executable, "-c", probe], cwd=nolara_dir, capture_output=True, text=True)
+    if out.returncode != 0:
+        print(f"[startup-budget] probe failed:\n{out.stderr}")
+        return False
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    within_budget = result["elapsed"] <= budget
+    print(f"[startup-budget] cold CLI startup: {result['elapsed'] * 1000:.1f} ms (budget: {budget * 1000:.0f} ms)"
+          f" {'OK' if within_budget else 'EXCEEDED'}")
+    if result["loaded"]:
+        print(f"[startup-budget] forbidden modules imported on CLI path: {result['loaded']}")
+    return within_budget and not result["loaded"]
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_cli_startup_budget() else 1)
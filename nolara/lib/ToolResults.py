@@ -0,0 +1,236 @@
+"""
+Tool result compaction (before results enter the chat history)
+- HTML to text
+- per-tool token caps
+- structured truncation: long string fields keep head + tail, with a summary header
+- full result in a side store, paged by the read_tool_result tool (tools/tool_results.py)
+"""
+import json
+import os
+import re
+import time
+import uuid
+from html.parser import HTMLParser
+
+try:
+    from . import Config
+    from .ChatBase import estimate_tokens
+except ImportError:
+    import Config
+    from ChatBase import estimate_tokens
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(SCRIPT_DIR, "../configuration/tool_results")
+PAGE_CHARS = 4000               # read_tool_result page size (~1000 tokens)
+MAX_STORED_RESULTS = 50
+CHARS_PER_TOKEN = 4
+_MARKER_CHARS = 45              # Truncation marker length (approx.)
+_HTML_PATTERN = re.compile(r"<(!doctype|html|head|body|div|p|script|span|a)\b", re.IGNORECASE)
+
+
+#############################################################
+#                        HTML TO TEXT                       #
+#############################################################
+
+class _TextExtractor(HTMLParser):
+    """
+    Visible text of an HTML document (scripts, styles and markup dropped)
+    """
+    _SKIP = {"script", "style", "noscript", "svg", "head", "template", "iframe", "nav"}
+    _BLOCK = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+              "section", "article", "header", "footer", "table", "ul", "ol", "pre", "blockquote"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip_depth += 1
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skip_depth > 0:
+            self._skip_depth -= 1
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._skip_depth == 0:
+            self.parts.append(data)
+
+
+def looks_like_html(text: str) -> bool:
+    return bool(_HTML_PATTERN.search(text[:2000]))
+
+
+def html_to_text(html: str) -> str:
+    extractor = _TextExtractor()
+    try:
+        extractor.feed(html)
+        extractor.close()
+    except Exception:
+        pass            # Broken markup: keep what was parsed
+    text = "".join(extractor.parts)
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    return re.sub(r"\s*\n\s*", "\n", text).strip()
+
+
+def _map_strings(value, fn):
+    """
+    Apply fn to every string of a (nested) tool result
+    """
+    if isinstance(value, str):
+        return fn(value)
+    if isinstance(value, dict):
+        return {k: _map_strings(v, fn) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_map_strings(v, fn) for v in value]
+    return value
+
+
+def _to_text(value):
+    """
+    Convert HTML strings (e.g. web_search page contents) to text
+    """
+    return _map_strings(value, lambda s: html_to_text(s) if looks_like_html(s) else s)
+
+
+def _render(value, indent="") -> str:
+    """
+    Readable plain text of a (nested) tool result for paging
+    """
+    if isinstance(value, dict):
+        return "\n".join(f"{indent}{k}: {_render(v, indent + '  ').lstrip() if isinstance(v, (dict, list)) else v}"
+                         for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return "\n".join(f"{indent}--- [{i + 1}] ---\n{_render(v, indent)}" for i, v in enumerate(value))
+    return f"{indent}{value}"
+
+
+#############################################################
+#                    STRUCTURED TRUNCATION                  #
+#############################################################
+
+def _truncate(text: str, max_chars: int) -> str:
+    """
+    Keep head (2/3) and tail (1/3) of the text with an omission marker
+    """
+    if len(text) <= max_chars:
+        return text
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    return f"{text[:head]}\n[... {len(text) - max_chars} characters omitted ...]\n{text[-tail:] if tail else ''}"
+
+
+def _string_lengths(value) -> list:
+    lengths = []
+    _map_strings(value, lambda s: lengths.append(len(s)))
+    return lengths
+
+
+def _field_limit(lengths: list, budget: int) -> int:
+    """
+    Largest per-field length that fits the budget (short fields kept whole, long fields share the rest)
+    """
+    lengths = sorted(lengths)
+    for i, length in enumerate(lengths):
+        remaining = len(lengths) - i
+        if length * remaining > budget:
+            return max(budget // remaining, 80)
+        budget -= length
+    return lengths[-1] if lengths else budget
+
+
+#############################################################
+#                         SIDE STORE                        #
+#############################################################
+
+def store(fn_name: str, text: str) -> str:
+    """
+    Keep the full (text converted) result for paging, return its id
+    """
+    result_id = f"{fn_name}-{uuid.uuid4().hex[:8]}"
+    try:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(os.path.join(RESULTS_DIR, f"{result_id}.json"), "w") as f:
+            json.dump({"tool": fn_name, "created": time.time(), "page_chars": PAGE_CHARS, "text": text}, f)
+        stored = sorted(os.scandir(RESULTS_DIR), key=lambda e: e.stat().st_mtime)
+        for entry in stored[:-MAX_STORED_RESULTS]:
+            os.remove(entry.path)
+    except OSError as e:
+        print(f"[ToolResults] Cannot store tool result: {e}")
+    return result_id
+
+
+def _max_tokens(fn_name: str) -> int:
+    """
+    tool_results config: {"max_tokens": default cap, "per_tool": {tool name: cap}}
+    """
+    config = Config.get("tool_results") or {}
+    return (config.get("per_tool") or {}).get(fn_name, config.get("max_tokens", 1000))
+
+
+def enabled() -> bool:
+    return (Config.get("tool_results") or {}).get("enabled", True)
+
+
+def compact(fn_name: str, result, max_tokens: int | None = None) -> str:
+    """
+    Tool result -> chat history content within the token cap of the tool
+    """
+    max_tokens = max_tokens or _max_tokens(fn_name)
+    value = _to_text(result)
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+
+    full_text = text if isinstance(value, str) else _render(value)
+    result_id = store(fn_name, full_text)
+    pages = -(-len(full_text) // PAGE_CHARS)
+    summary = (f"[{fn_name} result compacted: {tokens} -> ~{max_tokens} tokens. Full result: "
+               f"read_tool_result(result_id=\"{result_id}\", page=1..{pages})]")
+    budget = max_tokens * CHARS_PER_TOKEN - len(summary)
+    if isinstance(value, (dict, list)):
+        # Structured: every long field keeps its head and tail (e.g. all search results stay visible)
+        lengths = _string_lengths(value)
+        overhead = len(json.dumps(_map_strings(value, lambda s: ""), default=str)) + _MARKER_CHARS * len(lengths)
+        limit = _field_limit(lengths, max(budget - overhead, 0))
+        compacted = json.dumps(_map_strings(value, lambda s: _truncate(s, limit)), ensure_ascii=False, default=str)
+    else:
+        compacted = _truncate(text, max(budget, 0))
+    return f"{summary}\n{compacted}"
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _benchmark(pages=5, page_kb=300, eval_tokens_per_sec=500):
+    """
+    web_search(fetch_content=True) like result: history tokens and prompt eval time estimate, raw vs compacted
+    """
+    filler = "<p>Budapest weather forecast: sunny, 21 degrees, light wind from the north west.</p>\n"
+    page = ("<html><head><style>" + "body{margin:0}" * 500 + "</style><script>" + "var x=1;" * 2000 +
+            "</script></head><body><nav>" + "<a href='/x'>menu</a>" * 200 + "</nav>")
+    page += filler * (page_kb * 1024 // len(filler)) + "</body></html>"
+    result = [{"title": f"Result {i}", "url": f"https://example.com/{i}", "snippet": "", "content": page}
+              for i in range(pages)]
+
+    raw = str(result)
+    start = time.perf_counter()
+    compacted = compact("web_search", result, max_tokens=2000)
+    duration = time.perf_counter() - start
+    raw_tokens, compact_tokens = estimate_tokens(raw), estimate_tokens(compacted)
+    print(f"raw: {len(raw) / 1024:.0f} KB, {raw_tokens} tokens, ~{raw_tokens / eval_tokens_per_sec:.1f}s prompt eval")
+    print(f"compacted: {len(compacted) / 1024:.1f} KB, {compact_tokens} tokens, "
+          f"~{compact_tokens / eval_tokens_per_sec:.1f}s prompt eval (at {eval_tokens_per_sec} tok/s) "
+          f"- {raw_tokens / compact_tokens:.0f}x less, compaction took {duration * 1000:.0f} ms")
+    print(compacted[:600])
+
+
+if __name__ == "__main__":
+    _benchmark()
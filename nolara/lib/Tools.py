@@ -1,24 +1,68 @@
 import os
 import importlib.util
-import inspect
 import ast
+import hashlib
+import json
+import re
+import threading
 
 try:
     from . import Config
+    from . import Tracing       # Registers the nolara_tracing alias before the tool modules import trace_span
 except ImportError:
     import Config
+    import Tracing
 
 
 ENABLED_TOOLS = Config.get("agents")["tools"]
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 TOOLS_DIR = os.path.join(SCRIPT_DIR, "tools")
-FUNCTION_TOOLS_MAPPER: dict = {}
+SCHEMA_CACHE_FILE = os.path.join(SCRIPT_DIR, "../configuration/tool_schemas.json")
+FUNCTION_TOOLS_MAPPER: dict = {}        # {function name: ToolFunction}
+TOOL_MODULES: dict = {}                 # {module file name: (sha256, imported module)}
+_TOOL_FILES: dict = {}                  # {module file name: (mtime_ns, size, sha256)}
+_REGISTRY_STATE: tuple | None = None    # enabled tool files state of the current FUNCTION_TOOLS_MAPPER
+_REGISTRY_LOCK = threading.RLock()
 # Add Tools dir to system path to enable tool "sub imports"
 import sys
 if TOOLS_DIR not in sys.path:
     sys.path.insert(0, TOOLS_DIR)
 
+# Python annotation -> JSON schema type
+_JSON_TYPES = {"str": "string", "int": "integer", "float": "number", "bool": "boolean",
+               "list": "array", "tuple": "array", "set": "array", "dict": "object"}
+
+
+def _on_config_changed(changed_keys: set):
+    """
+    Config subscriber: refresh enabled tools selection without restart
+    """
+    global ENABLED_TOOLS
+    ENABLED_TOOLS = Config.get("agents")["tools"]
+
+
+Config.subscribe(_on_config_changed, keys=("agents",))
+
+
+class ToolFunction:
+    """
+    Lazy tool callable: the tool module is imported on the first call only
+    - schema: prebuilt ollama tool schema (JSON dict)
+    """
+
+    def __init__(self, name: str, module_filename: str, schema: dict):
+        self.__name__ = name
+        self.module_filename = module_filename
+        self.schema = schema
+
+    def __call__(self, *args, **kwargs):
+        module = _load_tool_module(self.module_filename)
+        return getattr(module, self.__name__)(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<ToolFunction {self.module_filename}:{self.__name__}>"
+
 
 # Step 1: List all .py files in the tools folder
 def list_py_files() -> list[str]:
@@ -26,11 +70,15 @@ def list_py_files() -> list[str]:
 
 
 # Step 2: Extract function names from a .py file (without importing it)
-def list_functions_in_file(file_name: str) -> list[str]:
+def list_function_nodes_in_file(file_name: str) -> list[ast.FunctionDef]:
     absolute_path = os.path.join(TOOLS_DIR, file_name)
     with open(absolute_path, "r", encoding="utf-8") as f:
         node = ast.parse(f.read(), filename=absolute_path)
-    return [n.name for n in node.body if isinstance(n, ast.FunctionDef) and not n.name.startswith("_")]
+    return [n for n in node.body if isinstance(n, ast.FunctionDef) and not n.name.startswith("_")]
+
+
+def list_functions_in_file(file_name: str) -> list[str]:
+    return [n.name for n in list_function_nodes_in_file(file_name)]
 
 
 # Step 3: Dynamically import a module given its filename
@@ -43,6 +91,19 @@ def import_module_from_file(module_filename: str):
     return module
 
 
+def _load_tool_module(module_filename: str):
+    """
+    Import tool module once (re-import if the file content changed)
+    """
+    with _REGISTRY_LOCK:
+        file_hash = _file_hash(module_filename)
+        cached = TOOL_MODULES.get(module_filename)
+        if cached is None or cached[0] != file_hash:
+            cached = (file_hash, import_module_from_file(module_filename))
+            TOOL_MODULES[module_filename] = cached
+        return cached[1]
+
+
 def is_tool_enabled(tool_name: str) -> bool:
     if ENABLED_TOOLS is None:
         return True  # If no tools are specified, assume all are enabled.
@@ -53,31 +114,162 @@ def is_tool_enabled(tool_name: str) -> bool:
     return tool_name in ENABLED_TOOLS
 
 
-# Step 4: Build the FUNCTION_TOOLS_MAPPER dict automatically
-def generate_tools() -> dict[str, callable]:
+#############################################################
+#                JSON SCHEMA (AST + docstring)              #
+#############################################################
+
+def _json_type(annotation: ast.expr | None) -> dict:
     """
-    Scans all .py files under TOOLS_DIR, imports them, and
-    maps every top-level function name to its function object.
+    Convert a function argument annotation (AST) to JSON schema type
     """
-    global FUNCTION_TOOLS_MAPPER
-    FUNCTION_TOOLS_MAPPER.clear()
+    if annotation is None:
+        return {"type": "string"}
+    base, item = annotation, None
+    if isinstance(annotation, ast.Subscript):
+        base, item = annotation.value, annotation.slice
+    json_type = _JSON_TYPES.get(ast.unparse(base).split(".")[-1].lower(), "string")
+    schema = {"type": json_type}
+    if json_type == "array" and item is not None and not isinstance(item, ast.Tuple):
+        schema["items"] = _json_type(item)
+    return schema
 
-    for filename in list_py_files():
-        if not is_tool_enabled(filename):
+
+def _parse_docstring(docstring: str, arg_names: list[str]) -> (str, dict):
+    """
+    Google style docstring parser
+    :return: function description, {argument name: description}
+    """
+    description_lines = []
+    arg_descriptions = {}
+    section = None
+    current_arg = None
+    for line in (docstring or "").splitlines():
+        stripped = line.strip()
+        header = stripped.lower().rstrip(":")
+        if stripped.endswith(":") and header in ("args", "arguments", "parameters"):
+            section = "args"
             continue
-        mod = import_module_from_file(filename)
-        # Inspect the module for top-level functions
-        for name, obj in inspect.getmembers(mod, inspect.isfunction):
-            if name.startswith("_"):
-                continue
-            # Only include functions defined in this module (ignore imports from elsewhere)
-            if obj.__module__ == mod.__name__:
-                FUNCTION_TOOLS_MAPPER[name] = obj
+        if stripped.endswith(":") and header in ("returns", "return", "raises", "yields", "example", "examples"):
+            section = "other"
+            continue
+        if section is None:
+            if stripped:
+                description_lines.append(stripped)
+        elif section == "args" and stripped:
+            match = re.match(r"^(\w+)\s*(?:\([^)]*\))?\s*:\s*(.*)$", stripped)
+            if match and match.group(1) in arg_names:
+                current_arg = match.group(1)
+                arg_descriptions[current_arg] = match.group(2)
+            elif current_arg is not None:
+                arg_descriptions[current_arg] += f" {stripped}"
+    return " ".join(description_lines), arg_descriptions
+
+
+def function_schema(node: ast.FunctionDef) -> dict:
+    """
+    Build ollama tool schema from function definition (without importing the module)
+    """
+    args = node.args.args
+    arg_names = [a.arg for a in args]
+    description, arg_descriptions = _parse_docstring(ast.get_docstring(node), arg_names)
+    required = arg_names[:len(args) - len(node.args.defaults)]
+    properties = {}
+    for arg in args:
+        properties[arg.arg] = _json_type(arg.annotation)
+        properties[arg.arg]["description"] = arg_descriptions.get(arg.arg, "")
+    return {"type": "function",
+            "function": {"name": node.name,
+                         "description": description,
+                         "parameters": {"type": "object", "required": required, "properties": properties}}}
+
+
+def _file_hash(module_filename: str) -> str:
+    """
+    Content hash with (mtime, size) memo - re-hash only touched files
+    """
+    stat = os.stat(os.path.join(TOOLS_DIR, module_filename))
+    known = _TOOL_FILES.get(module_filename)
+    if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+        return known[2]
+    with open(os.path.join(TOOLS_DIR, module_filename), "rb") as f:
+        file_hash = hashlib.sha256(f.read()).hexdigest()
+    _TOOL_FILES[module_filename] = (stat.st_mtime_ns, stat.st_size, file_hash)
+    return file_hash
+
+
+def _load_schema_cache() -> dict:
+    try:
+        with open(SCHEMA_CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_schema_cache(schema_cache: dict) -> None:
+    tmp_file = f"{SCHEMA_CACHE_FILE}.tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump(schema_cache, f, indent=4)
+        os.replace(tmp_file, SCHEMA_CACHE_FILE)
+    except OSError as e:
+        print(f"[Tools] Cannot save schema cache: {e}")
+
 
+def tool_schemas_in_file(module_filename: str, schema_cache: dict) -> dict:
+    """
+    Function schemas of a tool module, from the on-disk cache (key: file sha256) or from AST
+    :return: {function name: schema}
+    """
+    file_hash = _file_hash(module_filename)
+    schemas = schema_cache.get(file_hash)
+    if schemas is None:
+        schemas = {n.name: function_schema(n) for n in list_function_nodes_in_file(module_filename)}
+        schema_cache[file_hash] = schemas
+    return schemas
+
+
+# Step 4: Build the FUNCTION_TOOLS_MAPPER dict automatically
+def generate_tools() -> dict[str, callable]:
+    """
+    Scans all .py files under TOOLS_DIR and maps every top-level function
+    name to a lazy ToolFunction (with prebuilt JSON schema).
+    - rebuilds only if the enabled tool files changed
+    - tool modules are imported on the first function call
+    """
+    global _REGISTRY_STATE
+    with _REGISTRY_LOCK:
+        enabled_files = sorted(f for f in list_py_files() if is_tool_enabled(f))
+        registry_state = tuple((f, _file_hash(f)) for f in enabled_files)
+        if registry_state == _REGISTRY_STATE:
+            return FUNCTION_TOOLS_MAPPER
+
+        schema_cache = _load_schema_cache()
+        cached_hashes = set(schema_cache)
+        used_hashes = set()
+        FUNCTION_TOOLS_MAPPER.clear()
+        for filename, file_hash in registry_state:
+            for name, schema in tool_schemas_in_file(filename, schema_cache).items():
+                FUNCTION_TOOLS_MAPPER[name] = ToolFunction(name, filename, schema)
+            used_hashes.add(file_hash)
+        # Keep cache entries of disabled tools as well (cheap re-enable), drop stale file versions
+        used_hashes.update(_file_hash(f) for f in list_py_files())
+        pruned_cache = {h: s for h, s in schema_cache.items() if h in used_hashes}
+        if set(pruned_cache) != cached_hashes:
+            _save_schema_cache(pruned_cache)
+        _REGISTRY_STATE = registry_state
     return FUNCTION_TOOLS_MAPPER
 
 
+def generate_tool_schemas() -> list[dict]:
+    """
+    Prebuilt JSON schemas of the enabled tools (ollama chat tools parameter)
+    """
+    return [tool.schema for tool in generate_tools().values()]
+
+
 if __name__ == "__main__":
+    import time
+
     # 1. List all .py files in tools/
     py_files = list_py_files()
     print("Available tool modules:", py_files)
@@ -95,7 +287,12 @@ if __name__ == "__main__":
     print(f"Functions defined in {selected_module} (via AST): {functions}")
 
     # 5. Build the global FUNCTION_TOOLS_MAPPER dictionary
+    start = time.perf_counter()
     mapper = generate_tools()
-    print("\nGenerated FUNCTION_TOOLS_MAPPER:")
+    print(f"\nGenerated FUNCTION_TOOLS_MAPPER ({(time.perf_counter() - start) * 1000:.2f} ms):")
     for fname, fref in mapper.items():
         print(f"  - {fname} -> {fref}")
+    start = time.perf_counter()
+    generate_tools()
+    print(f"Cached registry lookup: {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(json.dumps(generate_tool_schemas(), indent=2))
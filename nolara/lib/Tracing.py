@@ -0,0 +1,316 @@
+"""
+Lightweight per-turn tracing
+- turn(): root span of one chat turn, span(): nested span (with statement), start(): leaf span finished later
+- nesting follows contextvars: thread pool workers keep the parent span with bind()
+- disabled, or outside a traced turn: shared no-op span (no allocation, no timing)
+- finished turn: span tree for the TUI breakdown, optional JSON lines trace file
+- tool modules (outside the lib package) import trace_span by the sys.modules alias: TRACING_MODULE
+"""
+import contextvars
+import functools
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    from . import Config
+except ImportError:
+    import Config
+
+TRACING_MODULE = "nolara_tracing"
+CONFIG_DIR = Path(__file__).parent.parent / "configuration"
+ENABLED = False
+TRACE_FILE: Path | None = None          # JSON lines trace file (None: off)
+_CURRENT = contextvars.ContextVar("nolara_span", default=None)
+_FILE_LOCK = threading.Lock()
+
+
+class Span:
+    """
+    Timed span with attributes and child spans
+    """
+    recording = True
+
+    def __init__(self, name, attributes, parent=None):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.children = []
+        self.start_time = 0.0
+        self.end_time = None
+        self._token = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        if self.parent is not None:
+            self.parent.children.append(self)
+        return self
+
+    def finish(self, **attributes):
+        if self.end_time is not None:
+            return
+        self.end_time = time.perf_counter()
+        self.attributes.update(attributes)
+        if self.parent is None:
+            _turn_finished(self)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.end_time is None else self.end_time - self.start_time
+
+    def __enter__(self):
+        self.start()
+        self._token = _CURRENT.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _CURRENT.reset(self._token)
+        if exc_type is not None:
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"[:200]
+        self.finish()
+
+    def walk(self):
+        yield self
+        for child in list(self.children):
+            yield from child.walk()
+
+    def to_dict(self, origin=None) -> dict:
+        origin = self.start_time if origin is None else origin
+        return {"name": self.name, "offset_ms": round((self.start_time - origin) * 1000, 2),
+                "duration_ms": round(self.duration * 1000, 2) if self.duration is not None else None,
+                **({"attributes": self.attributes} if self.attributes else {}),
+                **({"children": [c.to_dict(origin) for c in list(self.children)]} if self.children else {})}
+
+
+class _NullSpan:
+    """
+    Disabled tracing: every call is a no-op
+    """
+    recording = False
+    name = None
+    attributes = {}
+    children = ()
+    duration = None
+
+    def start(self):
+        return self
+
+    def finish(self, **attributes):
+        pass
+
+    def set(self, **attributes):
+        pass
+
+    def walk(self):
+        return iter(())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+#############################################################
+#                         SPAN API                          #
+#############################################################
+
+def turn(name="turn", **attributes):
+    """
+    Root span of a chat turn (with statement)
+    """
+    if not ENABLED:
+        return NULL_SPAN
+    return Span(name, attributes, _CURRENT.get())
+
+
+def span(name, **attributes):
+    """
+    Nested span (with statement), no-op outside a traced turn
+    """
+    parent = _CURRENT.get() if ENABLED else None
+    if parent is None:
+        return NULL_SPAN
+    return Span(name, attributes, parent)
+
+
+def start(name, **attributes):
+    """
+    Started leaf span, ended by finish() (e.g. a streamed response, finished when the stream is closed)
+    - not the current span: spans started meanwhile are its siblings
+    """
+    parent = _CURRENT.get() if ENABLED else None
+    if parent is None:
+        return NULL_SPAN
+    return Span(name, attributes, parent).start()
+
+
+def trace_span(name, **attributes):
+    """
+    span() for tool modules, imported by the sys.modules alias: from nolara_tracing import trace_span
+    """
+    return span(name, **attributes)
+
+
+def bind(fn):
+    """
+    Run fn in a copy of the current context (thread pool submit: spans of the worker nest under the current span)
+    - one bind() per submit: a context copy cannot run in two threads at once
+    """
+    if not ENABLED or _CURRENT.get() is None:
+        return fn
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+#############################################################
+#                      TURN BREAKDOWN                       #
+#############################################################
+
+def _turn_finished(root: Span):
+    if TRACE_FILE is None:
+        return
+    record = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), **root.to_dict()}
+    try:
+        with _FILE_LOCK:
+            TRACE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(TRACE_FILE, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+    except OSError as e:
+        print(f"[Tracing] Cannot write trace file: {e}")
+
+
+def totals(root) -> dict:
+    """
+    {span name: [count, seconds]} of the nested spans (parallel spans overlap)
+    """
+    result = {}
+    for item in root.walk():
+        if item is root or item.duration is None:
+            continue
+        entry = result.setdefault(item.name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += item.duration
+    return result
+
+
+def summary(root) -> str:
+    """
+    One line: turn duration and time per span name
+    """
+    if root.duration is None:
+        return ""
+    parts = [f"{name} {seconds:.2f}s" + (f" x{count}" if count > 1 else "")
+             for name, (count, seconds) in totals(root).items()]
+    return f"{root.duration:.2f}s" + (f" · {' · '.join(parts)}" if parts else "")
+
+
+def _format_attributes(attributes: dict) -> str:
+    return "  ".join(f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                     for key, value in attributes.items())
+
+
+def breakdown(root) -> list[str]:
+    """
+    Indented span tree lines: offset, duration, name, attributes
+    """
+    lines = []
+
+    def _add(item, depth):
+        duration = f"{item.duration * 1000:8.1f} ms" if item.duration is not None else "   (open)  "
+        offset = (item.start_time - root.start_time) * 1000
+        lines.append(f"+{offset:7.1f} ms {duration}  {'  ' * depth}{item.name}  {_format_attributes(item.attributes)}"
+                     .rstrip())
+        for child in list(item.children):
+            _add(child, depth + 1)
+
+    if root.recording:
+        _add(root, 0)
+    return lines
+
+
+#############################################################
+#                        CONFIGURATION                      #
+#############################################################
+
+def configure(enabled:bool|None=None, trace_file:str|None=None):
+    """
+    Apply the "tracing" config (arguments override it)
+        trace_file: JSON lines file, relative to the configuration directory ("": off)
+    """
+    global ENABLED, TRACE_FILE
+    config = Config.get("tracing") or {}
+    ENABLED = bool(config.get("enabled", False) if enabled is None else enabled)
+    trace_file = config.get("file") if trace_file is None else trace_file
+    TRACE_FILE = CONFIG_DIR / trace_file if trace_file else None
+
+
+def _on_config_changed(changed_keys: set):
+    configure()
+
+
+sys.modules.setdefault(TRACING_MODULE, sys.modules[__name__])
+configure()
+Config.subscribe(_on_config_changed, keys=("tracing",))
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _test():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _traced_sleep(i):
+        with span("web.get", url=f"http://example/{i}"):
+            time.sleep(0.005)
+
+    configure(enabled=False)
+    assert turn() is NULL_SPAN and span("x") is NULL_SPAN
+    configure(enabled=True, trace_file="")
+    assert span("outside a turn") is NULL_SPAN
+    with turn(model="test") as root:
+        leaf = start("run_model", stream=True)
+        with span("tool_call", tool="slow"):
+            time.sleep(0.01)
+            with ThreadPoolExecutor(2) as pool:
+                [future.result() for future in [pool.submit(bind(_traced_sleep), i) for i in range(2)]]
+            unbound = ThreadPoolExecutor(1).submit(lambda: span("lost")).result()
+        leaf.finish(eval_count=3)
+        try:
+            with span("human_output_parser"):
+                raise ValueError("bad")
+        except ValueError:
+            pass
+    assert unbound is NULL_SPAN
+    names = [item.name for item in root.walk()]
+    assert names == ["turn", "run_model", "tool_call", "web.get", "web.get", "human_output_parser"], names
+    assert root.children[2].attributes["error"] == "ValueError: bad"
+    assert totals(root)["web.get"][0] == 2
+    print(summary(root))
+    print("\n".join(breakdown(root)))
+    json.dumps(root.to_dict())
+
+    def _overhead(enabled, calls=100000):
+        configure(enabled=enabled, trace_file="")
+        start_time = time.perf_counter()
+        with turn():
+            for _ in range(calls):
+                with span("x"):
+                    pass
+        return (time.perf_counter() - start_time) / calls * 1e9
+
+    print(f"span overhead: disabled {_overhead(False):.0f} ns, enabled {_overhead(True):.0f} ns")
+    configure()
+    print("[Tracing] OK")
+
+
+if __name__ == "__main__":
+    _test()
@@ -1,7 +1,10 @@
 # Allow math functions
 import math
-import requests
 from datetime import datetime
+from http_interface._http_client import get_json
+
+WEATHER_TTL = 15 * 60           # Current weather is refreshed every 15 minutes
+LOCATION_TTL = 6 * 60 * 60      # IP based location rarely changes
 
 
 def calculator(expression: str) -> float:
@@ -44,11 +47,10 @@ def get_weather(location: str) -> dict:
         dict: Basic weather info including temperature and condition
     """
     url = f"https://wttr.in/{location}?format=j1"
-    response = requests.get(url)
-    if response.status_code != 200:
-        raise ValueError(f"Failed to fetch weather for {location}")
-
-    data = response.json()
+    try:
+        data = get_json(url, ttl=WEATHER_TTL)
+    except Exception as e:
+        raise ValueError(f"Failed to fetch weather for {location}: {e}")
     current = data["current_condition"][0]
 
     return {
@@ -86,12 +88,10 @@ def get_location_from_user() -> str:
         str: Location name (city) or fallback default.
     """
     try:
-        response = requests.get("https://ipinfo.io/json")
-        if response.status_code == 200:
-            data = response.json()
-            city = data.get("city")
-            if city:
-                return city
+        data = get_json("https://ipinfo.io/json", ttl=LOCATION_TTL)
+        city = data.get("city")
+        if city:
+            return city
     except Exception as e:
         return f"Location detection failed: {e}"
     return "Budapest"
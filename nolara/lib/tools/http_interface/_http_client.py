@@ -0,0 +1,243 @@
+"""
+Shared HTTP client layer for agent tools
+- one pooled keep-alive session, default timeouts, gzip
+- on-disk HTTP cache: fresh entries are served without network,
+  stale entries are revalidated with ETag / Last-Modified (304: cached body is reused)
+- freshness: per-call ttl override, otherwise Cache-Control max-age, otherwise always revalidate
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from nolara_tracing import trace_span       # nolara Tracing (sys.modules alias), loaded before the tools
+except ImportError:
+    def trace_span(name, **attributes):
+        return nullcontext()                    # Standalone usage: no tracing
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/114.0.0.0 Safari/537.36"
+    ),
+    "Accept-Encoding": "gzip, deflate",
+}
+DEFAULT_TIMEOUT = (3.05, 10)            # (connect, read) seconds
+POOL_SIZE = 8
+HTTP_CACHE_DIR = Path(__file__).parent.parent.parent.parent / "configuration" / "http_cache"
+CACHE_STATS = {"fresh": 0, "revalidated": 0, "miss": 0, "no_store": 0}
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+_CACHED_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "date")
+
+
+class HttpResponse:
+    """
+    Minimal response (network or cache): status_code, headers, content, text, json()
+    """
+
+    def __init__(self, url: str, status_code: int, headers: dict, content: bytes, from_cache: str | None = None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.from_cache = from_cache        # None (network), "fresh" or "revalidated"
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        match = re.search(r"charset=([\w-]+)", self.headers.get("content-type", ""))
+        return self.content.decode(match.group(1) if match else "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+def session() -> requests.Session:
+    """
+    Shared keep-alive session (connection pool reused across tools and tool calls)
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = requests.Session()
+            _SESSION.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _SESSION.mount("https://", adapter)
+            _SESSION.mount("http://", adapter)
+        return _SESSION
+
+
+#############################################################
+#                      ON-DISK HTTP CACHE                   #
+#############################################################
+
+def _cache_path(url: str, params: dict | None) -> Path:
+    key = hashlib.sha256(json.dumps([url, sorted((params or {}).items())]).encode()).hexdigest()
+    return HTTP_CACHE_DIR / key
+
+
+def _load_entry(path: Path) -> tuple[dict, bytes] | None:
+    try:
+        with open(f"{path}.json", "r") as f:
+            meta = json.load(f)
+        with gzip.open(f"{path}.gz", "rb") as f:
+            return meta, f.read()
+    except (OSError, ValueError):
+        return None
+
+
+def _save_entry(path: Path, meta: dict, content: bytes | None = None) -> None:
+    """
+    Atomic write: body first (if changed), then metadata
+    """
+    try:
+        HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if content is not None:
+            with gzip.open(f"{path}.gz.{threading.get_ident()}.tmp", "wb") as f:
+                f.write(content)
+            os.replace(f"{path}.gz.{threading.get_ident()}.tmp", f"{path}.gz")
+        with open(f"{path}.json.{threading.get_ident()}.tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{path}.json.{threading.get_ident()}.tmp", f"{path}.json")
+    except OSError as e:
+        print(f"[http_client] Cannot write cache entry: {e}")
+
+
+def _max_age(headers: dict) -> int | None:
+    cache_control = headers.get("cache-control", "")
+    if "no-cache" in cache_control:
+        return 0        # Store, but revalidate on every use
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return int(match.group(1)) if match else None
+
+
+def get(url: str, params: dict | None = None, headers: dict | None = None, ttl: int | None = None,
+        timeout=DEFAULT_TIMEOUT, cache: bool = True) -> HttpResponse:
+    """
+    HTTP GET with the shared session and the on-disk cache
+        ttl: seconds the response is fresh (per-tool override), None: Cache-Control max-age of the response
+        cache: False - network only, nothing stored
+    """
+    with trace_span("web.get", url=url):
+        return _get(url, params, headers, ttl, timeout, cache)
+
+
+def _get(url, params, headers, ttl, timeout, cache) -> HttpResponse:
+    path = _cache_path(url, params)
+    cached = _load_entry(path) if cache else None
+    request_headers = dict(headers or {})
+    if cached is not None:
+        meta, content = cached
+        fresh_for = ttl if ttl is not None else meta.get("max_age") or 0
+        if time.time() - meta["stored_at"] < fresh_for:
+            CACHE_STATS["fresh"] += 1
+            return HttpResponse(url, meta["status_code"], meta["headers"], content, from_cache="fresh")
+        if "etag" in meta["headers"]:
+            request_headers["If-None-Match"] = meta["headers"]["etag"]
+        if "last-modified" in meta["headers"]:
+            request_headers["If-Modified-Since"] = meta["headers"]["last-modified"]
+
+    resp = session().get(url, params=params, headers=request_headers, timeout=timeout)
+    resp_headers = {k.lower(): v for k, v in resp.headers.items() if k.lower() in _CACHED_HEADERS}
+    if cached is not None and resp.status_code == 304:
+        CACHE_STATS["revalidated"] += 1
+        meta["stored_at"] = time.time()
+        meta["headers"].update(resp_headers)
+        meta["max_age"] = _max_age(meta["headers"])
+        _save_entry(path, meta)
+        return HttpResponse(url, meta["status_code"], meta["headers"], content, from_cache="revalidated")
+
+    response = HttpResponse(resp.url, resp.status_code, resp_headers, resp.content)
+    if not cache or resp.status_code != 200 or "no-store" in resp_headers.get("cache-control", ""):
+        CACHE_STATS["no_store"] += 1
+        return response
+    CACHE_STATS["miss"] += 1
+    _save_entry(path, {"url": url, "status_code": resp.status_code, "headers": resp_headers,
+                       "stored_at": time.time(), "max_age": _max_age(resp_headers)}, resp.content)
+    return response
+
+
+def get_json(url: str, params: dict | None = None, ttl: int | None = None, timeout=DEFAULT_TIMEOUT):
+    response = get(url, params=params, ttl=ttl, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _test():
+    """
+    Local HTTP stand-in with ETag / Last-Modified: fresh hit, 304 revalidation, changed resource
+    """
+    import tempfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    global HTTP_CACHE_DIR
+    state = {"version": 1, "requests": 0}
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            state["requests"] += 1
+            etag = f'"v{state["version"]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            payload = gzip.compress(json.dumps({"version": state["version"]}).encode())
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/weather"
+    original = HTTP_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        HTTP_CACHE_DIR = Path(tmp_dir)
+        try:
+            steps = [("first call", 60), ("fresh (ttl=60)", 60), ("stale (ttl=0): revalidate", 0)]
+            for name, ttl in steps:
+                response = get(url, ttl=ttl)
+                print(f"{name}: {response.json()} from_cache={response.from_cache} server requests={state['requests']}")
+            state["version"] = 2
+            response = get(url, ttl=0)
+            print(f"changed resource: {response.json()} from_cache={response.from_cache} "
+                  f"server requests={state['requests']}")
+            print(CACHE_STATS)
+        finally:
+            HTTP_CACHE_DIR = original
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    _test()
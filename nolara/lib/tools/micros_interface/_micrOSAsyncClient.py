@@ -0,0 +1,334 @@
+"""
+asyncio micrOS client: micrOSClient semantics without threads
+- connect (prompt detection, busy server retry), password auth, send_cmd, streamed receive
+- many devices concurrently from one event loop (asyncio.gather)
+- same return values as micrOSClient.send_cmd: reply line list, None (error / prompt mismatch), "" (no reply)
+"""
+import asyncio
+import socket
+import time
+
+try:
+    from ._micrOSClient import micrOSClient, ReplyBuffer
+except ImportError:
+    from _micrOSClient import micrOSClient, ReplyBuffer
+
+
+class NoReply(TimeoutError):
+    """
+    Nothing received from the device in the read timeout
+    """
+
+
+class micrOSAsyncClient:
+
+    def __init__(self, host, port, pwd=None, dbg=False):
+        """
+        host: host name / IP address (resolved on connect, shared micrOSClient.CONN_MAP cache)
+        port: micrOS server port
+        dbg: debug prints on/off (session debug)
+        """
+        # Connection params
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        self.host = host            # server IP address
+        self.port = port            # server port
+        self.hostname = None        # server hostname: host or resolve
+        self.isconn = False         # object is connected
+        self.prompt = None          # server prompt for session data check
+        self.preprompt = ""
+        self.password = pwd
+        self.timeout = 3            # socket read timeout (connect timeout of send_cmd)
+        self._resolved = False
+        # Debug params
+        self.dbg = dbg
+        self.spacer = 0
+        self.avg_reply = [0, 0]
+
+    @property
+    def telnet_prompt(self):
+        return f"{self.preprompt}{self.prompt} "
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    async def _address_manager(self):
+        """
+        Resolve host name to IP address (non-blocking DNS)
+        """
+        self._resolved = True
+        if micrOSClient.validate_ipv4(self.host):
+            return
+        self.hostname = self.host
+        if micrOSClient.CONN_MAP.get(self.hostname) is not None:
+            self.dbg_print("\t[cache] Resolve IP by host name...")
+            self.host = micrOSClient.CONN_MAP[self.hostname]
+            return
+        self.dbg_print("\t[dhcp] Resolve IP by host name... {}".format(self.host))
+        if "__simulator__" in self.host:
+            self.host = '127.0.0.1'
+            self.hostname = 'simulator'
+            return
+        addresses = await asyncio.get_running_loop().getaddrinfo(self.host, self.port, family=socket.AF_INET,
+                                                                  type=socket.SOCK_STREAM)
+        address = addresses[-1][4][0]
+        if not micrOSClient.validate_ipv4(address):
+            raise Exception("Invalid host: {}".format(address))
+        micrOSClient.CONN_MAP[self.hostname] = address
+        self.host = address
+
+    async def _connect(self, timeout):
+        self.close()
+        self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), timeout)
+        self.isconn = True
+
+    async def connect(self, timeout, retry=5):
+        """
+        Connect to server and wait for prompt
+        """
+        self.timeout = timeout
+        self.dbg_print("{}[CONNECT] {}:{}:{}".format("[SKIP]" if self.isconn else "", self.hostname, self.host,
+                                                     self.port))
+        if not self.isconn:
+            if not self._resolved:
+                await self._address_manager()
+            await self._connect(timeout)
+            # Get server prompt with retry
+            for cnt in range(0, retry):
+                try:
+                    if await self._get_prompt():
+                        break
+                except Exception as e:
+                    self.dbg_print("\t\t[RECONN] Wait for prompt [{}/{}]: {}".format(cnt + 1, retry, e))
+                    if "Busy server" in str(e):
+                        await self._connect(timeout)
+                await asyncio.sleep(0.3)
+            else:
+                self.close()
+                raise Exception("[EXIT] Server is busy, try later.")
+        # Set hostname if empty to "short" prompt (prompt without " $")
+        self.hostname = self.prompt.split()[0] if self.hostname is None else self.hostname
+        await self._auth()
+        return self.prompt
+
+    async def _auth(self):
+        if self.password is not None and '[password]' in self.preprompt:
+            out = await self.send_cmd(self.password, timeout=4)
+            if out is None or 'AuthFailed' in out or 'Bye!' in out:
+                self.close()
+                raise Exception(f"Connection {self.prompt} - AuthFailed")
+
+    async def _get_prompt(self, timeout=3):
+        self.dbg_print("[GET PROMPT]")
+        try:
+            prompt = (await asyncio.wait_for(self.reader.read(256), timeout)).decode('utf-8')
+        except asyncio.TimeoutError:
+            prompt = ""
+        if 'Bye!' in prompt and "busy" in prompt:
+            raise Exception("Busy server: {}".format(prompt))
+        if '$' in prompt:
+            self.prompt = ' '.join(prompt.split()[-2:])
+            self._filter_preprompt(prompt)
+        self.dbg_print("\t|-> {}{}".format(f"{self.preprompt} ", self.prompt))
+        return self.prompt is not None
+
+    def _filter_preprompt(self, _data):
+        if len(_data) == 0:
+            return _data
+        last_line = _data.strip().split('\n')[-1]
+        if self.prompt is not None:
+            if self.prompt in last_line:
+                x = last_line.replace(self.prompt, '')
+                self.preprompt = x if len(x) > 0 else self.preprompt
+            if self.preprompt in last_line:
+                _data = _data.replace(self.preprompt, "")
+            else:
+                self.preprompt = ""
+        return _data
+
+    async def _reply_lines(self, read_timeout=20, stream=False):
+        """
+        Client Receiver Loop (async generator, linear in reply size, prompt / Bye! terminated)
+        - read_timeout: wait for the first reply data, then the socket timeout applies
+        """
+        reply = ReplyBuffer(self.prompt)
+        received = False
+        while not reply.done:
+            try:
+                incoming = await asyncio.wait_for(self.reader.read(micrOSClient.RECV_SIZE),
+                                                  self.timeout if received else read_timeout)
+            except asyncio.TimeoutError:
+                if received:
+                    raise
+                raise NoReply(f"No reply in {read_timeout} sec")
+            if not incoming:
+                raise ConnectionResetError("Connection closed by server")
+            received = True
+            incoming_data = reply.feed(incoming)
+            if stream:
+                print(f"\r{incoming_data}", end="")
+            for line in reply.pop_lines():
+                yield line
+        self.dbg_print("\t\t[{}] Stop receiver loop".format("Bye!" if reply.bye else self.prompt))
+        last_line = reply.last_line()
+        if len(last_line) > 0:
+            last_line = self._filter_preprompt(last_line).replace(self.prompt, '').rstrip()
+            if last_line != '':
+                yield last_line
+
+    async def _receive_data(self, read_timeout=20, stream=False):
+        """
+        Reply line list ("" if no reply in read_timeout)
+        """
+        try:
+            return [line async for line in self._reply_lines(read_timeout, stream=stream)]
+        except NoReply:
+            return ""
+
+    def close(self):
+        if self.writer is None:
+            return
+        self.dbg_print("[CLOSE] {}:{}:{}".format(self.hostname, self.host, self.port))
+        self.writer.close()
+        self.reader, self.writer = None, None
+        self.isconn = False
+        self.spacer = 0
+
+    async def _run_command(self, cmd, stream=False):
+        reboot_request = 'reboot' in cmd.strip()
+        if self._prompt_matches():
+            self.writer.write(str.encode(cmd))
+            await self.writer.drain()
+            if reboot_request:
+                return 'Bye!'
+            return await self._receive_data(stream=stream)
+        return None
+
+    def _prompt_matches(self):
+        check_prompt = str(self.prompt).replace('$', '').strip()
+        check_hostname = str(self.hostname).split('.')[0]
+        if self.hostname is None or check_prompt == check_hostname:
+            return True
+        print(f"[micrOSAsyncClient] prompt mismatch, hostname: {check_hostname} prompt: {check_prompt} ")
+        return False
+
+    async def send_cmd(self, cmd, timeout=3, retry=5, stream=False):
+        """
+        Send command function - auto connect, reply line list or None
+        """
+        start_time = time.time()
+        if len(cmd.strip()) == 0:
+            return None
+        self.dbg_print("[⏰] Send: {} -> {}:{}:{}".format(cmd, self.hostname, self.host, self.port))
+        if not self.isconn:
+            self.dbg_print("Auto init connection (isconn:{})".format(self.isconn))
+            await self.connect(timeout=timeout, retry=retry)
+        try:
+            out = await self._run_command(cmd, stream=stream)
+        except Exception as e:
+            self.dbg_print(f"[ERR] send_cmd error: {e}")
+            self.dbg_print("Auto deinit connection")
+            self.close()
+            out = None
+        delta_time = time.time() - start_time
+        self.avg_reply[0] += delta_time
+        self.avg_reply[1] += 1
+        self.dbg_print("[{:.2f}][⏰] {} reply: {}".format(delta_time, cmd, out))
+        return out
+
+    async def send_cmd_lines(self, cmd, timeout=3, retry=5, read_timeout=20):
+        """
+        Streaming send_cmd: async generator of reply lines as they arrive
+        - errors are raised, the connection is closed if the reply is not consumed completely
+        """
+        if len(cmd.strip()) == 0:
+            return
+        if not self.isconn:
+            await self.connect(timeout=timeout, retry=retry)
+        if not self._prompt_matches():
+            return
+        completed = False
+        try:
+            self.writer.write(str.encode(cmd))
+            await self.writer.drain()
+            async for line in self._reply_lines(read_timeout):
+                yield line
+            completed = True
+        finally:
+            if not completed:
+                self.close()
+
+    async def send_cmd_retry(self, cmd, timeout=6, retry=5, stream=False):
+        out = None
+        for cnt in range(0, retry):
+            try:
+                out = await self.send_cmd(cmd, timeout, stream=stream)
+                if out is None or isinstance(out, list):
+                    break
+            except OSError as e:
+                self.dbg_print("Host is down, timed out: {} sec e: {}".format(timeout, e))
+                break
+            except Exception as e:
+                if "Bye!" in str(e):
+                    self.dbg_print("[Count] Send retry: {}/{}".format(cnt + 1, retry))
+            await asyncio.sleep(0.2)
+        return out
+
+    def dbg_print(self, msg, end='\n'):
+        if self.dbg:
+            print(f"{' ' * self.spacer}[dbg] {msg}", end=end)
+            if self.spacer < 60:
+                self.spacer += 1
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _benchmark(devices=50, commands=("hello", "version", "modules"), delay=0.02):
+    """
+    Query a simulated fleet: sync client (serial, thread per device) vs asyncio client (one thread)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    try:
+        from ._micrOS_simulator import MicrOSSimulator
+    except ImportError:
+        from _micrOS_simulator import MicrOSSimulator
+    names = [f"node{i:02d}" for i in range(devices)]
+
+    def sync_device(name):
+        client = micrOSClient(*sim.address(name), pwd="ADmin123")
+        replies = [client.send_cmd(cmd) for cmd in commands]
+        client.close()
+        return replies
+
+    async def async_device(name):
+        async with micrOSAsyncClient(*sim.address(name), pwd="ADmin123") as client:
+            return [await client.send_cmd(cmd) for cmd in commands]
+
+    async def async_fleet():
+        return await asyncio.gather(*(async_device(name) for name in names))
+
+    def check(replies):
+        return sum(r[0][0].startswith(f"hello:{name}") and r[1] == ["2.9.0-0"] for name, r in zip(names, replies))
+
+    def sync_threads():
+        with ThreadPoolExecutor(max_workers=devices) as executor:
+            return list(executor.map(sync_device, names))
+
+    runs = [("sync client, serial", lambda: [sync_device(name) for name in names]),
+            ("sync client, thread per device", sync_threads),
+            ("async client, asyncio.gather", lambda: asyncio.run(async_fleet()))]
+    with MicrOSSimulator(devices=names, password="ADmin123", delay=delay) as sim:
+        print(f"{devices} simulated devices, {len(commands)} commands each, {delay * 1000:.0f} ms/reply, with auth")
+        for name, run in runs:
+            start = time.perf_counter()
+            replies = run()
+            print(f"\t{name}: {time.perf_counter() - start:.2f}s ({check(replies)}/{devices} devices ok)")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -1,10 +1,71 @@
+import codecs
 import socket
 import select
+import sys
 import time
+from contextlib import nullcontext
+
+try:
+    from nolara_tracing import trace_span       # nolara Tracing (sys.modules alias), loaded before the tools
+except ImportError:
+    def trace_span(name, **attributes):
+        return nullcontext()                    # Standalone usage: no tracing
+
+
+class ReplyBuffer:
+    """
+    Linear time reply receiver (shared by micrOSClient and micrOSAsyncClient)
+    - incremental UTF-8 decoding: multi-byte characters split across chunks stay intact
+    - prompt and Bye! detection on the tail only (no re-scan of the whole reply per chunk)
+    - complete reply lines are available while receiving (streaming consumers)
+    """
+    TAIL_CHARS = 512
+
+    def __init__(self, prompt):
+        self.prompt = prompt
+        self.done = False               # prompt or Bye! received
+        self.bye = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._tail = ""
+        self._pending = []              # parts of the incomplete last line
+        self._lines = []                # complete lines, not popped yet
+
+    def feed(self, data) -> str:
+        """
+        Add received bytes (bytes / memoryview), return the decoded text
+        """
+        text = self._decoder.decode(data)
+        self._tail = (self._tail + text)[-self.TAIL_CHARS:]
+        last_line = self._tail.strip().split("\n")[-1]
+        self.bye = "Bye!" in last_line
+        self.done = self.bye or self.prompt in last_line
+        if "\n" in text:
+            first, *complete, last = text.split("\n")
+            self._pending.append(first)
+            self._lines.append("".join(self._pending))
+            self._lines.extend(complete)
+            self._pending = [last]
+        elif text:
+            self._pending.append(text)
+        return text
+
+    def pop_lines(self) -> list:
+        """
+        Complete reply lines since the last call (prompt removed, empty lines dropped)
+        """
+        lines, self._lines = self._lines, []
+        return [line for line in (l.replace(self.prompt, "") if self.prompt in l else l for l in lines) if line != ""]
+
+    def last_line(self) -> str:
+        """
+        Incomplete last line (prompt line) after the reply is done
+        """
+        return "".join(self._pending) + self._decoder.decode(b"", final=True)
 
 
 class micrOSClient:
     CONN_MAP = {}
+    RECV_SIZE = 65536
 
     def __init__(self, host, port, pwd=None, dbg=False):
         """
@@ -21,6 +82,8 @@ class micrOSClient:
         self.prompt = None          # server prompt for session data check
         self.preprompt = ""
         self.password = pwd
+        self.cmd_sent = False       # last send_cmd reached conn.send (the device may have run it)
+        self.recv_buffer = bytearray(micrOSClient.RECV_SIZE)    # reused socket receive buffer
         # Debug params
         self.dbg = dbg
         self.spacer = 0             # to auto-format connection debug print
@@ -169,41 +232,43 @@ class micrOSClient:
                 self.preprompt = ""
         return _data
 
-    def __receive_data(self, read_timeout=20, stream=False):
+    def __reply_lines(self, stream=False):
         """
-        Client Receiver Loop
-        - read_timeout - wait for server to reply (should be <15, avoid msg queue-ing)
+        Client Receiver Loop (generator, linear in reply size)
         - managed by prompt (means server waiting for input)
         - Bye! - command closes the shell
-        Output: data line list
+        Output: reply lines as they arrive
         """
+        reply = ReplyBuffer(self.prompt)
+        view = memoryview(self.recv_buffer)
+        while not reply.done:
+            size = self.conn.recv_into(view)
+            if size == 0:
+                # Peer closed the session (stale socket) - avoid spinning on EOF
+                raise ConnectionResetError("Connection closed by server")
+            incoming_data = reply.feed(view[:size])
+            if stream:
+                print(f"\r{incoming_data}", end="")
+            yield from reply.pop_lines()
+        self.dbg_print("\t\t[{}] Stop receiver loop".format("Bye!" if reply.bye else self.prompt))
+        # Remove preprompt and prompt from the last line - only for msg end detection
+        last_line = reply.last_line()
+        if len(last_line) > 0:
+            last_line = self.__filter_preprompt(last_line).replace(self.prompt, '').rstrip()
+            if last_line != '':
+                yield last_line
 
-        data_buffer = ""
-        # Collect answer data
-        if select.select([self.conn], [], [], read_timeout)[0]:
-            while True:
-                incoming_data = self.conn.recv(4096).decode('utf-8')
-                if stream:
-                    incoming_data = incoming_data.replace(self.prompt, f"{self.prompt}")
-                    print(f"\r{incoming_data}", end="")
-                data_buffer += incoming_data
-                # Last line from data_buffer (handle fragmented messages - prompt detection)
-                last_line = data_buffer.strip().split("\n")[-1]
-                # Wait for prompt or special cases (exit/prompt)
-                if "Bye!" in last_line:
-                    self.dbg_print("\t\t[Bye!] Stop receiver loop")
-                    break
-                if self.prompt in last_line:
-                    self.dbg_print("\t\t[{}] Stop receiver loop".format(self.prompt))
-                    break
-            self.dbg_print("\n\t\tData: {}".format(data_buffer))
-            # Remove preprompt from last line if we have
-            data_buffer = self.__filter_preprompt(data_buffer)
-            # Remove prompt from output - only for msg end detection
-            data_buffer = data_buffer.replace(self.prompt, '').rstrip()
-            # Create list data output
-            data_buffer = [k for k in data_buffer.split('\n') if k != '']
-        return data_buffer
+    def __receive_data(self, read_timeout=20, stream=False):
+        """
+        Client Receiver Loop
+        - read_timeout - wait for server to reply (should be <15, avoid msg queue-ing)
+        Output: data line list ("" if no reply in read_timeout)
+        """
+        if not select.select([self.conn], [], [], read_timeout)[0]:
+            return ""
+        data = list(self.__reply_lines(stream=stream))
+        self.dbg_print("\n\t\tData: {} lines".format(len(data)))
+        return data
 
     def close(self):
         if self.conn is None:
@@ -222,47 +287,56 @@ class micrOSClient:
         """
         reboot_request = True if 'reboot' in cmd.strip() else False
         cmd = str.encode(cmd)
-        # Compare prompt |node01 $| with hostname 'node01.local'
-        check_prompt = str(self.prompt).replace('$', '').strip()
-        check_hostname = str(self.hostname).split('.')[0]
-        if self.hostname is None or check_prompt == check_hostname:
+        if self.__prompt_matches():
             # Sun command on validated device
             self.conn.send(cmd)
+            self.cmd_sent = True
             # Workaround for reboot command - micrOS async server cannot send Bye! msg before reboot.
             if reboot_request:
                 return 'Bye!'
             data = self.__receive_data(stream=stream)
             return data
-        # Skip command run: prompt and host not the same!
-        print(f"[micrOSClient] prompt mismatch, hostname: {check_hostname} prompt: {check_prompt} ")
         # Check UID?
         return None
 
+    def __prompt_matches(self):
+        # Compare prompt |node01 $| with hostname 'node01.local'
+        check_prompt = str(self.prompt).replace('$', '').strip()
+        check_hostname = str(self.hostname).split('.')[0]
+        if self.hostname is None or check_prompt == check_hostname:
+            return True
+        # Skip command run: prompt and host not the same!
+        print(f"[micrOSClient] prompt mismatch, hostname: {check_hostname} prompt: {check_prompt} ")
+        return False
+
     def send_cmd(self, cmd, timeout=3, retry=5, stream=False):
         """
         Send command function - main usage for non interactive mode
         """
 
         start_time = time.time()
+        self.cmd_sent = False
 
         # Check cmd is not empty
         if len(cmd.strip()) == 0:
             return None
 
         self.dbg_print("[⏰] Send: {} -> {}:{}:{}".format(cmd, self.hostname, self.host, self.port))
-        # [SINGLE COMMAND CMD] Automatic connection handling - for single sessions
-        if not self.isconn:
-            self.dbg_print("Auto init connection (isconn:{})".format(self.isconn))
-            self.connect(timeout=timeout, retry=retry)
-
-        # @ Run command
-        try:
-            out = self.__run_command(cmd, stream=stream)
-        except Exception as e:
-            self.dbg_print(f"[ERR] send_cmd error: {e}")
-            self.dbg_print("Auto deinit connection")
-            self.close()
-            out = None
+        traced_cmd = "[password]" if self.password is not None and cmd == self.password else cmd.strip()[:40]
+        with trace_span("micros.send_cmd", device=self.hostname or self.host, cmd=traced_cmd):
+            # [SINGLE COMMAND CMD] Automatic connection handling - for single sessions
+            if not self.isconn:
+                self.dbg_print("Auto init connection (isconn:{})".format(self.isconn))
+                self.connect(timeout=timeout, retry=retry)
+
+            # @ Run command
+            try:
+                out = self.__run_command(cmd, stream=stream)
+            except Exception as e:
+                self.dbg_print(f"[ERR] send_cmd error: {e}")
+                self.dbg_print("Auto deinit connection")
+                self.close()
+                out = None
 
         # Collect communication metrics
         delta_time = (time.time() - start_time)
@@ -274,6 +348,28 @@ class micrOSClient:
         # return output list or None
         return out
 
+    def send_cmd_lines(self, cmd, timeout=3, retry=5, read_timeout=20):
+        """
+        Streaming send_cmd: yield reply lines as they arrive (large replies, progress output)
+        - errors are raised, the connection is closed if the reply is not consumed completely
+        """
+        if len(cmd.strip()) == 0:
+            return
+        if not self.isconn:
+            self.connect(timeout=timeout, retry=retry)
+        if not self.__prompt_matches():
+            return
+        completed = False
+        try:
+            self.conn.send(str.encode(cmd))
+            if not select.select([self.conn], [], [], read_timeout)[0]:
+                raise TimeoutError(f"No reply in {read_timeout} sec: {cmd}")
+            yield from self.__reply_lines()
+            completed = True
+        finally:
+            if not completed:
+                self.close()
+
     def send_cmd_retry(self, cmd, timeout=6, retry=5, stream=False):
         out = None
         for cnt in range(0, retry):
@@ -415,7 +511,83 @@ def micros_connection_metrics(address):
     return high_level_verdict, delta_t_single_session, delta_t_multi_session
 
 
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _legacy_receive(conn, prompt):
+    """
+    Previous receiver loop (buffer concatenation, full re-split per 4 KB chunk) - benchmark baseline
+    """
+    data_buffer = ""
+    while True:
+        data_buffer += conn.recv(4096).decode('utf-8')
+        last_line = data_buffer.strip().split("\n")[-1]
+        if "Bye!" in last_line or prompt in last_line:
+            break
+    data_buffer = data_buffer.replace(prompt, '').rstrip()
+    return [k for k in data_buffer.split('\n') if k != '']
+
+
+def _benchmark_receive(sizes_mb=(0.5, 1, 2, 4, 8), legacy_max_mb=2):
+    """
+    Large reply throughput on the local micrOS simulator: legacy receiver vs linear receiver (sync, async)
+    - UTF-8 check: multi-byte characters across chunk boundaries
+    """
+    import asyncio
+    try:
+        from ._micrOS_simulator import MicrOSSimulator
+        from ._micrOSAsyncClient import micrOSAsyncClient
+    except ImportError:
+        from _micrOS_simulator import MicrOSSimulator
+        from _micrOSAsyncClient import micrOSAsyncClient
+    line = "{:08d} sensor=temperature value=21.5 unit=C status=ok"
+    payloads = {f"dump {size}": [line.format(i) for i in range(int(size * 1024 * 1024 / (len(line) + 1)))]
+                for size in sizes_mb}
+    payloads["dump utf8"] = [f"{i:06d} hőmérséklet 21.5 °C ✓ páratartalom 40 %" for i in range(20000)]
+
+    async def async_receive(address, command):
+        async with micrOSAsyncClient(*address) as async_client:
+            return await async_client.send_cmd(command)
+
+    with MicrOSSimulator(devices=["bench"], replies=payloads) as sim:
+        client = micrOSClient(*sim.address("bench"))
+        client.connect(timeout=3)
+        for size in sizes_mb:
+            command, expected = f"dump {size}", payloads[f"dump {size}"]
+            results = []
+            if size <= legacy_max_mb:
+                start = time.perf_counter()
+                client.conn.send(command.encode())
+                ok = _legacy_receive(client.conn, client.prompt) == expected
+                results.append(f"legacy {time.perf_counter() - start:.2f}s ({'ok' if ok else 'MISMATCH'})")
+            start = time.perf_counter()
+            ok = client.send_cmd(command) == expected
+            duration = time.perf_counter() - start
+            results.append(f"linear {duration:.2f}s, {size / duration:.0f} MB/s ({'ok' if ok else 'MISMATCH'})")
+            start = time.perf_counter()
+            ok = asyncio.run(async_receive(sim.address("bench"), command)) == expected
+            results.append(f"async {time.perf_counter() - start:.2f}s ({'ok' if ok else 'MISMATCH'})")
+            print(f"{size} MB reply: " + ", ".join(results))
+        # Multi-byte UTF-8 characters split by chunk boundaries
+        client.conn.send(b"dump utf8")
+        try:
+            legacy = "ok" if _legacy_receive(client.conn, client.prompt) == payloads["dump utf8"] else "MISMATCH"
+        except UnicodeDecodeError as e:
+            legacy = f"UnicodeDecodeError ({e.reason})"
+        client.close()
+        linear = "ok" if client.send_cmd("dump utf8") == payloads["dump utf8"] else "MISMATCH"
+        lines = sum(1 for _ in client.send_cmd_lines("dump utf8"))
+        print(f"UTF-8 reply: legacy {legacy}, linear {linear}, send_cmd_lines: {lines} lines")
+        client.close()
+
+
 if __name__ == "__main__":
+    import sys
+    if "--benchmark" in sys.argv:
+        _benchmark_receive()
+        sys.exit(0)
+
     force_close = True
 
     address = 'TinyDevBoard.local'
@@ -0,0 +1,200 @@
+"""
+micrOS load test and latency benchmark
+- concurrent workers send a weighted command mix for a duration
+- modes: reconnect (new session per command) vs persistent (one session per worker)
+- p50 / p95 / p99 latency, busy server rejection rate, error rate, throughput
+- JSON result lines appended to a history file (tracking over time)
+- runs against the local micrOS simulator (default) or a real device
+Usage:
+    python _micrOS_bench.py --concurrency 8 --duration 5 --mix hello=3,modules=1 --delay 0.01 --max-connections 3
+    python _micrOS_bench.py --host node01.local --password ADmin123
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from pathlib import Path
+
+try:
+    from ._micrOSAsyncClient import micrOSAsyncClient
+    from ._micrOS_simulator import MicrOSSimulator
+except ImportError:
+    from _micrOSAsyncClient import micrOSAsyncClient
+    from _micrOS_simulator import MicrOSSimulator
+
+RESULTS_FILE = Path(__file__).parent.parent.parent.parent / "configuration" / "micros_bench_results.jsonl"
+MODES = ("reconnect", "persistent")
+DEFAULT_MIX = "hello=3,version=1,modules=1"
+
+
+def percentile(values: list, p: float) -> float | None:
+    """
+    Nearest-rank percentile of sorted values
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(math.ceil(p / 100 * len(values)) - 1, 0))]
+
+
+def parse_mix(mix: str) -> dict:
+    """
+    "hello=3,modules=1" -> {"hello": 3.0, "modules": 1.0} (command weights)
+    """
+    weights = {}
+    for item in mix.split(","):
+        command, _, weight = item.strip().rpartition("=") if "=" in item else (item.strip(), "", "1")
+        if command:
+            weights[command] = float(weight)
+    return weights
+
+
+def _latency_summary(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    return {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95), "p99": percentile(latencies, 99),
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            "max": latencies[-1] if latencies else None}
+
+
+class _Stats:
+
+    def __init__(self):
+        self.latencies: dict = {}       # {command: [ms, ...]}
+        self.busy = 0
+        self.errors = 0
+        self.error_samples: dict = {}   # {error: count}
+
+    def ok(self, command, latency_ms):
+        self.latencies.setdefault(command, []).append(round(latency_ms, 2))
+
+    def error(self, error: str, busy=False):
+        if busy:
+            self.busy += 1
+            return
+        self.errors += 1
+        self.error_samples[error] = self.error_samples.get(error, 0) + 1
+
+
+async def _worker(mode, host, port, password, weights, deadline, timeout, stats, rng):
+    commands, cum_weights = list(weights), list(weights.values())
+    client = None
+    while time.perf_counter() < deadline:
+        command = rng.choices(commands, weights=cum_weights)[0]
+        if client is None:
+            client = micrOSAsyncClient(host, port, pwd=password)
+        start = time.perf_counter()
+        try:
+            reply = await client.send_cmd(command, timeout=timeout, retry=1)
+        except Exception as e:
+            stats.error(str(e)[:80], busy="busy" in str(e).lower())
+            client.close()
+            client = None
+            await asyncio.sleep(0.01)
+            continue
+        if isinstance(reply, list):
+            stats.ok(command, (time.perf_counter() - start) * 1000)
+        else:
+            stats.error("no reply" if reply == "" else "session lost")
+            client.close()
+            client = None
+        if mode == "reconnect" and client is not None:
+            client.close()
+            client = None
+    if client is not None:
+        client.close()
+
+
+async def run_load(host, port, password=None, mode="persistent", concurrency=8, duration=5.0, mix=DEFAULT_MIX,
+                   timeout=3, seed=None) -> dict:
+    """
+    One load test run, mode: reconnect (session per command) / persistent (session per worker)
+    """
+    weights = parse_mix(mix) if isinstance(mix, str) else mix
+    stats = _Stats()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_worker(mode, host, port, password, weights, deadline, timeout, stats,
+                                   random.Random(rng.random())) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    all_latencies = [ms for values in stats.latencies.values() for ms in values]
+    attempts = len(all_latencies) + stats.busy + stats.errors
+    return {"mode": mode, "concurrency": concurrency, "duration_s": round(elapsed, 2), "commands": attempts,
+            "ok": len(all_latencies), "busy": stats.busy, "errors": stats.errors,
+            "busy_rate": round(stats.busy / attempts, 4) if attempts else None,
+            "error_rate": round(stats.errors / attempts, 4) if attempts else None,
+            "throughput_per_s": round(len(all_latencies) / elapsed, 1),
+            "latency_ms": _latency_summary(all_latencies),
+            "per_command": {command: {"count": len(values), **_latency_summary(values)}
+                            for command, values in stats.latencies.items()},
+            "error_samples": stats.error_samples}
+
+
+def benchmark(host=None, port=9008, password=None, modes=MODES, concurrency=8, duration=5.0, mix=DEFAULT_MIX,
+              timeout=3, delay=0.01, max_connections=3, seed=None) -> dict:
+    """
+    Run every mode against a device (host) or the local simulator (host=None)
+    """
+    simulator = None
+    if host is None:
+        simulator = MicrOSSimulator(devices=["benchnode"], password=password, delay=delay,
+                                    max_connections=max_connections).start()
+        host, port = simulator.address("benchnode")
+    try:
+        results = {mode: asyncio.run(run_load(host, port, password, mode, concurrency, duration, mix, timeout, seed))
+                   for mode in modes}
+    finally:
+        if simulator is not None:
+            simulator.stop()
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "target": "simulator" if simulator is not None else f"{host}:{port}",
+            "config": {"concurrency": concurrency, "duration_s": duration, "mix": parse_mix(mix), "timeout": timeout,
+                       **({"delay_s": delay, "max_connections": max_connections} if simulator is not None else {})},
+            "results": results}
+
+
+def save_result(result: dict, path=RESULTS_FILE) -> None:
+    """
+    Append one JSON line per run (history for tracking over time)
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+
+def print_result(result: dict) -> None:
+    print(f"[{result['timestamp']}] target: {result['target']} config: {result['config']}")
+    for mode, run in result["results"].items():
+        latency = run["latency_ms"]
+        print(f"\t{mode:>10}: {run['throughput_per_s']:>7} cmd/s  p50 {latency['p50']} ms  p95 {latency['p95']} ms  "
+              f"p99 {latency['p99']} ms  busy {run['busy_rate']:.1%}  errors {run['error_rate']:.1%}  "
+              f"({run['ok']}/{run['commands']} ok)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="micrOS load test and latency benchmark")
+    parser.add_argument("--host", default=None, help="Device host / IP (default: local simulator)")
+    parser.add_argument("--port", type=int, default=9008)
+    parser.add_argument("--password", default=None, help="Device password (simulator: enables auth)")
+    parser.add_argument("--modes", default=",".join(MODES), help="reconnect,persistent")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted command mix: cmd=weight,...")
+    parser.add_argument("--timeout", type=float, default=3)
+    parser.add_argument("--delay", type=float, default=0.01, help="Simulator reply delay (seconds)")
+    parser.add_argument("--max-connections", type=int, default=3, help="Simulator parallel session limit")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=str(RESULTS_FILE), help="JSON lines result history file")
+    args = parser.parse_args(argv)
+    result = benchmark(host=args.host, port=args.port, password=args.password, modes=args.modes.split(","),
+                       concurrency=args.concurrency, duration=args.duration, mix=args.mix, timeout=args.timeout,
+                       delay=args.delay, max_connections=args.max_connections, seed=args.seed)
+    print_result(result)
+    save_result(result, args.output)
+    print(f"Result appended to {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,52 @@
 import ast
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from pprint import pprint
 
 try:
-    from ._micrOSClient import micrOSClient
+    from ._micrOS_pool import run_command, run_commands, run_bulk
 except ImportError:
-    from _micrOSClient import micrOSClient
+    from _micrOS_pool import run_command, run_commands, run_bulk
 
-DEVICE_CLIS = {}
 TOOL_CONFIG = Path(__file__).parent.parent.parent.parent / "configuration" / "micros_tools_devices.json"
 CONN_CACHE = Path(__file__).parent.parent.parent.parent / "configuration" / "micros_tool_inputs" / "device_conn_cache.json"
 FUNC_DOC_CACHE  = Path(__file__).parent.parent.parent.parent / "configuration" / "micros_tool_inputs" / "sfuncman.json"
+DISCOVERY_WORKERS = 8           # devices discovered in parallel
+DISCOVERY_DEADLINE = 120        # seconds, unfinished devices keep their previous features
 
-def _feature_discovery(device: str) -> (list, list):
+
+def _parse_modules(response: dict) -> list | None:
+    if response["status"] != "success":
+        print(f"_feature_discovery error: {response}")
+        return None
+    loaded_modules = response["response"][0]
+    try:
+        print(f"Raw modules response data: {loaded_modules} {type(loaded_modules)}")
+        loaded_modules = ast.literal_eval(loaded_modules)
+        print(f"Parsed modules response data: {loaded_modules} {type(loaded_modules)}")
+    except Exception as e:
+        print(f"_feature_discovery error: {e}")
+        return None
+    return loaded_modules
+
+
+def _device_fingerprint(device: str) -> (str | None, list):
+    """
+    Hash of the micrOS version and the loaded modules: unchanged devices skip the feature discovery
+    :return: fingerprint (None: device unreachable), loaded modules
+    """
+    version, modules = run_commands(device, ["version", "modules"], timeout=3)
+    loaded_modules = _parse_modules(modules)
+    if version["status"] != "success" or loaded_modules is None:
+        return None, []
+    fingerprint = hashlib.sha256(json.dumps([version["response"], sorted(loaded_modules)]).encode()).hexdigest()
+    return fingerprint[:16], loaded_modules
+
+
+def _feature_discovery(device: str, loaded_modules: list | None = None) -> (list, list):
     """
     GENERIC MICROS FEATURE DISCOVER
 
@@ -27,27 +60,17 @@ def _feature_discovery(device: str) -> (list, list):
         {"lm_call": "random smooth=True max_val=1000", "type": "button", "options": ["None"]},
     """
 
-    # Fetch loaded modules from the device
-    loaded_modules = []
+    # Fetch loaded modules from the device (if not known yet)
     features_call_table = []
     feature_list = set()
-    response = run_command_on_device(device=device, command="modules")
-    if response["status"] == "success":
-        loaded_modules = response["response"][0]
-        try:
-            print(f"Raw modules response data: {loaded_modules} {type(loaded_modules)}")
-            loaded_modules = ast.literal_eval(loaded_modules)
-            print(f"Parsed modules response data: {loaded_modules} {type(loaded_modules)}")
-        except Exception as e:
-            print(f"_feature_discovery error: {e}")
+    if loaded_modules is None:
+        loaded_modules = _parse_modules(run_command_on_device(device=device, command="modules"))
+        if loaded_modules is None:
             return [], []
-    else:
-        print(f"_feature_discovery error: {response}")
 
-    # Iterate through each module and its functions to discover features
-    for module in loaded_modules:
-        functions_cmd = f"{module} help widgets=True"
-        response = run_command_on_device(device=device, command=functions_cmd)
+    # Module help queries back-to-back on the device session
+    responses = run_commands(device, [f"{module} help widgets=True" for module in loaded_modules], timeout=3)
+    for module, response in zip(loaded_modules, responses):
         if response["status"] == "success":
             widgets = response["response"]
             for raw_widget in widgets:
@@ -88,19 +111,19 @@ def run_command_on_device(device: str, command: str) -> dict:
     Returns:
         dict: Response from the device, structure: {"status": "success"|"error", "response": <response>}
     """
+    # Pooled persistent session per device (locking, liveness probe, reconnect with backoff)
+    return run_command(device, command, timeout=3)
 
-    com_obj = DEVICE_CLIS.get(device, None)
-    if com_obj is None:
-        try:
-            com_obj = micrOSClient(host=device, port=9008, pwd="ADmin123", dbg=False)
-            DEVICE_CLIS[device] = com_obj
-        except Exception as e:
-            return {"status": "error", "response": [str(e)], "device": device}
-    try:
-        response = com_obj.send_cmd(command, timeout=3, retry=5, stream=False)
-    except Exception as e:
-        response = [str(e)]
-    return {"status": "success", "response": response, "device": device}
+
+def run_commands_on_devices(commands: list[tuple[str, str]]) -> list[dict]:
+    """
+    Args:
+        commands (list): (device, command) pairs
+    Returns:
+        list: per command responses in input order, structure: {"status", "response", "device", "command", "elapsed_ms"}
+    """
+    # Grouped by device: back-to-back on each device session, devices in parallel
+    return run_bulk(commands, timeout=3)
 
 
 def _load_devtoolkit_conn_cache() -> list:
@@ -130,15 +153,20 @@ def _load_devtoolkit_conn_cache() -> list:
     print(f"{CONN_CACHE}\n\tDevices: {devices}")
     return devices
 
-def _inject_sfuncman_doc(config) -> dict:
-    """
-    Preload the sfuncman cache
-    """
+def _load_sfuncman_doc() -> dict:
     try:
         with open(FUNC_DOC_CACHE, "r") as f:
-            func_doc_cache = json.load(f)
+            return json.load(f)
     except FileNotFoundError:
-        func_doc_cache = {}
+        return {}
+
+
+def _inject_sfuncman_doc(config, func_doc_cache=None) -> dict:
+    """
+    Preload the sfuncman cache
+    """
+    if func_doc_cache is None:
+        func_doc_cache = _load_sfuncman_doc()
 
     for index, dev_config in enumerate(config):
         feature_calls =  dev_config["metadata"]["feature_calls"]
@@ -191,6 +219,37 @@ def load_device_config() -> list[dict]:
     return default_config
 
 
+def _save_device_config(config: list[dict]) -> None:
+    """
+    Atomic write: an interrupted discovery never leaves a truncated config
+    """
+    tmp_file = f"{TOOL_CONFIG}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(config, f, indent=4)
+    os.replace(tmp_file, TOOL_CONFIG)
+
+
+def _discover_device(device_config: dict, func_doc_cache: dict) -> dict | None:
+    """
+    Feature discovery of one device
+    :return: updated device config, unchanged config (same fingerprint), None (unreachable)
+    """
+    device_name = device_config["device_name"]
+    fingerprint, loaded_modules = _device_fingerprint(device_name)
+    if fingerprint is None:
+        return None
+    metadata = device_config["metadata"]
+    if metadata.get("fingerprint") == fingerprint and metadata.get("feature_calls"):
+        print(f"[discovery] {device_name}: version and modules unchanged, skip")
+        return device_config
+    features_details, features = _feature_discovery(device_name, loaded_modules)
+    updated = {"device_name": device_name, "metadata": {**metadata, "features": features,
+                                                         "feature_calls": features_details,
+                                                         "fingerprint": fingerprint}}
+    # Inject doc string
+    return _inject_sfuncman_doc([updated], func_doc_cache)[0]
+
+
 def auto_feature_discovery(update_config=False) -> list[dict]:
     # Load tool cache
     config = load_device_config()
@@ -202,18 +261,31 @@ def auto_feature_discovery(update_config=False) -> list[dict]:
             config.append(_create_device_config(name=dev))
     pprint(config)
 
-    # Feature discovery
-    for index, device in enumerate(config):
-        device_name = device["device_name"]
-        features_details, features = _feature_discovery(device_name)
-        config[index]["metadata"]["features"] = features
-        config[index]["metadata"]["feature_calls"] = features_details
-    # Inject doc string
-    config = _inject_sfuncman_doc(config)
-    # Save changes if needed
-    if update_config:
-        with open(TOOL_CONFIG, "w") as f:
-            json.dump(config, f, indent=4)
+    # Feature discovery: devices in parallel, config saved per finished device
+    func_doc_cache = _load_sfuncman_doc()
+    executor = ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS, thread_name_prefix="micros-discovery")
+    futures = {executor.submit(_discover_device, device, func_doc_cache): index for index, device in enumerate(config)}
+    try:
+        for future in as_completed(futures, timeout=DISCOVERY_DEADLINE):
+            index = futures[future]
+            try:
+                device_config = future.result()
+            except Exception as e:
+                device_config = None
+                print(f"[discovery] {config[index]['device_name']} error: {e}")
+            if device_config is None:
+                print(f"[discovery] {config[index]['device_name']}: unreachable, keep previous features")
+                continue
+            if device_config is not config[index]:
+                config[index] = device_config
+                # Save changes if needed
+                if update_config:
+                    _save_device_config(config)
+    except TimeoutError:
+        unfinished = [config[i]["device_name"] for f, i in futures.items() if not f.done()]
+        print(f"[discovery] deadline {DISCOVERY_DEADLINE}s, keep previous features: {unfinished}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     return config
 
 
@@ -225,5 +297,51 @@ def _test():
         pprint(tc)
 
 
+def _benchmark_discovery(devices=12, modules=8, delay=0.02):
+    """
+    Discovery on the local micrOS simulator: serial vs parallel, unchanged fleet (fingerprint skip)
+    """
+    import contextlib
+    import io
+    import tempfile
+    import time
+    try:
+        from ._micrOS_simulator import MicrOSSimulator
+        from . import _micrOS_pool
+    except ImportError:
+        from _micrOS_simulator import MicrOSSimulator
+        import _micrOS_pool
+    global TOOL_CONFIG, CONN_CACHE, DISCOVERY_WORKERS
+    original = TOOL_CONFIG, CONN_CACHE, DISCOVERY_WORKERS
+    names = [f"node{i:02d}" for i in range(devices)]
+    lm_widgets = [{"lm_call": "brightness percent=:range:", "type": "slider", "range": [0, 100, 2]},
+                  {"lm_call": "toggle state=:options:", "type": "button", "options": ["True", "False"]}]
+    with MicrOSSimulator(devices=names, modules={f"lm{i}": lm_widgets for i in range(modules)}, delay=delay) as sim, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        TOOL_CONFIG, CONN_CACHE = Path(tmp_dir) / "devices.json", Path(tmp_dir) / "missing_conn_cache.json"
+        for name in names:
+            _micrOS_pool.register(f"{name}.local", *sim.address(name), password=None)
+        try:
+            runs = [("serial (1 worker)", 1, True), ("parallel", 8, True), ("parallel, unchanged fleet", 8, False)]
+            for name, workers, reset in runs:
+                if reset:
+                    _save_device_config([_create_device_config(name=f"{n}.local", location="lab") for n in names])
+                DISCOVERY_WORKERS = workers
+                commands = sim.stats["commands"]
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    config = auto_feature_discovery(update_config=True)
+                features = sum(len(c["metadata"]["feature_calls"]) for c in config)
+                print(f"{name}: {time.perf_counter() - start:.2f}s, {sim.stats['commands'] - commands} commands, "
+                      f"{features} feature calls ({devices} devices x {modules} modules, {delay * 1000:.0f} ms/reply)")
+        finally:
+            TOOL_CONFIG, CONN_CACHE, DISCOVERY_WORKERS = original
+            _micrOS_pool.close_all()
+
+
 if __name__ == "__main__":
-    _test()
\ No newline at end of file
+    import sys
+    if "--benchmark" in sys.argv:
+        _benchmark_discovery()
+    else:
+        _test()
\ No newline at end of file
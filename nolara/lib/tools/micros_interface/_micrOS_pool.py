@@ -0,0 +1,384 @@
+"""
+micrOS connection pool: one persistent shell session per device
+- per device lock: one command at a time on a session (the micrOS shell is sequential)
+- liveness: closed sockets are detected before reuse, idle sessions are probed with hello
+- reconnect with exponential backoff, unreachable devices fail fast until the backoff expires
+- idle eviction: micrOS serves only a few parallel sessions, unused ones are closed by a daemon thread
+- honest status: {"status": "success"|"error", "response": [lines], "device": device}
+"""
+import contextvars
+import select
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from ._micrOSClient import micrOSClient
+except ImportError:
+    from _micrOSClient import micrOSClient
+
+DEFAULT_PORT = 9008
+DEFAULT_PASSWORD = "ADmin123"
+CONNECT_TIMEOUT = 3
+KEEPALIVE_INTERVAL = 10         # seconds idle before a hello probe on reuse
+IDLE_TIMEOUT = 30               # seconds idle before the session is closed
+RETRIES = 3                     # connect attempts per command
+BACKOFF_BASE = 0.3              # seconds, doubled per attempt
+BACKOFF_MAX = 30                # seconds, fail fast window cap of unreachable devices
+BULK_WORKERS = 8                # devices served in parallel by run_bulk
+ADDRESSES: dict = {}            # {device: (host, port, password)} overrides (default: device name is the host)
+_CONNECTIONS: dict = {}         # {device: DeviceConnection}
+_CONNECTIONS_LOCK = threading.Lock()
+_EVICTOR: threading.Thread | None = None
+
+
+class DeviceConnection:
+    """
+    Thread safe persistent session of one micrOS device
+    """
+
+    def __init__(self, device: str, host: str, port: int = DEFAULT_PORT, password: str | None = DEFAULT_PASSWORD):
+        self.device = device
+        self.host = host
+        self.port = port
+        self.password = password
+        self.lock = threading.Lock()
+        self.client: micrOSClient | None = None
+        self.last_used = 0.0
+        self.failures = 0               # consecutive unreachable calls (backoff exponent)
+        self.retry_at = 0.0             # unreachable: fail fast until
+        self.stats = {"commands": 0, "errors": 0, "connects": 0, "reconnects": 0, "probes": 0, "evictions": 0}
+
+    @property
+    def connected(self) -> bool:
+        return self.client is not None and self.client.isconn
+
+    def _result(self, status: str, response: list) -> dict:
+        if status == "error":
+            self.stats["errors"] += 1
+        return {"status": status, "response": response, "device": self.device}
+
+    def _connect(self, timeout: float):
+        client = micrOSClient(host=self.host, port=self.port, pwd=self.password, dbg=False)
+        if self.host != self.device:
+            client.hostname = self.device       # Address override: validate the prompt against the device name
+        try:
+            client.connect(timeout=timeout, retry=2)
+        except Exception:
+            client.close()
+            raise
+        self.client = client
+        self.stats["connects"] += 1
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    def _alive(self) -> bool:
+        """
+        Liveness of the open session
+        - readable idle socket: closed by the device (or out of sync), no round trip needed
+        - idle longer than KEEPALIVE_INTERVAL: hello probe
+        """
+        try:
+            if select.select([self.client.conn], [], [], 0)[0]:
+                return False
+        except (OSError, ValueError):
+            return False
+        if time.time() - self.last_used < KEEPALIVE_INTERVAL:
+            return True
+        self.stats["probes"] += 1
+        reply = self.client.send_cmd("hello", timeout=CONNECT_TIMEOUT)
+        return isinstance(reply, list) and len(reply) > 0 and reply[0].startswith("hello")
+
+    def _session(self, timeout: float) -> bool:
+        """
+        Open or reuse the session, return reused state
+        """
+        if self.connected:
+            if self._alive():
+                return True
+            self.stats["reconnects"] += 1
+            self.close()
+        self._connect(timeout)
+        return False
+
+    def run(self, command: str, timeout: float = CONNECT_TIMEOUT) -> dict:
+        """
+        Run a shell command on the device session
+        - connect failures: retried with exponential backoff
+        - reused session lost before the command was sent: retried on a new session
+        - command failure after it was sent: error, not resent (the device may have executed it)
+        """
+        with self.lock:
+            return self._run(command, timeout)
+
+    def run_many(self, commands: list[str], timeout: float = CONNECT_TIMEOUT) -> list[dict]:
+        """
+        Run commands back-to-back on the session, the lock is held for the whole batch
+        - the micrOS shell has no message framing: commands are not pipelined, each waits for its prompt
+        - results with command and elapsed_ms
+        """
+        results = []
+        with self.lock:
+            for command in commands:
+                start = time.perf_counter()
+                result = self._run(command, timeout)
+                results.append({**result, "command": command,
+                                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)})
+        return results
+
+    def _run(self, command: str, timeout: float) -> dict:
+        self.stats["commands"] += 1
+        if not command or not command.strip():
+            return self._result("error", ["Empty command"])       # send_cmd skips it: no reply on the session
+        now = time.time()
+        if now < self.retry_at:
+            return self._result("error", [f"Device unreachable, next connection attempt in "
+                                          f"{self.retry_at - now:.1f}s"])
+        error = None
+        for attempt in range(RETRIES):
+            if attempt > 0:
+                time.sleep(min(BACKOFF_BASE * 2 ** (attempt - 1), BACKOFF_MAX))
+            try:
+                reused = self._session(timeout)
+            except Exception as e:
+                error = f"Connection failed: {e}"
+                self.close()
+                continue
+            self.failures, self.retry_at = 0, 0.0
+            client, prompt = self.client, self.client.prompt
+            reply = client.send_cmd(command, timeout=timeout)
+            self.last_used = time.time()
+            if isinstance(reply, list):
+                if reply and "Bye!" in reply[-1]:
+                    self.close()            # exit: the device closed the session
+                return self._result("success", reply)
+            if reply == "Bye!":
+                self.close()                # reboot: no reply, the device drops the session
+                return self._result("success", [reply])
+            if reply is None and self.connected:
+                self.close()
+                return self._result("error", [f"Prompt mismatch: {self.device} replied as {prompt}"])
+            self.close()
+            if reply is None and reused and not client.cmd_sent:
+                self.stats["reconnects"] += 1
+                error = "Session lost"
+                continue
+            return self._result("error", ["No reply from device (timeout)" if reply == "" else
+                                          "Connection lost during the command"])
+        # Unreachable: next calls fail fast until the backoff expires
+        self.failures += 1
+        self.retry_at = time.time() + min(2 ** (self.failures - 1), BACKOFF_MAX)
+        return self._result("error", [error])
+
+    def evict_if_idle(self, idle_timeout: float) -> bool:
+        """
+        Close the session if unused for idle_timeout (skipped while a command runs)
+        """
+        if not self.lock.acquire(blocking=False):
+            return False
+        try:
+            if self.connected and time.time() - self.last_used > idle_timeout:
+                self.close()
+                self.stats["evictions"] += 1
+                return True
+            return False
+        finally:
+            self.lock.release()
+
+
+def _evictor_loop():
+    while True:
+        time.sleep(min(max(IDLE_TIMEOUT / 4, 0.05), 1))
+        with _CONNECTIONS_LOCK:
+            connections = list(_CONNECTIONS.values())
+        for conn in connections:
+            conn.evict_if_idle(IDLE_TIMEOUT)
+
+
+def register(device: str, host: str, port: int = DEFAULT_PORT, password: str | None = DEFAULT_PASSWORD):
+    """
+    Address override of a device (e.g. simulator, static IP), drops its current session
+    """
+    ADDRESSES[device] = (host, port, password)
+    with _CONNECTIONS_LOCK:
+        conn = _CONNECTIONS.pop(device, None)
+    if conn is not None:
+        with conn.lock:
+            conn.close()
+
+
+def connection(device: str) -> DeviceConnection:
+    global _EVICTOR
+    with _CONNECTIONS_LOCK:
+        conn = _CONNECTIONS.get(device)
+        if conn is None:
+            host, port, password = ADDRESSES.get(device, (device, DEFAULT_PORT, DEFAULT_PASSWORD))
+            conn = _CONNECTIONS[device] = DeviceConnection(device, host, port, password)
+        if _EVICTOR is None:
+            _EVICTOR = threading.Thread(target=_evictor_loop, name="micros-pool-evictor", daemon=True)
+            _EVICTOR.start()
+    return conn
+
+
+def run_command(device: str, command: str, timeout: float = CONNECT_TIMEOUT) -> dict:
+    return connection(device).run(command, timeout=timeout)
+
+
+def run_commands(device: str, commands: list[str], timeout: float = CONNECT_TIMEOUT) -> list[dict]:
+    return connection(device).run_many(commands, timeout=timeout)
+
+
+def run_bulk(commands: list[tuple[str, str]], timeout: float = CONNECT_TIMEOUT) -> list[dict]:
+    """
+    (device, command) pairs: grouped by device, back-to-back on each device session, devices in parallel
+    :return: per command results in input order (with command and elapsed_ms)
+    """
+    by_device: dict = {}
+    for index, (device, command) in enumerate(commands):
+        by_device.setdefault(device, []).append((index, command))
+    results: list = [None] * len(commands)
+
+    def _device_batch(device, batch):
+        for (index, _), result in zip(batch, run_commands(device, [c for _, c in batch], timeout=timeout)):
+            results[index] = result
+
+    if by_device:
+        with ThreadPoolExecutor(max_workers=min(BULK_WORKERS, len(by_device)), thread_name_prefix="micros-bulk") as executor:
+            # Caller context per device batch: tracing spans of the workers nest under the calling tool
+            for future in [executor.submit(contextvars.copy_context().run, _device_batch, device, batch)
+                           for device, batch in by_device.items()]:
+                future.result()
+    return results
+
+
+def close_all():
+    with _CONNECTIONS_LOCK:
+        connections = list(_CONNECTIONS.values())
+    for conn in connections:
+        with conn.lock:
+            conn.close()
+
+
+def stats() -> dict:
+    with _CONNECTIONS_LOCK:
+        connections = list(_CONNECTIONS.values())
+    return {c.device: {"connected": c.connected, "failures": c.failures, **c.stats} for c in connections}
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _test():
+    """
+    Pool against the local micrOS simulator: reuse, concurrency, stale session, auth, unreachable device, eviction
+    """
+    import socket
+    from concurrent.futures import ThreadPoolExecutor
+    try:
+        from ._micrOS_simulator import MicrOSSimulator
+    except ImportError:
+        from _micrOS_simulator import MicrOSSimulator
+    global IDLE_TIMEOUT
+
+    def check(name, condition, details=""):
+        print(f"[{'OK' if condition else 'FAIL'}] {name} {details}")
+        assert condition, name
+
+    with MicrOSSimulator(devices=["kitchen", "bedroom"], password="ADmin123", max_connections=2) as sim:
+        for device in sim.devices:
+            register(f"{device}.local", *sim.address(device), password="ADmin123")
+
+        result = run_command("kitchen.local", "hello")
+        check("hello", result["status"] == "success" and result["response"][0].startswith("hello:kitchen"), result)
+        run_command("kitchen.local", "version")
+        check("session reuse", sim.stats["connections"] == 1, stats()["kitchen.local"])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: run_command("kitchen.local", f"rgb brightness {i}"), range(40)))
+        check("concurrent commands (one session)",
+              all(r["status"] == "success" and f"brightness {i}" in r["response"][0] for i, r in enumerate(results))
+              and sim.stats["connections"] == 1 and sim.stats["rejected"] == 0)
+
+        sim.drop("kitchen")
+        time.sleep(0.05)
+        result = run_command("kitchen.local", "hello")
+        check("stale session: reconnect", result["status"] == "success" and stats()["kitchen.local"]["reconnects"] == 1,
+              stats()["kitchen.local"])
+
+        result = run_command("kitchen.local", "  ")
+        check("empty command: error, session kept", result["response"] == ["Empty command"]
+              and connection("kitchen.local").connected, result)
+
+        sim.delay = 0.3
+        connections = sim.stats["connections"]
+        threading.Timer(0.1, sim.drop, args=("kitchen",)).start()
+        result = run_command("kitchen.local", "rgb toggle")
+        sim.delay = 0.0
+        check("session lost after send: not resent", result["status"] == "error" and
+              sim.stats["connections"] == connections, result)
+
+        register("bedroom.local", *sim.address("bedroom"), password="wrong")
+        result = run_command("bedroom.local", "hello")
+        check("auth failure: error status", result["status"] == "error", result)
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            closed_port = s.getsockname()[1]
+        register("offline.local", "127.0.0.1", closed_port)
+        start = time.perf_counter()
+        result = run_command("offline.local", "hello")
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = run_command("offline.local", "hello")
+        check("unreachable: error after backoff", result["status"] == "error", f"{first:.2f}s {result['response']}")
+        check("unreachable: fail fast", fast["status"] == "error" and time.perf_counter() - start < 0.01,
+              fast["response"])
+
+        IDLE_TIMEOUT = 0.2
+        time.sleep(1.5)
+        check("idle eviction", not connection("kitchen.local").connected and len(sim.sessions["kitchen"]) == 0,
+              stats()["kitchen.local"])
+        result = run_command("kitchen.local", "modules")
+        check("reconnect after eviction", result["status"] == "success", result)
+        close_all()
+
+
+def _benchmark_bulk(devices=10, commands_per_device=3, delay=0.02):
+    """
+    "Turn off every light" scene on the simulator: one call per command (serial tool steps) vs run_bulk
+    """
+    try:
+        from ._micrOS_simulator import MicrOSSimulator
+    except ImportError:
+        from _micrOS_simulator import MicrOSSimulator
+    names = [f"light{i:02d}" for i in range(devices)]
+    scene = [(f"{name}.local", command) for name in names
+             for command in ["rgb toggle state=False", "rgb brightness percent=0", "system info"][:commands_per_device]]
+    with MicrOSSimulator(devices=names, password="ADmin123", delay=delay) as sim:
+        for name in names:
+            register(f"{name}.local", *sim.address(name))
+        start = time.perf_counter()
+        results = [run_command(device, command) for device, command in scene]
+        serial = time.perf_counter() - start
+        ok = sum(r["status"] == "success" for r in results)
+        print(f"one call per command: {serial:.2f}s ({ok}/{len(scene)} ok, {len(scene)} agent tool steps)")
+        close_all()
+        start = time.perf_counter()
+        results = run_bulk(scene)
+        bulk = time.perf_counter() - start
+        ok = sum(r["status"] == "success" for r in results)
+        print(f"run_bulk: {bulk:.2f}s ({ok}/{len(scene)} ok, 1 agent tool step) - {serial / bulk:.1f}x faster, "
+              f"in order: {[(r['device'], r['command']) for r in results] == scene}")
+        close_all()
+
+
+if __name__ == "__main__":
+    import sys
+    if "--benchmark" in sys.argv:
+        _benchmark_bulk()
+    else:
+        _test()
@@ -0,0 +1,162 @@
+"""
+In-memory micrOS device registry (micros_tools_devices.json)
+- loaded once, reloaded only if the file changed (mtime, size)
+- indexed by device name, location and feature
+- queries like "all devices in the kitchen with feature brightness" in one call
+"""
+import os
+import threading
+import time
+
+try:
+    from . import _micrOS_common as common
+except ImportError:
+    import _micrOS_common as common
+
+
+def _normalize(text) -> str:
+    return str(text or "").strip().lower()
+
+
+def _call_feature(feature_call: dict) -> str:
+    """
+    Feature of a feature call: "rgb brightness percent=:range:" -> "brightness"
+    """
+    parts = feature_call.get("command", "").split()
+    return _normalize(parts[1] if len(parts) > 1 else "")
+
+
+class DeviceRegistry:
+    """
+    Thread safe, stat-reloaded device config index
+    """
+
+    def __init__(self):
+        self.reloads = 0
+        self._state = None          # (mtime_ns, size) of the loaded file
+        self._index = ([], {}, {}, {})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _file_state():
+        try:
+            stat = os.stat(common.TOOL_CONFIG)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _build_index(devices: list[dict]) -> tuple:
+        by_name, by_location, by_feature = {}, {}, {}
+        for device in devices:
+            name = _normalize(device["device_name"])
+            metadata = device.get("metadata") or {}
+            by_name[name] = device
+            by_location.setdefault(_normalize(metadata.get("location")), []).append(device)
+            for feature in metadata.get("features") or []:
+                by_feature.setdefault(_normalize(feature), []).append(device)
+        for name, device in list(by_name.items()):
+            by_name.setdefault(name.split(".")[0], device)      # "kitchen" -> "kitchen.local"
+        return devices, by_name, by_location, by_feature
+
+    def refresh(self) -> tuple:
+        """
+        Reload and re-index the config if the file changed, return the current index
+        """
+        with self._lock:
+            state = self._file_state()
+            if state is None or state != self._state:
+                self._index = self._build_index(common.load_device_config())
+                self._state = state
+                self.reloads += 1
+            return self._index
+
+    def devices(self) -> list[dict]:
+        return self.refresh()[0]
+
+    def get(self, device: str) -> dict | None:
+        return self.refresh()[1].get(_normalize(device))
+
+    @staticmethod
+    def _match(index: dict, key: str) -> set:
+        """
+        Exact key, else partial match ("kitchen" -> "living room kitchen")
+        """
+        key = _normalize(key)
+        if key in index:
+            return {id(d) for d in index[key]}
+        return {id(d) for name, devices in index.items() if key in name for d in devices}
+
+    def find(self, location: str | None = None, feature: str | None = None) -> list[dict]:
+        """
+        Devices in location with feature (None / empty: any), in config order
+        """
+        devices, _, by_location, by_feature = self.refresh()
+        matches = None
+        for index, key in ((by_location, location), (by_feature, feature)):
+            if key:
+                ids = self._match(index, key)
+                matches = ids if matches is None else matches & ids
+        return [d for d in devices if matches is None or id(d) in matches]
+
+    @staticmethod
+    def feature_calls(device: dict, feature: str | None = None) -> list[dict]:
+        calls = (device.get("metadata") or {}).get("feature_calls") or []
+        if not feature:
+            return calls
+        feature = _normalize(feature)
+        return [c for c in calls if feature in _call_feature(c)]
+
+
+REGISTRY = DeviceRegistry()
+
+
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _benchmark(devices=300, features=10, calls=1000):
+    """
+    Device lookup: reload + linear scan per call (previous tools) vs registry, reload on file change
+    """
+    import json
+    import tempfile
+    from pathlib import Path
+    locations = ["kitchen", "living room", "bedroom", "garage", "garden", "office"]
+    config = [common._create_device_config(
+        name=f"node{i:03d}.local", location=locations[i % len(locations)],
+        features=[f"feature{f}" for f in range(features)] + (["brightness"] if i % 4 == 0 else []),
+        feature_calls=[{"command": f"lm{f} feature{f} value=:range:", "range": [0, 100, 1]} for f in range(features)])
+        for i in range(devices)]
+    original = common.TOOL_CONFIG
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        common.TOOL_CONFIG = Path(tmp_dir) / "devices.json"
+        try:
+            with open(common.TOOL_CONFIG, "w") as f:
+                json.dump(config, f)
+            target = f"node{devices - 1:03d}.local"
+            start = time.perf_counter()
+            for _ in range(calls):
+                next((d for d in common.load_device_config() if d["device_name"] == target), {})
+            legacy = (time.perf_counter() - start) * 1000 / calls
+            registry = DeviceRegistry()
+            start = time.perf_counter()
+            for _ in range(calls):
+                registry.get(target)
+            indexed = (time.perf_counter() - start) * 1000 / calls
+            print(f"device lookup ({devices} devices): reload + scan {legacy:.3f} ms, registry {indexed:.4f} ms "
+                  f"({legacy / indexed:.0f}x), reloads: {registry.reloads}")
+            start = time.perf_counter()
+            found = registry.find(location="kitchen", feature="brightness")
+            print(f"find(kitchen, brightness): {len(found)} devices in {(time.perf_counter() - start) * 1000:.3f} ms")
+            config[0]["metadata"]["location"] = "kitchen"
+            with open(common.TOOL_CONFIG, "w") as f:
+                json.dump(config, f, indent=1)
+            print(f"after file change: {len(registry.find(location='kitchen'))} kitchen devices, "
+                  f"reloads: {registry.reloads}")
+        finally:
+            common.TOOL_CONFIG = original
+
+
+if __name__ == "__main__":
+    _benchmark()
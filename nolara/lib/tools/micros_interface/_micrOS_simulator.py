@@ -0,0 +1,191 @@
+"""
+Local micrOS shell server simulator (asyncio, offline testing / benchmarks)
+- one TCP listener per simulated device, prompt protocol: "<device> $ " after every reply
+- hello, version, modules, <module> help [widgets=True], <module> <function> ..., exit
+- optional password auth ("[password] " preprompt), reply delay, parallel session limit (busy server)
+"""
+import asyncio
+import functools
+import json
+import threading
+import time
+import uuid
+
+DEFAULT_MODULES = {
+    "rgb": [
+        {"lm_call": "color r=:range: g=:range: b=:range: smooth=True force=True", "type": "color", "range": [0, 255, 5]},
+        {"lm_call": "toggle state=:options: smooth=True", "type": "button", "options": ["True", "False"]},
+        {"lm_call": "brightness percent=:range: smooth=True wake=True", "type": "slider", "range": [0, 100, 2]},
+    ],
+    "system": [
+        {"lm_call": "info", "type": "textbox", "refresh": 10000},
+    ],
+}
+
+
+class MicrOSSimulator:
+    """
+    Threaded micrOS device simulator (asyncio loop in a daemon thread).
+        devices: simulated device names (prompt: "<device> $ "), one listener each
+        modules: {module: [widget dict, ...]} loaded modules of every device
+        version: micrOS version reply
+        password: None - no auth, else "[password] " preprompt and password check
+        delay: seconds before each reply
+        max_connections: parallel shell sessions per device, above: "Bye! busy server"
+        replies: {command: reply lines} fixed replies (e.g. large payloads for benchmarks)
+    Usage:
+        with MicrOSSimulator(devices=["kitchen"]) as sim:
+            micrOSClient(*sim.address("kitchen"))
+    """
+
+    def __init__(self, devices=("simulator",), modules=None, version="2.9.0-0", password=None, delay=0.0,
+                 max_connections=3, replies=None, host="127.0.0.1"):
+        self.devices = list(devices)
+        self.modules = DEFAULT_MODULES if modules is None else modules
+        self.version = version
+        self.password = password
+        self.delay = delay
+        self.max_connections = max_connections
+        self.replies = replies or {}
+        self.host = host
+        self.ports: dict = {}                                   # {device: listener port}
+        self.sessions: dict = {d: set() for d in self.devices}  # {device: open stream writers}
+        self.uids = {d: uuid.uuid4().hex[:12] for d in self.devices}
+        self.stats = {"connections": 0, "rejected": 0, "commands": 0, "auth_failed": 0}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._servers: list = []
+        self._thread = None
+
+    def address(self, device) -> tuple:
+        return self.host, self.ports[device]
+
+    #####################################################
+    #                   Shell protocol                  #
+    #####################################################
+    def _reply(self, device, command) -> list | None:
+        """
+        Shell command -> reply lines, None: close session (exit)
+        """
+        if command in self.replies:
+            return self.replies[command]
+        parts = command.split()
+        if parts[0] in ("exit", "bye"):
+            return None
+        if parts[0] == "hello":
+            return [f"hello:{device}:{self.uids[device]}"]
+        if parts[0] == "version":
+            return [self.version]
+        if parts[0] == "modules":
+            return [str(list(self.modules))]
+        if parts[0] == "help":
+            return ["[MICROS] - commands (SHELL)", "   hello, modules, version, exit",
+                    "[MICROS] - commands (LMs)", *[f"   {module}" for module in self.modules]]
+        widgets = self.modules.get(parts[0])
+        if widgets is None:
+            return ["Shell: for hints type help.", f"Module {parts[0]} not found"]
+        if len(parts) > 1 and parts[1] == "help":
+            if "widgets=True" in parts:
+                return [f"{json.dumps(widget)}," for widget in widgets]
+            return [widget["lm_call"].split()[0] for widget in widgets]
+        return [json.dumps({"call": command, "result": "ok"})]
+
+    async def _session(self, device, reader, writer):
+        prompt = f"{device} $ "
+        if len(self.sessions[device]) >= self.max_connections:
+            self.stats["rejected"] += 1
+            writer.write(b"Bye! busy server, try later\n")
+            writer.close()
+            return
+        self.stats["connections"] += 1
+        self.sessions[device].add(writer)
+        authenticated = self.password is None
+        try:
+            writer.write(f"{'' if authenticated else '[password] '}{prompt}".encode())
+            await writer.drain()
+            while True:
+                # micrOS shell: one command per message (no line framing)
+                data = await reader.read(2048)
+                if not data:
+                    break
+                command = data.decode("utf-8", errors="replace").strip()
+                if not command:
+                    writer.write(prompt.encode())
+                    continue
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                if not authenticated:
+                    if command != self.password:
+                        self.stats["auth_failed"] += 1
+                        writer.write(b"AuthFailed\nBye!\n")
+                        break
+                    authenticated = True
+                    reply = ["AuthOk"]
+                else:
+                    self.stats["commands"] += 1
+                    reply = self._reply(device, command)
+                if reply is None:
+                    writer.write(b"Bye!\n")
+                    break
+                writer.write(("\n".join(reply) + "\n" + prompt).encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions[device].discard(writer)
+            writer.close()
+
+    async def _drop(self, device=None):
+        for name in [device] if device else self.devices:
+            for writer in list(self.sessions[name]):
+                writer.close()
+
+    def drop(self, device=None):
+        """
+        Close the open sessions of a device (all devices: None) - simulated reboot / network drop
+        """
+        asyncio.run_coroutine_threadsafe(self._drop(device), self._loop).result()
+
+    #####################################################
+    #                     Lifecycle                     #
+    #####################################################
+    async def _start_servers(self):
+        for device in self.devices:
+            server = await asyncio.start_server(functools.partial(self._session, device), self.host, 0)
+            self._servers.append(server)
+            self.ports[device] = server.sockets[0].getsockname()[1]
+
+    async def _stop_servers(self):
+        for server in self._servers:
+            server.close()
+        await self._drop()
+        for server in self._servers:
+            await server.wait_closed()
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="micros-simulator", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_servers(), self._loop).result()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._stop_servers(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with MicrOSSimulator(devices=["simulator"], password="ADmin123") as simulator:
+        print(f"micrOS simulator: {simulator.address('simulator')} (password: ADmin123, Ctrl+C to exit)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
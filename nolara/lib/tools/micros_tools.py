@@ -1,6 +1,10 @@
-from micros_interface._micrOS_common import (load_device_config,
-                                             run_command_on_device,
+import json
+import time
+
+from micros_interface._micrOS_common import (run_command_on_device,
+                                             run_commands_on_devices,
                                              auto_feature_discovery)
+from micros_interface._micrOS_registry import REGISTRY
 
 '''
 def color_setter(device: str, r: int, g: int, b: int) -> dict:
@@ -57,6 +61,41 @@ def generic_remote_command_executor(device: str, command: str) -> dict:
     return response
 
 
+def bulk_remote_command_executor(commands: list[dict]) -> dict:
+    """
+    USE THIS TOOL TO RUN MICROS COMMANDS ON MULTIPLE DEVICES IN ONE STEP (e.g. turn off every light in the house)
+    Commands of the same device run on one connection, different devices run in parallel.
+    Always check the commands against list_micros_device_features(device)
+        [metadata][feature_calls] show command templates
+
+    Args:
+        commands: list of {"device": micros device_name, "command": command from list_micros_device_features[metadata][feature_calls]}
+
+    Returns:
+      dict: per command results in input order (status, response, device, command, elapsed_ms) and a summary
+    """
+    if isinstance(commands, str):
+        commands = json.loads(commands)
+    pairs, results = [], []
+    for item in commands:
+        if isinstance(item, dict) and "device" in item and "command" in item:
+            pairs.append((item["device"], item["command"]))
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            pairs.append((item[0], item[1]))
+        else:
+            pairs.append(None)
+    start = time.perf_counter()
+    responses = iter(run_commands_on_devices([pair for pair in pairs if pair is not None]))
+    for item, pair in zip(commands, pairs):
+        results.append(next(responses) if pair is not None else
+                       {"status": "error", "response": ["Invalid item, expected {device, command}"], "item": item})
+    failed = sum(1 for r in results if r["status"] != "success")
+    return {"results": results,
+            "summary": {"commands": len(results), "succeeded": len(results) - failed, "failed": failed,
+                        "devices": len({pair[0] for pair in pairs if pair is not None}),
+                        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}}
+
+
 def list_micros_devices() -> list[dict]:
     """
     List available remote devices for list_micros_device_features and generic_remote_command_executor.
@@ -67,8 +106,7 @@ def list_micros_devices() -> list[dict]:
     """
 
     device_list = []
-    device_config = load_device_config()
-    for device in device_config:
+    for device in REGISTRY.devices():
         device_name = device["device_name"]
         device_location = device["metadata"]["location"]
         device_list.append({"device_name": device_name, "metadata": {"location": device_location}})
@@ -87,12 +125,27 @@ def list_micros_device_features(device: str) -> dict:
     Returns:
         dict: Dictionary with available features of the micros device.
     """
-    device_config = load_device_config()
-    for device_cfg in device_config:
-        device_name = device_cfg["device_name"]
-        if device_name == device:
-            return device_cfg
-    return {}
+    return REGISTRY.get(device) or {}
+
+
+def find_micros_devices(location: str = "", feature: str = "") -> list[dict]:
+    """
+    Find micros devices by location and/or feature in one call, e.g. all devices in the kitchen with brightness.
+    Use it to resolve target devices and their command templates for generic_remote_command_executor
+    or bulk_remote_command_executor.
+
+    Args:
+        location: room / location of the devices (case insensitive, partial match), empty: any location
+        feature: device feature, e.g. brightness, toggle, color (case insensitive), empty: any feature
+
+    Returns:
+        list[dict]: matching devices with device_name, location, features and feature_calls (of the feature if given)
+    """
+    return [{"device_name": device["device_name"],
+             "location": device["metadata"].get("location"),
+             "features": device["metadata"].get("features", []),
+             "feature_calls": REGISTRY.feature_calls(device, feature)}
+            for device in REGISTRY.find(location=location, feature=feature)]
 
 
 def run_device_feature_discovery():
@@ -0,0 +1,28 @@
+import json
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent.parent.parent / "configuration" / "tool_results"
+
+
+def read_tool_result(result_id: str, page: int = 1) -> str:
+    """
+    Read a page of a compacted (too long) tool result.
+    Use it when a tool result says it was compacted and you need more details.
+
+    Args:
+        result_id: result id from the compacted tool result, e.g. "web_search-1a2b3c4d"
+        page: page number, starting from 1
+
+    Returns:
+        str: the requested page of the full tool result text
+    """
+    path = RESULTS_DIR / f"{Path(result_id).name}.json"
+    try:
+        with open(path, "r") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return f"[Unknown or expired tool result id: {result_id}]"
+    text, page_chars = stored["text"], stored["page_chars"]
+    pages = max(1, -(-len(text) // page_chars))
+    page = min(max(1, int(page)), pages)
+    return f"[{stored['tool']} result page {page}/{pages}]\n{text[(page - 1) * page_chars:page * page_chars]}"
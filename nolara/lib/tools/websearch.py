@@ -1,15 +1,38 @@
+import contextvars
 import requests
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from html.parser import HTMLParser
 from urllib.parse import urlparse, parse_qs, unquote
+from http_interface._http_client import HEADERS, session as _session, trace_span
 
-# Common headers to mimic a real browser
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/114.0.0.0 Safari/537.36"
-    )
-}
+SEARCH_URL = "https://html.duckduckgo.com/html/"
+SEARCH_DEADLINE = 20            # Overall web_search deadline (seconds), slow pages are returned without content
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 8
+MAX_FETCH_WORKERS = 5           # Parallel result page downloads (shared session pool: 8)
+MAX_PAGE_BYTES = 512 * 1024     # Per page download cap
+
+
+def _timeout(deadline: float) -> tuple:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("web_search deadline exceeded")
+    return min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining)
+
+
+def _fetch_page(url: str, deadline: float) -> str:
+    """
+    Download a result page, at most MAX_PAGE_BYTES and not beyond the overall deadline
+    """
+    with trace_span("web.fetch", url=url), _session().get(url, timeout=_timeout(deadline), stream=True) as resp:
+        resp.raise_for_status()
+        content = bytearray()
+        for chunk in resp.iter_content(chunk_size=16 * 1024):
+            content += chunk
+            if len(content) >= MAX_PAGE_BYTES or time.monotonic() > deadline:
+                break
+        return content[:MAX_PAGE_BYTES].decode(resp.encoding or "utf-8", errors="replace")
 
 
 class DuckDuckGoLinkParser(HTMLParser):
@@ -92,6 +115,7 @@ def web_search(query: str, num_results: int = 5, fetch_content: bool = True) ->
     Perform a web search by scraping DuckDuckGo’s HTML interface,
     capturing top <num_results> links (title + URL), and optionally fetching
     the full HTML content of each result page (using a browser-like User-Agent).
+    Result pages are fetched concurrently; pages not fetched within the search deadline are returned without content.
 
     Args:
       query: The search query string.
@@ -106,11 +130,11 @@ def web_search(query: str, num_results: int = 5, fetch_content: bool = True) ->
         - "snippet": An empty string (DuckDuckGo HTML interface does not expose a reliable snippet for all results when parsing manually).
         - "content": The full HTML text of the result page (if fetched), or "".
     """
+    deadline = time.monotonic() + SEARCH_DEADLINE
     # Use DuckDuckGo’s HTML endpoint via GET
-    search_url = "https://html.duckduckgo.com/html/"
-
     try:
-        resp = requests.get(search_url, params={"q": query}, headers=HEADERS, timeout=10)
+        with trace_span("web.search", query=query[:60]):
+            resp = _session().get(SEARCH_URL, params={"q": query}, timeout=_timeout(deadline))
         resp.raise_for_status()
     except Exception as e:
         print(f"[web_search] HTTP error while searching: {e}")
@@ -121,26 +145,109 @@ def web_search(query: str, num_results: int = 5, fetch_content: bool = True) ->
     parser.feed(resp.text)
     results = parser.results
 
-    # Normalize each URL and optionally fetch full page content
+    # Normalize each URL
     for item in results:
-        raw_href = item["url"]
-        actual_url = _normalize_ddg_url(raw_href)
-        item["url"] = actual_url
+        item["url"] = _normalize_ddg_url(item["url"])
+    if not fetch_content or not results:
+        return results
+
+    # Fetch full page contents concurrently (bounded), return partial results at the deadline
+    pool = ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(results)), thread_name_prefix="web-search")
+    futures = {pool.submit(contextvars.copy_context().run, _fetch_page, item["url"], deadline): item
+               for item in results}
+    done, not_done = wait(futures, timeout=max(0, deadline - time.monotonic()))
+    pool.shutdown(wait=False, cancel_futures=True)
+    for future, item in futures.items():
+        if future in not_done:
+            print(f"[web_search] Deadline exceeded, no content from {item['url']}")
+        elif future.exception() is not None:
+            print(f"[web_search] Could not fetch content from {item['url']}: {future.exception()}")
+        else:
+            item["content"] = future.result()
+    return results
+
 
-        if fetch_content:
+#############################################################
+#                         TEST FUNCTIONS                    #
+#############################################################
+
+def _benchmark(pages=5, latency=1.0, slow_page_latency=30, deadline=3):
+    """
+    Local HTTP stand-in (search page + result pages with artificial latency)
+    - sequential requests.get per page (previous behavior) vs concurrent pooled fetch
+    - deadline: one page never finishes in time, partial results are returned
+    - byte cap: oversized page is truncated
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    global SEARCH_URL, SEARCH_DEADLINE
+    connections = set()
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            connections.add(self.client_address)
+            host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+            if self.path.startswith("/html/"):
+                body = "".join(f'<a rel="nofollow" href="{host}/page/{i}">Page {i}</a>' for i in range(pages))
+                body += f'<a rel="nofollow" href="{host}/slow">Slow</a><a rel="nofollow" href="{host}/big">Big</a>'
+            elif self.path == "/slow":
+                time.sleep(slow_page_latency)
+                body = "slow"
+            elif self.path == "/big":
+                body = "x" * (MAX_PAGE_BYTES * 4)
+            else:
+                time.sleep(latency)
+                body = f"<html>{self.path}</html>"
+            payload = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
             try:
-                page_resp = requests.get(actual_url, headers=HEADERS, timeout=10)
-                page_resp.raise_for_status()
-                item["content"] = page_resp.text
-            except Exception as e:
-                print(f"[web_search] Could not fetch content from {actual_url}: {e}")
-                item["content"] = ""
+                self.wfile.write(payload)
+            except OSError:
+                pass    # Client gave up (deadline)
 
-    return results
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.handle_error = lambda request, client_address: None    # Connections dropped by the client
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    original = SEARCH_URL, SEARCH_DEADLINE
+    SEARCH_URL = f"http://127.0.0.1:{server.server_address[1]}/html/"
+    try:
+        urls = [f"http://127.0.0.1:{server.server_address[1]}/page/{i}" for i in range(pages)]
+        start = time.perf_counter()
+        for url in urls:
+            requests.get(url, headers=HEADERS, timeout=10)
+        print(f"[sequential] {pages} pages x {latency}s: {time.perf_counter() - start:.2f}s")
+
+        connections.clear()
+        start = time.perf_counter()
+        results = web_search("benchmark", num_results=pages)
+        print(f"[concurrent] {pages} pages x {latency}s: {time.perf_counter() - start:.2f}s, "
+              f"fetched: {sum(bool(r['content']) for r in results)}/{len(results)}")
+        known = set(connections)
+        web_search("benchmark", num_results=pages)
+        print(f"[keep-alive] repeated call opened {len(connections - known)} new connections")
+
+        SEARCH_DEADLINE = deadline
+        start = time.perf_counter()
+        results = web_search("benchmark", num_results=pages + 2)
+        sizes = {r["title"]: len(r["content"]) for r in results}
+        print(f"[deadline {deadline}s] returned in {time.perf_counter() - start:.2f}s, content sizes: {sizes}")
+    finally:
+        SEARCH_URL, SEARCH_DEADLINE = original
+        server.shutdown()
 
 
 # Example usage
 if __name__ == "__main__":
+    _benchmark()
     query = "Weather at budapest?"
     top_results = web_search(query, num_results=3, fetch_content=True)
     if not top_results:
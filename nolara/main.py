@@ -1,69 +1,145 @@
 #!/usr/bin/env python3
 
 try:
-    from .lib import Models, Config
-    from . import tui
-    from .NolaraCore import NolaraCore
-    from .user_links import setup_nolara_user_config_links
+    from .lib import Startup
 except ImportError:
-    from lib import Models, Config
-    import tui
-    from NolaraCore import NolaraCore
-    from user_links import setup_nolara_user_config_links
+    from lib import Startup
 
 import argparse
 import select
 import sys
 
+# Lazy imports: piped CLI usage never pays for textual, openai or audio libraries
+Config = Startup.LazyModule("lib.Config", package=__package__)
+Models = Startup.LazyModule("lib.Models", package=__package__)
+NolaraCore = Startup.LazyModule("NolaraCore", package=__package__)
+tui = Startup.LazyModule("tui", package=__package__)
+user_links = Startup.LazyModule("user_links", package=__package__)
+ResponseCache = Startup.LazyModule("lib.ResponseCache", package=__package__)
+Bench = Startup.LazyModule("lib.Bench", package=__package__)
+
+
 def _gui_interface():
     """
     Runs the GUI interface.
     - Default interface
     """
-    setup_nolara_user_config_links()
-    tui.AIChatApp().run()
+    with Startup.phase("models requirement"):
+        if not Models.list_models():
+            # First start - nothing to chat with yet: pull in foreground
+            # otherwise the TUI provisions missing models in the background
+            Models.models_requirement()
+    with Startup.phase("user config links"):
+        user_links.setup_nolara_user_config_links()
+    with Startup.phase("tui init"):
+        app = tui.AIChatApp()
+    app.run()
 
 
-def _command_line_interface(prompt, text):
+def _response_cache_key(llm, text) -> str | None:
+    """
+    Response cache key of a single-turn CLI request (None: not cacheable)
+    - agents are not cached: tool results are not deterministic
+    - model digest synced with ollama once per process (init_model): a re-pulled / re-created model misses
+    """
+    if llm.is_agent_enabled() or not hasattr(llm.chatbot, "generation_options"):
+        return None
+    chatbot = llm.chatbot
+    try:
+        digest = Models.model_digest(chatbot.model_name)
+    except Exception as e:
+        print(f"[response-cache] No model digest, not cached: {e}", file=sys.stderr)
+        return None
+    _ = chatbot.context_budget         # Resolve generation options (num_ctx)
+    return ResponseCache.cache_key(digest, chatbot.system_prompt(),
+                                   [{"role": "user", "content": text}], chatbot.generation_options())
+
+
+def _command_line_interface(prompt, text, use_cache=True):
     """
     Runs the command line interface.
+    - use_cache: serve/store the response from the response cache (if enabled in the config)
     """
     #print(f"=== PoC ===\nPrompt: {prompt}, TextIn:\n{text}")
     print("Processing...")
-    command_line_model = Config.get("command_line")["model"]
-    command_line_prompt = prompt if prompt else Config.get("command_line")["prompt"]
+    with Startup.phase("config load"):
+        command_line_model = Config.get("command_line")["model"]
+        command_line_prompt = prompt if prompt else Config.get("command_line")["prompt"]
 
-    llm = NolaraCore(stream=True)
-    llm.init_model(command_line_model)
-    llm.chatbot.system_prompt(prompt=command_line_prompt)  # Set system prompt for the chatbot
-    response = llm.model_process(query=text)               # Process the provided text context
+    with Startup.phase("model init"):
+        llm = NolaraCore.NolaraCore(stream=True)
+        llm.init_model(command_line_model)
+        llm.chatbot.system_prompt(prompt=command_line_prompt)  # Set system prompt for the chatbot
+    cache_key = None
+    if use_cache and ResponseCache.enabled():
+        with Startup.phase("response cache lookup"):
+            cache_key = _response_cache_key(llm, text)
+            cached = ResponseCache.get(cache_key) if cache_key else None
+        if cached is not None:
+            print(f"Model:{llm.chatbot.model_name}> {cached}")
+            print("[response-cache] hit", file=sys.stderr)
+            return
+    with Startup.phase("model process"):
+        response = llm.model_process(query=text)               # Process the provided text context
+    if cache_key and not llm.chatbot.cancelled:
+        ResponseCache.put(cache_key, response, model=llm.chatbot.model_name)
 
 
-def interface_selector():
-    """
-    Selects the interface based on user input.
-    """
+def _cache_stats_interface():
+    stats = ResponseCache.stats()
+    print("[response-cache] " + ", ".join(f"{k}: {v}" for k, v in stats.items()), file=sys.stderr)
+
+
+def parse_arguments(argv=None):
     # Arg parser for command line interface
     arg_parser = argparse.ArgumentParser(description='Reads input from STDIN')
     arg_parser.add_argument("-p", '--prompt', help='Set custom user prompt')
-    args, _ = arg_parser.parse_known_args()
+    arg_parser.add_argument('--startup-profile', action='store_true',
+                            help='Report per-module import time and per-phase wall time (stderr)')
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help='Bypass the response cache (command line mode)')
+    arg_parser.add_argument('--cache-stats', action='store_true',
+                            help='Report response cache hit rate and size (stderr)')
+    args, _ = arg_parser.parse_known_args(argv)
+    return args
+
+
+def interface_selector(args):
+    """
+    Selects the interface based on user input.
+    """
     # Handle Prompt and STDIN parameters
     prompt = args.prompt if args.prompt else ''
     stdin_readable, _, _ = select.select([sys.stdin], [], [], 0)
 
     if sys.stdin in stdin_readable:
         text = sys.stdin.read().strip()
-        return lambda: _command_line_interface(prompt, text)
+        return lambda: _command_line_interface(prompt, text, use_cache=not args.no_cache)
+    if args.cache_stats:
+        return lambda: None        # Stats only, no interface
     return lambda: _gui_interface()
 
 
 
 def main():
-    Models.models_requirement()
-    interface = interface_selector()
-    interface()
+    if sys.argv[1:2] == ["bench"]:
+        # nolara bench [options]: model latency and throughput benchmark
+        Bench.main(sys.argv[2:])
+        return
+    args = parse_arguments()
+    if args.startup_profile:
+        Startup.enable_import_profile()
+    with Startup.phase("interface select"):
+        interface = interface_selector(args)
+    try:
+        interface()
+    finally:
+        if args.cache_stats:
+            _cache_stats_interface()
+        if args.startup_profile:
+            Startup.disable_import_profile()
+            Startup.report()
 
 
 if __name__ == '__main__':
     main()
-
@@ -4,10 +4,12 @@
 # https://textual.textualize.io/widget_gallery/
 from textual.app import App, ComposeResult
 from textual.containers import Vertical, Horizontal
-from textual.widgets import Input, Button, Log, Select, Static, ProgressBar, Footer
+from textual.widgets import Input, Button, Log, Select, Static, ProgressBar, Footer, Collapsible
 
 # Additional libraries
 import asyncio
+import functools
+import threading
 import time
 import os
 import re
@@ -20,10 +22,16 @@ TCSS_PATH = os.path.join(SCRIPT_DIR, "textual.tcss")
 try:
     from .lib import Models
     from .lib import Prompts
+    from .lib import Config
+    from .lib import Provisioning
+    from .lib import Tracing
     from . import NolaraCore
 except ImportError:
     from lib import Models
     from lib import Prompts
+    from lib import Config
+    from lib import Provisioning
+    from lib import Tracing
     import NolaraCore
 
 # Load CSS file
@@ -37,24 +45,34 @@ class AIChatApp(App, NolaraCore.NolaraCore):
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("escape", "quit", "Quit"),
+        ("ctrl+x", "cancel_generation", "Stop"),
     ]
     CSS = load_css()
 
     def __init__(self):
-        NolaraCore.NolaraCore.__init__(self, stream=False)
+        NolaraCore.NolaraCore.__init__(self, stream=True)
         # Initialize global variables for the app
         self.model_dropdown_content = Models.get_chat_models_dropdown() + Models.get_remote_models_dropdown()
         # Initialize global textual.widgets widgets
         self.progress_bar = ProgressBar(total=100, id="progress-bar")
         self.timer_display = Static("⏱️  Time taken: 0s", id="timer-display")
+        self.trace_details = Static("", id="turn-trace-details", markup=False)
+        self.trace_panel = Collapsible(self.trace_details, title="Turn breakdown", collapsed=True, id="turn-trace")
         # Initialize global parameters for textual.widgets
         self._chatbox:Log|None = None
+        self._stream_column:int = 0                 # Current line length of streamed output
         self.input:Input|None = None
         self.model_dropdown:Select|None = None
         self.system_prompt_input:Input|None = None
         self.prompt_dropdown:Select|None = None
+        # Generation runs in a thread worker - the event loop keeps rendering tokens, timer and input
+        self._generation = None                     # textual Worker of the in-flight request
+        self._generation_timer = None
+        self._generation_start:float = 0
         self.init_model(self._get_default_model(), tui_console=self.write_to_chatbox)      # Preload model
+        Config.start_watcher()                                                              # Live config reload
         App.__init__(self)
+        self.warm_up_model(on_state=self._on_model_state)                                   # Load model in background
 
     @staticmethod
     def _get_default_model():
@@ -98,12 +116,15 @@ class AIChatApp(App, NolaraCore.NolaraCore):
                 with Horizontal(id="progress-line"):
                     yield self.progress_bar
                     yield self.timer_display
+                # Per-turn tracing breakdown (hidden until the first traced turn)
+                self.trace_panel.display = False
+                yield self.trace_panel
 
                 with Horizontal(id="input_bar"):
                     self.input = Input(placeholder="Type a message...", id="input")
                     yield self.input
                     yield Button("Send", id="send-button")
-                    if NolaraCore.Audio is not None:
+                    if NolaraCore.tts_available():
                         yield Button("Speak", id="speak-button")
                     # TODO Microphone button (Listen)
 
@@ -113,6 +134,62 @@ class AIChatApp(App, NolaraCore.NolaraCore):
     #######################################################################
     ##                              Events                               ##
     #######################################################################
+    def on_mount(self) -> None:
+        """
+        Provision missing models in the background (UI starts with the available models)
+        """
+        provisioning = Models.models_requirement(background=True, on_event=self._on_provisioning_event)
+        provisioning.add_done_callback(self._on_models_provisioned)
+        self._update_model_label()
+
+    def _on_model_state(self, model_name, state) -> None:
+        if self.is_running:         # Before mount: on_mount shows the state
+            self._ui_call(self._update_model_label)
+
+    def _update_model_label(self) -> None:
+        """
+        Model Features label: mode (Chat/Agentic) and readiness of the selected model
+        """
+        if self.model_dropdown is None or not isinstance(self.model_dropdown.value, str):
+            return
+        model_name = self.model_dropdown.value
+        mode = "[b blue]Agentic[/]" if self.is_agent_enabled(model_name) else "[b green]Chat[/]"
+        state = {"cold": "[red]○ cold[/]", "warming": "[yellow]◌ warming...[/]",
+                 "warm": "[green]● ready[/]"}.get(self.model_state(model_name), "")
+        self.query_one("#model-feature-label", Static).update(f"{mode} {state}".strip())
+
+    def _on_provisioning_event(self, event: dict) -> None:
+        message = Provisioning.format_event(event)
+        if message is not None and event["status"] != "available":
+            self._ui_call(self.write_to_chatbox, message)
+
+    def _on_models_provisioned(self, future) -> None:
+        if future.exception() is not None:
+            self._ui_call(self.write_to_chatbox, f"Model provisioning failed: {future.exception()}")
+            return
+        if any(result["status"] == "pulled" for result in future.result().values()):
+            self._ui_call(self._refresh_model_dropdown)
+
+    def _ui_call(self, callback, *args) -> None:
+        """
+        Run callback on the UI thread (callbacks may arrive from worker threads)
+        """
+        if threading.current_thread() is threading.main_thread():
+            callback(*args)
+        else:
+            self.call_from_thread(callback, *args)
+
+    def _refresh_model_dropdown(self) -> None:
+        """
+        Reload model options (newly pulled models) and keep the current selection
+        """
+        self.model_dropdown_content = Models.get_chat_models_dropdown() + Models.get_remote_models_dropdown()
+        selected = self.model_dropdown.value
+        with self.model_dropdown.prevent(Select.Changed):
+            self.model_dropdown.set_options(self.model_dropdown_content)
+            self.model_dropdown.value = selected
+        self.write_to_chatbox("Model list updated.")
+
     def on_select_changed(self, event: Select.Changed) -> None:
         """
         Handle the selection change event for the model dropdown.
@@ -122,11 +199,11 @@ class AIChatApp(App, NolaraCore.NolaraCore):
             model_name = event.value
             self._chatbox.clear()
             self.progress_bar.progress = 0
-            label_widget = self.query_one("#model-feature-label", Static)
-            if self.is_agent_enabled(model_name):
-                label_widget.update("[b blue]Agentic[/]")
-            else:
-                label_widget.update("[b green]Chat[/]")
+            if not self.generating and isinstance(model_name, str):
+                # Load the selected model while the user types
+                self.init_model(model_name, tui_console=self.write_to_chatbox)
+                self.warm_up_model(on_state=self._on_model_state)
+            self._update_model_label()
         if event.select.id == "prompt-dropdown":
             # PROMPT SELECTION
             selected_prompt = event.value
@@ -153,16 +230,32 @@ class AIChatApp(App, NolaraCore.NolaraCore):
             self.chatbot.system_prompt(event.value)
 
     def action_quit(self) -> None:
+        self.action_cancel_generation()
         self.teardown()
         self.exit()
 
+    def action_cancel_generation(self) -> None:
+        """
+        Abort the in-flight request (closes the model stream, the server stops generating)
+        """
+        if self.generating:
+            self.cancel_model_process()
+            self.write_to_chatbox("Cancelling...")
+
     #######################################################################
     ##                        AI Chat features                           ##
     #######################################################################
+    @property
+    def generating(self) -> bool:
+        return self._generation is not None and self._generation.is_running
+
     async def process_message(self) -> None:
         message = self.input.value.strip()
         if not message:
             return
+        if self.generating:
+            self.write_to_chatbox("Still generating... (ctrl+x to stop)")
+            return
 
         selected_option = self.model_dropdown.value
         self.init_model(selected_option, tui_console=self.write_to_chatbox)
@@ -170,36 +263,79 @@ class AIChatApp(App, NolaraCore.NolaraCore):
         self.write_to_chatbox("_" * (self._chatbox.size.width-4))
         await self.update_progress(10)
         self.write_to_chatbox(f"\nYou: {message}")
-        start_time = time.time()
-        #response = await self.async_model_process(message)
-        response = self.model_process(message)
-        await self.update_progress(80)
-        duration = time.time() - start_time
-        self.timer_display.update(f"⏱️  Time taken: {duration:.2f}s")
-
-        #self.write_to_chatbox(f"Assistant {self.chatbot.model_name}:")
-        #self.write_to_chatbox(response)
+        self.input.value = ""
 
-        # Animate progress bar - dummy
-        await self.update_progress(100)
-        await asyncio.sleep(0.1)
-        #self.progress_bar.progress = 0
+        self._generation_start = time.time()
+        self._generation_timer = self.set_interval(0.1, self._update_timer)
+        self._generation = self.run_worker(functools.partial(self._generate, message), name="generation",
+                                           group="generation", thread=True, exit_on_error=False)
 
-        self.input.value = ""
+    def _generate(self, message) -> None:
+        """
+        Thread worker: blocking model processing, streamed tokens are marshalled to the UI thread
+        """
+        try:
+            self.model_process(message)
+        except Exception as e:
+            self.write_to_chatbox(f"Error: {e}")
+        finally:
+            if self.is_running:
+                self.call_from_thread(self._generation_done)
+
+    def _update_timer(self) -> None:
+        duration = time.time() - self._generation_start
+        ttft = self.chatbot.last_ttft if self.chatbot else None
+        first_token = f" (first token: {ttft:.2f}s)" if ttft is not None else ""
+        self.timer_display.update(f"⏱️  Time taken: {duration:.2f}s{first_token}")
+        # Progress bar - dummy: approach 90% while generating
+        self.progress_bar.progress = min(90, self.progress_bar.progress + 1)
+
+    def _generation_done(self) -> None:
+        if self._generation_timer is not None:
+            self._generation_timer.stop()
+            self._generation_timer = None
+        self._update_timer()
+        self._update_trace_panel()
+        self.progress_bar.progress = 100
+        self._update_model_label()
+
+    def _update_trace_panel(self) -> None:
+        """
+        Turn breakdown: time per span name in the title, span tree when expanded
+        """
+        turn = self.last_trace
+        self.trace_panel.display = turn is not None
+        if turn is None:
+            return
+        self.trace_panel.title = f"Turn breakdown: {Tracing.summary(turn)}"
+        self.trace_details.update("\n".join(Tracing.breakdown(turn)))
 
-    def write_to_chatbox(self, content):
+    def write_to_chatbox(self, content, end="\n"):
         """
         Write content to the chatbox (Log widget), supporting single string, word, or list of strings.
 
         Args:
             content (str | list[str]): The message or list of messages to log.
-            wrap (bool): Whether to enable wrapping (uses chatbox width).
-            prefix (str): Optional string to prepend before each line.
+            end (str): "\n" write full line(s), "" append streamed token to the current line.
         """
         if self._chatbox is None:
             return
+        if threading.current_thread() is not threading.main_thread():
+            # Called from the generation worker
+            if self.is_running:
+                self.call_from_thread(self.write_to_chatbox, content, end)
+            return
 
         box_width = self._chatbox.size.width - 4
+        if end == "":
+            self._write_token_to_chatbox(content, box_width)
+            return
+        if self._stream_column > 0:
+            # Close the streamed line
+            self._chatbox.write("\n")
+            self._stream_column = 0
+            if content == "":
+                return
         content = self._wrap_response(content, box_width)
 
         if isinstance(content, str):
@@ -209,6 +345,22 @@ class AIChatApp(App, NolaraCore.NolaraCore):
         else:
             raise TypeError("Content must be a string or list of strings.")
 
+    def _write_token_to_chatbox(self, token, box_width):
+        """
+        Append streamed token to the current chatbox line (soft wrap at box width)
+        """
+        lines = token.split("\n")
+        for index, line in enumerate(lines):
+            if index > 0:
+                self._chatbox.write("\n")
+                self._stream_column = 0
+            if self._stream_column > 0 and self._stream_column + len(line) > box_width:
+                self._chatbox.write("\n")
+                self._stream_column = 0
+                line = line.lstrip()
+            self._chatbox.write(line)
+            self._stream_column += len(line)
+
     @staticmethod
     def _wrap_response(response, box_width):
         response_lines = re.split(r'\n| \* ', response)